@@ -4,6 +4,7 @@ import argparse
 import getpass
 import logging
 import os
+import sqlite3
 import traceback
 import sys
 import pkg_resources
@@ -12,7 +13,18 @@ from colorlog import ColoredFormatter
 
 from sawtooth_battleship.battleship_client import BattleshipClient
 from sawtooth_battleship.battleship_exceptions import BattleshipException
-from sawtooth_battleship.processor.handler import ID_BOAT
+from sawtooth_battleship.battleship_replay import replay
+from sawtooth_battleship.battleship_replay import stats
+from sawtooth_battleship.battleship_workload import add_workload_parser
+from sawtooth_battleship.battleship_workload import do_workload
+from sawtooth_battleship.indexer.battleship_index import BattleshipIndex
+from sawtooth_battleship.indexer.main import default_index_path
+from sawtooth_battleship.processor.battleship_board import SHIP_IDS
+from sawtooth_battleship.processor.battleship_board import SIZE
+from sawtooth_battleship.processor.battleship_board import hide_ships
+from sawtooth_battleship.processor.battleship_board import random_fleet
+from sawtooth_battleship.processor.battleship_state import PLAYERS
+from sawtooth_battleship.processor.battleship_state import STATES
 
 
 DISTRIBUTION_NAME = 'sawtooth-battleship'
@@ -108,6 +120,13 @@ def add_create_parser(subparsers, parent_parser):
         type=int,
         help='set time, in seconds, to wait for game to commit')
 
+    parser.add_argument(
+        '--validator-url',
+        type=str,
+        help='specify the validator component endpoint, e.g. '
+        'tcp://localhost:4004, to submit to the validator directly and '
+        'wait for commits through validator events instead of the REST API')
+
 
 def add_list_parser(subparsers, parent_parser):
     parser = subparsers.add_parser(
@@ -144,6 +163,38 @@ def add_list_parser(subparsers, parent_parser):
         help='specify password for authentication if REST API '
         'is using Basic Auth')
 
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='set the largest number of games to list')
+
+    parser.add_argument(
+        '--start',
+        type=str,
+        help='specify the state address to start listing from')
+
+    parser.add_argument(
+        '--player',
+        type=str,
+        help='list only the games of the player with this public key '
+        'prefix')
+
+    parser.add_argument(
+        '--state',
+        type=str,
+        choices=STATES,
+        help='list only the games in this state')
+
+    parser.add_argument(
+        '--index',
+        type=str,
+        nargs='?',
+        const=default_index_path(),
+        metavar='FILE',
+        help='read the games from the database of battleship-indexer '
+        'instead of the REST API (FILE default: {})'.format(
+            default_index_path()))
+
 
 def add_show_parser(subparsers, parent_parser):
     parser = subparsers.add_parser(
@@ -185,6 +236,80 @@ def add_show_parser(subparsers, parent_parser):
         help='specify password for authentication if REST API '
         'is using Basic Auth')
 
+    parser.add_argument(
+        '--index',
+        type=str,
+        nargs='?',
+        const=default_index_path(),
+        metavar='FILE',
+        help='read the games from the database of battleship-indexer '
+        'instead of the REST API (FILE default: {})'.format(
+            default_index_path()))
+
+
+def add_leaderboard_parser(subparsers, parent_parser):
+    parser = subparsers.add_parser(
+        'leaderboard',
+        help='Displays the players who won the most games',
+        description='Displays the players who won the most battleship '
+        'games, from the database of battleship-indexer.',
+        parents=[parent_parser])
+
+    parser.add_argument(
+        '--index',
+        type=str,
+        nargs='?',
+        const=default_index_path(),
+        default=default_index_path(),
+        metavar='FILE',
+        help='the database of battleship-indexer (default: {})'.format(
+            default_index_path()))
+
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=10,
+        help='the number of players to display')
+
+
+def add_replay_parser(subparsers, parent_parser):
+    parser = subparsers.add_parser(
+        'replay',
+        help='Displays a battleship game as it stood at a move',
+        description='Displays both boards of the battleship game <name> as '
+        'they stood after a number of shots, rebuilt from the history of '
+        'the game, with the shots and hits of each player. Ships are only '
+        'shown once the game has ended.',
+        parents=[parent_parser])
+
+    parser.add_argument(
+        'name',
+        type=str,
+        help='identifier for the game')
+
+    parser.add_argument(
+        '--move',
+        type=int,
+        help='the number of shots to replay (default: all)')
+
+    parser.add_argument(
+        '--url',
+        type=str,
+        help='specify URL of REST API')
+
+    parser.add_argument(
+        '--auth-user',
+        type=str,
+        help='specify username for authentication if REST API '
+        'is using Basic Auth')
+
+    parser.add_argument(
+        '--auth-password',
+        type=str,
+        help='specify password for authentication if REST API '
+        'is using Basic Auth')
+
+
 def correct_space_row (string): 
     row = string 
     rowlist = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J"]
@@ -259,6 +384,97 @@ def add_shoot_parser(subparsers, parent_parser):
         help='set time, in seconds, to wait for shoot transaction '
         'to commit')
 
+    parser.add_argument(
+        '--validator-url',
+        type=str,
+        help='specify the validator component endpoint, e.g. '
+        'tcp://localhost:4004, to submit to the validator directly and '
+        'wait for commits through validator events instead of the REST API')
+
+
+def correct_ship(string):
+    """Parse a ship's position such as A1H or C10V: the row and column of
+    its top left end, and H to run it across or V to run it down.
+    """
+    row, column, direction = string[:1], string[1:-1], string[-1:]
+    if row not in "ABCDEFGHIJ" or not row or direction not in ("H", "V") \
+            or not column.isdigit() or not 1 <= int(column) <= 10:
+        raise argparse.ArgumentTypeError(
+            'Ship positions read like A1H or C10V')
+    return "ABCDEFGHIJ".index(row) * 10 + int(column), direction == "V"
+
+
+def add_place_parser(subparsers, parent_parser):
+    parser = subparsers.add_parser(
+        'place',
+        help='Places a fleet in a battleship game',
+        description='Sends a transaction to place the whole fleet of a '
+        'player in the battleship game with the identifier <name>. This '
+        'transaction will fail if the fleet was already placed, or if '
+        'ships lie off the board, overlap or touch.',
+        parents=[parent_parser])
+
+    parser.add_argument(
+        'name',
+        type=str,
+        help='identifier for the game')
+
+    parser.add_argument(
+        'player',
+        type=int,
+        choices=[1, 2],
+        help='the player whose fleet is placed')
+
+    parser.add_argument(
+        'ships',
+        type=correct_ship,
+        nargs='*',
+        help='the position of each of the ships {}, such as A1H or C10V; '
+        'the fleet is placed at random if none are given'.format(
+            ', '.join(SHIP_IDS)))
+
+    parser.add_argument(
+        '--url',
+        type=str,
+        help='specify URL of REST API')
+
+    parser.add_argument(
+        '--username',
+        type=str,
+        help="identify name of user's private key file")
+
+    parser.add_argument(
+        '--key-dir',
+        type=str,
+        help="identify directory of user's private key file")
+
+    parser.add_argument(
+        '--auth-user',
+        type=str,
+        help='specify username for authentication if REST API '
+        'is using Basic Auth')
+
+    parser.add_argument(
+        '--auth-password',
+        type=str,
+        help='specify password for authentication if REST API '
+        'is using Basic Auth')
+
+    parser.add_argument(
+        '--wait',
+        nargs='?',
+        const=sys.maxsize,
+        type=int,
+        help='set time, in seconds, to wait for place transaction '
+        'to commit')
+
+    parser.add_argument(
+        '--validator-url',
+        type=str,
+        help='specify the validator component endpoint, e.g. '
+        'tcp://localhost:4004, to submit to the validator directly and '
+        'wait for commits through validator events instead of the REST API')
+
 
 def add_delete_parser(subparsers, parent_parser):
     parser = subparsers.add_parser('delete', parents=[parent_parser])
@@ -302,6 +518,13 @@ def add_delete_parser(subparsers, parent_parser):
         type=int,
         help='set time, in seconds, to wait for delete transaction to commit')
 
+    parser.add_argument(
+        '--validator-url',
+        type=str,
+        help='specify the validator component endpoint, e.g. '
+        'tcp://localhost:4004, to submit to the validator directly and '
+        'wait for commits through validator events instead of the REST API')
+
 
 def create_parent_parser(prog_name):
     parent_parser = argparse.ArgumentParser(prog=prog_name, add_help=False)
@@ -340,56 +563,64 @@ def create_parser(prog_name):
     add_create_parser(subparsers, parent_parser)
     add_list_parser(subparsers, parent_parser)
     add_show_parser(subparsers, parent_parser)
+    add_leaderboard_parser(subparsers, parent_parser)
+    add_replay_parser(subparsers, parent_parser)
+    add_place_parser(subparsers, parent_parser)
     add_shoot_parser(subparsers, parent_parser)
     add_delete_parser(subparsers, parent_parser)
+    add_workload_parser(subparsers, parent_parser)
 
     return parser
 
 
 def do_list(args):
-    url = _get_url(args)
-    auth_user, auth_password = _get_auth_info(args)
-
-    client = BattleshipClient(base_url=url, keyfile=None)
-
-    game_list = [
-        game.split(',')
-        for games in client.list(auth_user=auth_user,
-                                 auth_password=auth_password)
-        for game in games.decode().split('|')
-    ]
+    if args.index is not None:
+        with _open_index(args.index) as index:
+            games = index.list_games(start=args.start,
+                                     limit=args.limit,
+                                     player=args.player,
+                                     state=args.state)
+    else:
+        url = _get_url(args)
+        auth_user, auth_password = _get_auth_info(args)
 
-    if game_list is not None:
-        fmt = "%-15s %-15.15s %-15.15s %-9s %s"
-        print(fmt % ('GAME', 'PLAYER 1', 'PLAYER 2', 'BOARD', 'STATE'))
-        for game_data in game_list:
+        client = BattleshipClient(base_url=url, keyfile=None)
 
-            name, board, game_state, player1, player2 = game_data
+        games = client.list(start=args.start,
+                            limit=args.limit,
+                            player=args.player,
+                            state=args.state,
+                            auth_user=auth_user,
+                            auth_password=auth_password)
 
-            print(fmt % (name, player1[:6], player2[:6], board, game_state))
-    else:
-        raise BattleshipException("Could not retrieve game listing.")
+    # Rows are printed as the pages of games come in
+    fmt = "%-15s %-15.15s %-15.15s %s"
+    print(fmt % ('GAME', 'PLAYER 1', 'PLAYER 2', 'STATE'))
+    for game in games:
+        print(fmt % (game.name, game.player1[:6], game.player2[:6],
+                     game.state), flush=True)
 
 
 def do_show(args):
     name = args.name
 
-    url = _get_url(args)
-    auth_user, auth_password = _get_auth_info(args)
+    if args.index is not None:
+        with _open_index(args.index) as index:
+            game = index.get_game(name)
+    else:
+        url = _get_url(args)
+        auth_user, auth_password = _get_auth_info(args)
 
-    client = BattleshipClient(base_url=url, keyfile=None)
+        client = BattleshipClient(base_url=url, keyfile=None)
 
-    data = client.show(name, auth_user=auth_user, auth_password=auth_password)
+        game = client.show(
+            name, auth_user=auth_user, auth_password=auth_password)
 
-    if data is not None:
+    if game is not None:
 
-        board_str_P1, board_str_P2, game_state, player1, player2 = {
-            name: (board_P1, board_P2, state, player_1, player_2)
-            for name, board_P1, board_P2, state, player_1, player_2 in [
-                game.split(',')
-                for game in data.decode().split('|')
-            ]
-        }[name]
+        board_str_P1 = game.board_P1.to_string()
+        board_str_P2 = game.board_P2.to_string()
+        game_state, player1, player2 = game.state, game.player1, game.player2
 
         board_P1 = list(board_str_P1.replace("-", " "))
         board_P2 = list(board_str_P2.replace("-", " "))
@@ -399,10 +630,10 @@ def do_show(args):
         # if game_state == 'P1-NEXT': #P1-NEXT = P1 turn 
         currentplayer = args.username 
         if currentplayer == player1: 
-            board_enemy = display_enemy(board_P2)
+            board_enemy = display_enemy(board_str_P2)
             board_perso = board_P1
         elif currentplayer == player2: 
-            board_enemy = display_enemy(board_P1)
+            board_enemy = display_enemy(board_str_P1)
             board_perso = board_P2
         else: 
             print("This player doesn't exist in this game. ")
@@ -465,14 +696,66 @@ def do_show(args):
     else:
         raise BattleshipException("Game not found: {}".format(name))
 
+
+def do_leaderboard(args):
+    with _open_index(args.index) as index:
+        players = index.leaderboard(limit=args.limit)
+
+    fmt = "%-66s %5s %5s"
+    print(fmt % ('PLAYER', 'WINS', 'GAMES'))
+    for player, wins, games in players:
+        print(fmt % (player, wins, games))
+
+
+def do_replay(args):
+    name = args.name
+    if args.move is not None and args.move < 0:
+        raise BattleshipException("Move must be 0 or more")
+
+    url = _get_url(args)
+    auth_user, auth_password = _get_auth_info(args)
+
+    client = BattleshipClient(base_url=url, keyfile=None)
+
+    game = client.show(name, auth_user=auth_user, auth_password=auth_password)
+    if game is None:
+        raise BattleshipException("Game not found: {}".format(name))
+
+    history = client.history(
+        name, auth_user=auth_user, auth_password=auth_password)
+    shots = history[:args.move]
+    past = replay(game, shots)
+    ended = game.state in ('P1-WIN', 'P2-WIN')
+
+    print("GAME      : {}".format(name))
+    print("MOVE      : {} of {}".format(len(shots), len(history)))
+    if shots:
+        print("LAST SHOT : player {} at {}{}, {}".format(
+            shots[-1].player,
+            'ABCDEFGHIJ'[(shots[-1].space - 1) // SIZE],
+            (shots[-1].space - 1) % SIZE + 1,
+            shots[-1].result))
+    print("STATE     : {}".format(past.state))
+    for player, count in sorted(stats(shots).items()):
+        print("PLAYER {}  : {} shots, {} hits, {} sunk".format(
+            player, count.shots, count.hits, count.sunk))
+
+    for player in PLAYERS:
+        board = past.fleet(player)[0].to_string()
+        if not ended:
+            board = hide_ships(board)
+        print("")
+        print("Board of player {}".format(player))
+        print("   | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8 | 9 | 10 ")
+        for row, letter in enumerate('ABCDEFGHIJ'):
+            print("---|---|---|---|---|---|---|---|---|---|---")
+            print(" {} | {}".format(letter, ' | '.join(
+                board[row * SIZE:(row + 1) * SIZE].replace("-", " "))))
+        print("---|---|---|---|---|---|---|---|---|---|---")
+
+
 def display_enemy(board):
-    board_disp = []
-    for k in board :
-        if k in ID_BOAT :
-            board_disp.append(" ")
-        else :
-            board_disp.append(k)
-    return board_disp
+    return list(hide_ships(board).replace("-", " "))
 
 
 def do_create(args):
@@ -482,7 +765,8 @@ def do_create(args):
     keyfile = _get_keyfile(args)
     auth_user, auth_password = _get_auth_info(args)
 
-    client = BattleshipClient(base_url=url, keyfile=keyfile)
+    client = BattleshipClient(
+        base_url=url, keyfile=keyfile, validator_url=args.validator_url)
 
     if args.wait and args.wait > 0:
         response = client.create(
@@ -521,7 +805,8 @@ def do_shoot(args):
     keyfile = _get_keyfile(args)
     auth_user, auth_password = _get_auth_info(args)
 
-    client = BattleshipClient(base_url=url, keyfile=keyfile)
+    client = BattleshipClient(
+        base_url=url, keyfile=keyfile, validator_url=args.validator_url)
 
     if args.wait and args.wait > 0:
         response = client.shoot(
@@ -535,6 +820,37 @@ def do_shoot(args):
             auth_password=auth_password)
 
     print("Response: {}".format(response))
+    for shot in client.last_shots:
+        print("Shot at {}: {}, game state {}".format(
+            shot['cell'], shot['result'], shot['state']))
+
+
+def do_place(args):
+    name = args.name
+
+    if args.ships:
+        if len(args.ships) != len(SHIP_IDS):
+            raise BattleshipException(
+                'Give a position for each of the ships {}'.format(
+                    ', '.join(SHIP_IDS)))
+        fleet = args.ships
+    else:
+        fleet = [
+            (index + 1, vertical) for index, vertical in random_fleet()]
+
+    url = _get_url(args)
+    keyfile = _get_keyfile(args)
+    auth_user, auth_password = _get_auth_info(args)
+
+    client = BattleshipClient(
+        base_url=url, keyfile=keyfile, validator_url=args.validator_url)
+
+    response = client.place(
+        name, args.player, fleet, wait=args.wait,
+        auth_user=auth_user,
+        auth_password=auth_password)
+
+    print("Response: {}".format(response))
 
 
 def do_delete(args):
@@ -544,7 +860,8 @@ def do_delete(args):
     keyfile = _get_keyfile(args)
     auth_user, auth_password = _get_auth_info(args)
 
-    client = BattleshipClient(base_url=url, keyfile=keyfile)
+    client = BattleshipClient(
+        base_url=url, keyfile=keyfile, validator_url=args.validator_url)
 
     if args.wait and args.wait > 0:
         response = client.delete(
@@ -559,6 +876,16 @@ def do_delete(args):
     print("Response: {}".format(response))
 
 
+def _open_index(path):
+    if not os.path.exists(path):
+        raise BattleshipException("No index at {}".format(path))
+    try:
+        return BattleshipIndex(path, read_only=True)
+    except sqlite3.Error as err:
+        raise BattleshipException(
+            "Unable to open the index {}: {}".format(path, err)) from err
+
+
 def _get_url(args):
     return DEFAULT_URL if args.url is None else args.url
 
@@ -599,10 +926,18 @@ def main(prog_name=os.path.basename(sys.argv[0]), args=None):
         do_list(args)
     elif args.command == 'show':
         do_show(args)
+    elif args.command == 'leaderboard':
+        do_leaderboard(args)
+    elif args.command == 'replay':
+        do_replay(args)
+    elif args.command == 'place':
+        do_place(args)
     elif args.command == 'shoot':
         do_shoot(args)
     elif args.command == 'delete':
         do_delete(args)
+    elif args.command == 'workload':
+        do_workload(args)
     else:
         raise BattleshipException("invalid command: {}".format(args.command))
 
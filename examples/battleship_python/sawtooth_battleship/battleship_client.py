@@ -1,18 +1,36 @@
 import hashlib
 import base64
-from base64 import b64encode
+import json
 import time
 import random
-import requests
-import yaml
+from urllib.parse import urlencode
 
+from sawtooth_battleship.battleship_events import CommitWaiter
 from sawtooth_battleship.battleship_exceptions import BattleshipException
+from sawtooth_battleship.processor.battleship_payload \
+    import serialize_payload
+from sawtooth_battleship.processor.battleship_state import PLAYERS
+from sawtooth_battleship.processor.battleship_state import HISTORY_LEAF
+from sawtooth_battleship.processor.battleship_state import METADATA_LEAF
+from sawtooth_battleship.processor.battleship_state import RECORD_GAMES
+from sawtooth_battleship.processor.battleship_state import RECORD_METADATA
+from sawtooth_battleship.processor.battleship_state import deserialize_boards
+from sawtooth_battleship.processor.battleship_state import deserialize_games
+from sawtooth_battleship.processor.battleship_state \
+    import deserialize_history
+from sawtooth_battleship.processor.battleship_state \
+    import deserialize_metadata
+from sawtooth_battleship.processor.battleship_state import record_type
 
 from sawtooth_signing import create_context
 from sawtooth_signing import CryptoFactory
 from sawtooth_signing import ParseError
 from sawtooth_signing.secp256k1 import Secp256k1PrivateKey
 
+from sawtooth_sdk.client.exceptions import RestApiError
+from sawtooth_sdk.client.exceptions import RestApiUnavailable
+from sawtooth_sdk.client.rest_client import RestClient
+from sawtooth_sdk.processor.address import Namespace
 from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 from sawtooth_sdk.protobuf.transaction_pb2 import Transaction
 from sawtooth_sdk.protobuf.batch_pb2 import BatchList
@@ -20,14 +38,34 @@ from sawtooth_sdk.protobuf.batch_pb2 import BatchHeader
 from sawtooth_sdk.protobuf.batch_pb2 import Batch
 
 
+_NAMESPACE = Namespace('battleship')
+
+# The number of state entries asked for in each request when listing
+PAGE_SIZE = 100
+
+
 def _sha512(data):
     return hashlib.sha512(data).hexdigest()
 
 
 class BattleshipClient:
-    def __init__(self, base_url, keyfile=None):
+    def __init__(self, base_url, keyfile=None, validator_url=None):
+        """
+        Args:
+            base_url (str): the REST API URL
+            keyfile (str): the file holding the signer's private key
+            validator_url (str): the validator's component endpoint; if
+                given, transactions are submitted to the validator
+                directly, and commits are waited for by following the
+                validator's events rather than by polling the REST API
+        """
 
         self._base_url = base_url
+        self._rest_client = RestClient(base_url)
+        self._validator_url = validator_url
+        # The shot events of the last transaction waited for through
+        # validator events, as dicts of their attributes
+        self.last_shots = []
 
         if keyfile is None:
             self._signer = None
@@ -54,6 +92,7 @@ class BattleshipClient:
         return self._send_battleship_txn(
             name,
             "create",
+            addresses=self._get_game_addresses(name),
             wait=wait,
             auth_user=auth_user,
             auth_password=auth_password)
@@ -62,68 +101,202 @@ class BattleshipClient:
         return self._send_battleship_txn(
             name,
             "delete",
+            addresses=self._get_game_addresses(name),
             wait=wait,
             auth_user=auth_user,
             auth_password=auth_password)
 
-    def take(self, name, space, wait=None, auth_user=None, auth_password=None):
+    def shoot(self, name, space, wait=None, auth_user=None,
+              auth_password=None):
+        # A shot reads both boards, to check that the fleets are placed
         return self._send_battleship_txn(
             name,
-            "take",
+            "shoot",
             space,
+            addresses=self._get_game_addresses(name),
             wait=wait,
             auth_user=auth_user,
             auth_password=auth_password)
 
-    def list(self, auth_user=None, auth_password=None):
-        battleship_prefix = self._get_prefix()
-
-        result = self._send_request(
-            "state?address={}".format(battleship_prefix),
+    def place(self, name, player, fleet, wait=None, auth_user=None,
+              auth_password=None):
+        """Place a player's whole fleet in one transaction.
+
+        Args:
+            name (str): the name of the game
+            player (int): the player placing their fleet, 1 or 2
+            fleet (list of (int, bool)): for each ship, in SHIP_IDS order,
+                the space of its top left end, from 1 to 100, and whether
+                it runs down rather than across
+        """
+        # Both boards are declared: a game stored before the leaves is
+        # moved to them in full by its first placement
+        return self._send_battleship_txn(
+            name,
+            "place",
+            (player, fleet),
+            addresses=self._get_game_addresses(name),
+            wait=wait,
             auth_user=auth_user,
             auth_password=auth_password)
 
+    def list(self, start=None, limit=None, player=None, state=None,
+             auth_user=None, auth_password=None):
+        """Yield the games, without their boards, a page of state at a
+        time.
+
+        Args:
+            start (str): the state address to list from
+            limit (int): the largest number of games to yield
+            player (str): if given, only games with a player whose public
+                key starts with it are yielded
+            state (str): if given, only games in this state are yielded
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        count = 0
+        for entry in self._list_state(
+                self._get_prefix(), start=start,
+                auth_user=auth_user, auth_password=auth_password):
+            # The kind of a record is known from its header, so boards
+            # are skipped without decoding them
+            try:
+                kind = record_type(base64.b64decode(entry['data'][:8]))
+                if kind == RECORD_METADATA:
+                    games = deserialize_metadata(
+                        base64.b64decode(entry['data']))
+                elif kind == RECORD_GAMES:
+                    games = deserialize_games(base64.b64decode(entry['data']))
+                else:
+                    continue
+            except ValueError as err:
+                raise BattleshipException(
+                    'Invalid state record at {}: {}'.format(
+                        entry['address'], err)) from err
+
+            for game in games.values():
+                if state is not None and game.state != state:
+                    continue
+                if player is not None and not (
+                        game.player1.startswith(player)
+                        or game.player2.startswith(player)):
+                    continue
+
+                yield game
+                count += 1
+                if count == limit:
+                    return
+
+    def show(self, name, auth_user=None, auth_password=None):
+        """Return the game named `name`, or None.
+        """
         try:
-            encoded_entries = yaml.safe_load(result)["data"]
+            data = self._get_state(
+                self._get_address(name, METADATA_LEAF),
+                auth_user=auth_user,
+                auth_password=auth_password)
+            if data is None:
+                data = self._get_state(
+                    self._get_legacy_address(name),
+                    auth_user=auth_user,
+                    auth_password=auth_password)
+                return deserialize_games(data).get(name) if data else None
 
-            return [
-                base64.b64decode(entry["data"]) for entry in encoded_entries
-            ]
+            game = deserialize_metadata(data).get(name)
+            for player in PLAYERS:
+                data = self._get_state(
+                    self._get_address(name, '{:02x}'.format(player)),
+                    auth_user=auth_user,
+                    auth_password=auth_password)
+                game.set_fleet(player, *deserialize_boards(data)[name])
+            return game
 
         except BaseException:
             return None
 
-    def show(self, name, auth_user=None, auth_password=None):
-        address = self._get_address(name)
-
-        result = self._send_request(
-            "state/{}".format(address),
-            name=name,
+    def history(self, name, auth_user=None, auth_password=None):
+        """Return the shots taken in the game named `name`, oldest first,
+        as Shot tuples: a single state entry however long the game.
+        """
+        data = self._get_state(
+            self._get_address(name, HISTORY_LEAF),
             auth_user=auth_user,
             auth_password=auth_password)
+        if data is None:
+            return []
+
         try:
-            return base64.b64decode(yaml.safe_load(result)["data"])
+            return deserialize_history(data).get(name, [])
+        except ValueError as err:
+            raise BattleshipException(
+                'Invalid history of {}: {}'.format(name, err)) from err
+
+    def _get_state(self, address, auth_user=None, auth_password=None):
+        try:
+            result = self._send_request(
+                "state/{}".format(address),
+                auth_user=auth_user,
+                auth_password=auth_password)
+            return base64.b64decode(json.loads(result)["data"])
 
         except BaseException:
             return None
 
+    def _list_state(self, address, start=None, auth_user=None,
+                    auth_password=None):
+        """Yield the state entries under an address prefix, following the
+        REST API's paging. Every page is read at the block of the first.
+        """
+        query = {'address': address, 'limit': PAGE_SIZE}
+        if start is not None:
+            query['start'] = start
+
+        while True:
+            try:
+                page = json.loads(self._send_request(
+                    'state?{}'.format(urlencode(query)),
+                    auth_user=auth_user,
+                    auth_password=auth_password))
+            except ValueError as err:
+                raise BattleshipException(
+                    'Unable to decode state listing: {}'.format(err)) from err
+
+            yield from page.get('data', [])
+
+            paging = page.get('paging', {})
+            if not paging.get('next_position'):
+                return
+            query['start'] = paging['next_position']
+            query['head'] = page['head']
+
     def _get_status(self, batch_id, wait, auth_user=None, auth_password=None):
         try:
             result = self._send_request(
                 'batch_statuses?id={}&wait={}'.format(batch_id, wait),
                 auth_user=auth_user,
                 auth_password=auth_password)
-            return yaml.safe_load(result)['data'][0]['status']
+            return json.loads(result)['data'][0]['status']
         except BaseException as err:
             raise BattleshipException(err) from err
 
     def _get_prefix(self):
-        return _sha512('battleship'.encode('utf-8'))[0:6]
+        return _NAMESPACE.prefix
+
+    def _get_address(self, name, leaf):
+        return _NAMESPACE.make_address(name, leaf)
+
+    def _get_legacy_address(self, name):
+        return _NAMESPACE.make_address(name)
 
-    def _get_address(self, name):
-        battleship_prefix = self._get_prefix()
-        game_address = _sha512(name.encode('utf-8'))[0:64]
-        return battleship_prefix + game_address
+    def _get_game_addresses(self, name):
+        # The address of games stored before the leaves is declared too,
+        # so that such games can be moved to the leaves
+        return [self._get_address(name, METADATA_LEAF)] + [
+            self._get_address(name, '{:02x}'.format(player))
+            for player in PLAYERS
+        ] + [self._get_address(name, HISTORY_LEAF),
+             self._get_legacy_address(name)]
 
     def _send_request(self,
                       suffix,
@@ -132,62 +305,45 @@ class BattleshipClient:
                       name=None,
                       auth_user=None,
                       auth_password=None):
-        if self._base_url.startswith("http://"):
-            url = "{}/{}".format(self._base_url, suffix)
-        else:
-            url = "http://{}/{}".format(self._base_url, suffix)
-
-        headers = {}
-        if auth_user is not None:
-            auth_string = "{}:{}".format(auth_user, auth_password)
-            b64_string = b64encode(auth_string.encode()).decode()
-            auth_header = 'Basic {}'.format(b64_string)
-            headers['Authorization'] = auth_header
-
-        if content_type is not None:
-            headers['Content-Type'] = content_type
-
         try:
-            if data is not None:
-                result = requests.post(url, headers=headers, data=data)
-            else:
-                result = requests.get(url, headers=headers)
-
-            if result.status_code == 404:
-                raise BattleshipException("No such game: {}".format(name))
+            return self._rest_client.request(
+                suffix,
+                data=data,
+                content_type=content_type,
+                auth_user=auth_user,
+                auth_password=auth_password).text
 
-            if not result.ok:
-                raise BattleshipException("Error {}: {}".format(
-                    result.status_code, result.reason))
+        except RestApiError as err:
+            if err.status_code == 404:
+                raise BattleshipException(
+                    "No such game: {}".format(name)) from err
+            raise BattleshipException(str(err)) from err
 
-        except requests.ConnectionError as err:
-            raise BattleshipException(
-                'Failed to connect to {}: {}'.format(url, str(err))) from err
-
-        except BaseException as err:
-            raise BattleshipException(err) from err
-
-        return result.text
+        except RestApiUnavailable as err:
+            raise BattleshipException(str(err)) from err
 
     def _send_battleship_txn(self,
-                     name,
-                     action,
-                     space="",
-                     wait=None,
-                     auth_user=None,
-                     auth_password=None):
-        # Serialization is just a delimited utf-8 encoded string
-        payload = ",".join([name, action, str(space)]).encode()
-
-        # Construct the address
-        address = self._get_address(name)
+                             name,
+                             action,
+                             space="",
+                             addresses=None,
+                             wait=None,
+                             auth_user=None,
+                             auth_password=None):
+        try:
+            payload = serialize_payload([(name, action, space)])
+        except ValueError as err:
+            raise BattleshipException(str(err)) from err
+
+        if addresses is None:
+            addresses = self._get_game_addresses(name)
 
         header = TransactionHeader(
             signer_public_key=self._signer.get_public_key().as_hex(),
             family_name="battleship",
             family_version="1.0",
-            inputs=[address],
-            outputs=[address],
+            inputs=addresses,
+            outputs=addresses,
             dependencies=[],
             payload_sha512=_sha512(payload),
             batcher_public_key=self._signer.get_public_key().as_hex(),
@@ -205,6 +361,16 @@ class BattleshipClient:
         batch_list = self._create_batch_list([transaction])
         batch_id = batch_list.batches[0].header_signature
 
+        if self._validator_url is not None:
+            # Subscribe before submitting, so that no commit is missed
+            with CommitWaiter(self._validator_url, game=name) as waiter:
+                waiter.submit(batch_list.batches)
+                if not wait or wait <= 0:
+                    return 'Batch {} submitted'.format(batch_id)
+                status = waiter.wait(batch_id, wait)
+                self.last_shots = waiter.shots
+            return 'Batch {} {}'.format(batch_id, status)
+
         if wait and wait > 0:
             wait_time = 0
             start_time = time.time()
@@ -0,0 +1,146 @@
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from sawtooth_battleship.battleship_exceptions import BattleshipException
+from sawtooth_battleship.processor.handler import SHOT_EVENT
+
+from sawtooth_sdk.client.zmq_client import ZmqClient
+from sawtooth_sdk.messaging.stream import Stream
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsSubscribeRequest
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsSubscribeResponse
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsUnsubscribeRequest
+from sawtooth_sdk.protobuf.events_pb2 import EventFilter
+from sawtooth_sdk.protobuf.events_pb2 import EventList
+from sawtooth_sdk.protobuf.events_pb2 import EventSubscription
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+BLOCK_COMMIT_EVENT = 'sawtooth/block-commit'
+
+# Seconds to wait for the validator to answer a request
+REQUEST_TIMEOUT = 10
+
+
+class CommitWaiter:
+    """Waits for batches to commit by following the validator's events
+    instead of polling the REST API.
+
+    The waiter subscribes to block commits, and to the shots of a game if
+    one is given, when it is created. Batches should be submitted after
+    it is created, through submit(), so that no commit can be missed.
+    After each block commit it asks the validator once for the status of
+    the batch.
+    """
+
+    def __init__(self, url, game=None):
+        """
+        Args:
+            url (str): the validator's component endpoint
+            game (str): the game whose shot events are collected
+        """
+        self._stream = Stream(url)
+        self._client = ZmqClient(self._stream, timeout=REQUEST_TIMEOUT)
+        self._received = None
+        self.shots = []
+
+        subscriptions = [EventSubscription(event_type=BLOCK_COMMIT_EVENT)]
+        if game is not None:
+            subscriptions.append(EventSubscription(
+                event_type=SHOT_EVENT,
+                filters=[EventFilter(
+                    key='game',
+                    match_string=game,
+                    filter_type=EventFilter.SIMPLE_ALL)]))
+
+        response = ClientEventsSubscribeResponse()
+        response.ParseFromString(self._request(
+            Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST,
+            ClientEventsSubscribeRequest(subscriptions=subscriptions)))
+        if response.status != ClientEventsSubscribeResponse.OK:
+            self._stream.close()
+            raise BattleshipException(
+                'Unable to subscribe to events: {}'.format(
+                    response.response_message))
+
+    def submit(self, batches):
+        """Submit batches straight to the validator."""
+        try:
+            self._client.submit_batches(batches).result()
+        except Exception as err:
+            raise BattleshipException(
+                'Unable to submit batches: {}'.format(err)) from err
+
+    def wait(self, batch_id, timeout):
+        """Wait until the batch is committed or found invalid, or until
+        `timeout` seconds have passed.
+
+        Returns:
+            str: the batch status: COMMITTED, INVALID, PENDING or UNKNOWN
+        """
+        deadline = time.time() + timeout
+        status = self._batch_status(batch_id)
+
+        while status in ('PENDING', 'UNKNOWN'):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+
+            # An unanswered receive is kept for the next call, so that no
+            # message is lost to a timed out one
+            if self._received is None:
+                self._received = self._stream.receive()
+            try:
+                message = self._received.result(remaining)
+            except FutureTimeoutError:
+                break
+            self._received = None
+
+            if message.message_type != Message.CLIENT_EVENTS:
+                continue
+
+            events = EventList()
+            events.ParseFromString(message.content)
+            self.shots.extend(
+                {attribute.key: attribute.value
+                 for attribute in event.attributes}
+                for event in events.events
+                if event.event_type == SHOT_EVENT)
+
+            status = self._batch_status(batch_id)
+
+        return status
+
+    def close(self):
+        try:
+            self._request(
+                Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST,
+                ClientEventsUnsubscribeRequest())
+        finally:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _batch_status(self, batch_id):
+        try:
+            return self._client.get_batch_statuses([batch_id]).result()[
+                batch_id]
+        except Exception as err:
+            raise BattleshipException(
+                'Unable to get the status of batch {}: {}'.format(
+                    batch_id, err)) from err
+
+    def _request(self, message_type, request):
+        try:
+            return self._stream.send(
+                message_type,
+                request.SerializeToString()).result(REQUEST_TIMEOUT).content
+        except Exception as err:
+            raise BattleshipException(
+                'Validator request failed: {}'.format(err)) from err
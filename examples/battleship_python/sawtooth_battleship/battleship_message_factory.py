@@ -1,3 +1,7 @@
+from sawtooth_battleship.processor.battleship_payload \
+    import serialize_payload
+from sawtooth_battleship.processor.battleship_state \
+    import make_game_addresses
 from sawtooth_processor_test.message_factory import MessageFactory
 
 
@@ -13,29 +17,72 @@ class BattleshipMessageFactory:
         return self._factory.namespace + \
             self._factory.sha512(game.encode())[0:64]
 
+    @staticmethod
+    def _game_to_addresses(game):
+        return make_game_addresses(game)
+
     def create_tp_register(self):
         return self._factory.create_tp_register()
 
     def create_tp_response(self, status):
         return self._factory.create_tp_response(status)
 
-    def _create_txn(self, txn_function, game, action, space=None):
-        payload = ",".join([
+    @staticmethod
+    def _create_payload(game, action, space=None):
+        return ",".join([
             str(game), str(action), str(space)
         ]).encode()
 
-        addresses = [self._game_to_address(game)]
+    def _create_txn(self, txn_function, game, action, space=None):
+        payload = self._create_payload(game, action, space)
+
+        addresses = self._game_to_addresses(game)
 
         return txn_function(payload, addresses, addresses, [])
 
+    def _create_txns(self, txns_function, moves):
+        payloads = []
+        addresses = []
+        for game, action, space in moves:
+            payloads.append(self._create_payload(game, action, space))
+            addresses.append(self._game_to_addresses(game))
+
+        return txns_function(payloads, addresses, addresses)
+
     def create_tp_process_request(self, action, game, space=None):
         txn_function = self._factory.create_tp_process_request
         return self._create_txn(txn_function, game, action, space)
 
+    def create_binary_tp_process_request(self, moves):
+        """Create a TpProcessRequest carrying every (name, action, space)
+        move in a single binary payload.
+        """
+        addresses = sorted({
+            address
+            for game, _, _ in moves
+            for address in self._game_to_addresses(game)
+        })
+        return self._factory.create_tp_process_request(
+            serialize_payload(moves), addresses, addresses, [])
+
     def create_transaction(self, game, action, space=None):
         txn_function = self._factory.create_transaction
         return self._create_txn(txn_function, game, action, space)
 
+    def create_tp_process_requests(self, moves):
+        """Create a TpProcessRequest for each (name, action, space) move,
+        signing them in parallel.
+        """
+        txns_function = self._factory.create_tp_process_requests
+        return self._create_txns(txns_function, moves)
+
+    def create_transactions(self, moves):
+        """Create a transaction for each (name, action, space) move,
+        signing them in parallel.
+        """
+        txns_function = self._factory.create_transactions
+        return self._create_txns(txns_function, moves)
+
     def create_get_request(self, game):
         addresses = [self._game_to_address(game)]
         return self._factory.create_get_request(addresses)
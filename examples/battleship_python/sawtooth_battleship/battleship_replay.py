@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_board import SHIP_IDS
+from sawtooth_battleship.processor.battleship_state import Game
+from sawtooth_battleship.processor.battleship_state import PLAYERS
+
+
+# A player's shots, hits and ships sunk over a history
+Stats = namedtuple('Stats', ['shots', 'hits', 'sunk'])
+
+
+def replay(game, history, moves=None):
+    """Rebuild a game as it stood after its first `moves` shots, from its
+    current fleets and its history, without reading past state.
+
+    Games stored before histories were kept are replayed from their first
+    shot recorded, as if no shot was taken before.
+
+    Args:
+        game (Game): the game, with both its boards
+        history (list of Shot): the shots taken in the game, oldest first
+        moves (int): the number of shots to replay, all if None
+
+    Returns:
+        Game: a new game, with both boards as they stood
+    """
+    boards = {}
+    hulls = {}
+    for player in PLAYERS:
+        # The hulls at the start are those left now and those hit since
+        board, left = game.fleet(player)
+        boards[player] = Board(board.ships)
+        hulls[player] = [
+            count + bin(ship & board.hits).count('1')
+            for count, ship in zip(left, board.ships)
+        ]
+
+    state = 'P1-NEXT'
+    for shot in history[:moves]:
+        target = 2 if shot.player == 1 else 1
+        ship_id = boards[target].shoot(shot.space - 1)
+        if ship_id is not None:
+            hulls[target][SHIP_IDS.index(ship_id)] -= 1
+
+        if not any(hulls[target]):
+            state = 'P{}-WIN'.format(shot.player)
+        else:
+            state = 'P{}-NEXT'.format(target)
+
+    return Game(name=game.name,
+                board_P1=boards[1],
+                board_P2=boards[2],
+                state=state,
+                player1=game.player1,
+                player2=game.player2,
+                hulls_P1=hulls[1],
+                hulls_P2=hulls[2])
+
+
+def stats(history):
+    """Return each player's Stats over a history, by player number."""
+    counts = {player: [0, 0, 0] for player in PLAYERS}
+    for shot in history:
+        count = counts[shot.player]
+        count[0] += 1
+        if shot.result != 'miss':
+            count[1] += 1
+        if shot.result == 'sunk':
+            count[2] += 1
+    return {player: Stats(*count) for player, count in counts.items()}
@@ -0,0 +1,468 @@
+import argparse
+import getpass
+import hashlib
+import logging
+import random
+import threading
+import time
+import uuid
+from base64 import b64encode
+
+from sawtooth_battleship.battleship_exceptions import BattleshipException
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_board import place_fleet
+from sawtooth_battleship.processor.battleship_board import random_fleet
+from sawtooth_battleship.processor.battleship_payload \
+    import serialize_payload
+from sawtooth_battleship.processor.battleship_state import PLAYERS
+from sawtooth_battleship.processor.battleship_state \
+    import make_board_address
+from sawtooth_battleship.processor.battleship_state \
+    import make_game_addresses
+from sawtooth_battleship.processor.battleship_state \
+    import make_metadata_address
+
+from sawtooth_intkey.client_cli.create_batch import create_batch
+from sawtooth_intkey.client_cli.intkey_workload import post_batches
+from sawtooth_intkey.client_cli.workload.sawtooth_workload import Workload
+from sawtooth_intkey.client_cli.workload.workload_generator import \
+    WorkloadGenerator
+
+from sawtooth_signing import create_context
+from sawtooth_signing import CryptoFactory
+from sawtooth_signing import ParseError
+from sawtooth_signing.key_pool import KeyPool
+
+from sawtooth_sdk.protobuf import batch_pb2
+from sawtooth_sdk.protobuf import transaction_pb2
+
+
+LOGGER = logging.getLogger(__name__)
+
+CELLS = 100
+
+SEQUENTIAL = 'sequential'
+RANDOM = 'random'
+# Every other cell first, as no ship fits between them, then the rest
+PARITY = 'parity'
+STRATEGIES = (SEQUENTIAL, RANDOM, PARITY)
+
+# Seconds after which a game whose batch has not committed is given up,
+# as the generator drops invalid batches without saying which
+STALE_TIMEOUT = 300
+
+
+def shot_order(strategy):
+    """Return the cells, 1 to 100, in the order a player shoots them.
+    """
+    cells = list(range(1, CELLS + 1))
+    if strategy == SEQUENTIAL:
+        return cells
+
+    if strategy == RANDOM:
+        random.shuffle(cells)
+        return cells
+
+    if strategy == PARITY:
+        even = [cell for cell in cells if sum(divmod(cell - 1, 10)) % 2 == 0]
+        odd = [cell for cell in cells if sum(divmod(cell - 1, 10)) % 2 == 1]
+        random.shuffle(even)
+        random.shuffle(odd)
+        return even + odd
+
+    raise BattleshipException('Unknown shot strategy: {}'.format(strategy))
+
+
+class _GameRun:
+    """A game played by the workload: its players, their fleets and the
+    shots left to each of them.
+
+    The workload keeps its own copy of the boards, so that it knows when
+    a player has sunk the other's whole fleet.
+    """
+
+    def __init__(self, name, url, signers, strategy, max_shots):
+        self.name = name
+        self.url = url
+        self.signers = signers
+        self.shots = {player: shot_order(strategy) for player in PLAYERS}
+        self.shots_left = max_shots
+        self.turn = 1
+        self.winner = None
+
+        self.fleets = {player: random_fleet() for player in PLAYERS}
+        self.boards = {
+            player: Board(place_fleet(fleet))
+            for player, fleet in self.fleets.items()
+        }
+        # The players whose fleets are not placed with the game's creation
+        self.unplaced = [
+            player for player in PLAYERS
+            if self.signer(player) is not self.signer(1)
+        ]
+
+    @property
+    def target(self):
+        return 2 if self.turn == 1 else 1
+
+    def signer(self, player):
+        return self.signers[(player - 1) % len(self.signers)]
+
+    def placement(self, player):
+        """Return the move placing a player's fleet."""
+        return (self.name, 'place', (player, [
+            (index + 1, vertical) for index, vertical in self.fleets[player]
+        ]))
+
+    def next_shot(self):
+        """Return the next cell the player whose turn it is shoots, or None
+        once the game is over.
+        """
+        if self.winner is not None:
+            return None
+        if self.shots_left is not None and self.shots_left <= 0:
+            return None
+        if not self.shots[self.turn]:
+            return None
+        return self.shots[self.turn][0]
+
+    def shot_committed(self):
+        board = self.boards[self.target]
+        board.shoot(self.shots[self.turn].pop(0) - 1)
+        if not board.occupied & ~board.hits:
+            self.winner = self.turn
+        if self.shots_left is not None:
+            self.shots_left -= 1
+        self.turn = self.target
+
+
+class LatencyStats:
+    """The commit latencies of the batches of each action.
+    """
+
+    def __init__(self):
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def add(self, action, latency):
+        with self._lock:
+            self._latencies.setdefault(action, []).append(latency)
+
+    def summary(self):
+        """Return, for each action, the number of batches committed and
+        their mean, median, 95th percentile and largest latencies.
+        """
+        with self._lock:
+            latencies = {
+                action: sorted(values)
+                for action, values in self._latencies.items()
+            }
+
+        return {
+            action: {
+                'count': len(values),
+                'mean': sum(values) / len(values),
+                'p50': values[len(values) // 2],
+                'p95': values[min(len(values) - 1,
+                                  int(len(values) * 0.95))],
+                'max': values[-1],
+            }
+            for action, values in latencies.items()
+        }
+
+
+class BattleshipWorkload(Workload):
+    """
+    This workload plays Battleship games through their whole lifecycle:
+    each game is created, its players place their fleets, take turns
+    shooting until one of them wins or the shots run out, and the game is
+    then deleted.
+
+    Each game has a single batch pending at a time, so up to `games`
+    games are played at once. A game's next batch is submitted as soon as
+    the previous one commits; new games are started whenever the
+    generator finds no batch to check, or one not yet committed.
+
+    The commit latency of each batch is recorded by action, and logged
+    every `display_frequency` seconds and when the workload stops.
+    """
+
+    def __init__(self, delegate, args):
+        super().__init__(delegate, args)
+        self._auth_info = args.auth_info
+        self._urls = []
+        self._pending_batches = {}
+        self._lock = threading.Lock()
+        self._delegate = delegate
+
+        self._games = args.games
+        self._players = args.players
+        self._strategy = args.strategy
+        self._max_shots = args.shots
+        self._display_frequency = args.display_frequency
+        self._last_report = time.time()
+        self.latencies = LatencyStats()
+
+        self._context = create_context('secp256k1')
+        self._crypto_factory = CryptoFactory(context=self._context)
+        self._key_pool = None
+        if args.key_pool is not None:
+            try:
+                self._key_pool = KeyPool.load(self._context, args.key_pool)
+            except ParseError as pe:
+                raise BattleshipException(str(pe)) from pe
+            except IOError as ioe:
+                raise BattleshipException(str(ioe)) from ioe
+
+    def _new_signer(self):
+        if self._key_pool is not None:
+            return self._key_pool.next_signer()
+        return self._crypto_factory.new_signer(
+            self._context.new_random_private_key())
+
+    def on_will_start(self):
+        pass
+
+    def on_will_stop(self):
+        self._report()
+        if self._key_pool is not None:
+            self._key_pool.close()
+
+    def on_validator_discovered(self, url):
+        self._urls.append(url)
+
+    def on_validator_removed(self, url):
+        with self._lock:
+            if url in self._urls:
+                self._urls.remove(url)
+                self._pending_batches = {
+                    batch_id: pending
+                    for batch_id, pending in self._pending_batches.items()
+                    if pending[0].url != url
+                }
+
+    def on_all_batches_committed(self):
+        self._start_game()
+
+    def on_batch_committed(self, batch_id):
+        with self._lock:
+            pending = self._pending_batches.pop(batch_id, None)
+
+        if pending is None:
+            return
+
+        game, action, submitted = pending
+        self.latencies.add(action, time.time() - submitted)
+
+        if action == 'shoot':
+            game.shot_committed()
+
+        if action != 'delete':
+            self._play(game)
+
+        if time.time() - self._last_report >= self._display_frequency:
+            self._report()
+
+    def on_batch_not_yet_committed(self):
+        self._start_game()
+
+    def _start_game(self):
+        with self._lock:
+            now = time.time()
+            self._pending_batches = {
+                batch_id: pending
+                for batch_id, pending in self._pending_batches.items()
+                if now - pending[2] < STALE_TIMEOUT
+            }
+            if len(self._pending_batches) >= self._games or not self._urls:
+                return
+            url = random.choice(self._urls)
+
+        signers = [self._new_signer() for _ in range(self._players)]
+        game = _GameRun(
+            name=uuid.uuid4().hex[:16],
+            url=url,
+            signers=signers,
+            strategy=self._strategy,
+            max_shots=self._max_shots)
+
+        # The creator places their fleets in the same transaction
+        self._submit(
+            game, 'create', signer=signers[0],
+            addresses=make_game_addresses(game.name),
+            moves=[(game.name, 'create', None)] + [
+                game.placement(player) for player in PLAYERS
+                if player not in game.unplaced
+            ])
+
+    def _play(self, game):
+        if game.unplaced:
+            player = game.unplaced.pop(0)
+            self._submit(
+                game, 'place', signer=game.signer(player),
+                addresses=[make_metadata_address(game.name),
+                           make_board_address(game.name, player),
+                           make_game_addresses(game.name)[-1]],
+                moves=[game.placement(player)])
+            return
+
+        space = game.next_shot()
+        if space is None:
+            LOGGER.debug('Game %s completed, won by player %s',
+                         game.name, game.winner)
+            self._submit(
+                game, 'delete', signer=game.signer(1),
+                addresses=make_game_addresses(game.name),
+                moves=[(game.name, 'delete', None)])
+            return
+
+        # A shot reads both boards, to check that the fleets are placed
+        self._submit(
+            game, 'shoot', signer=game.signer(game.turn),
+            addresses=make_game_addresses(game.name),
+            moves=[(game.name, 'shoot', space)])
+
+    def _submit(self, game, action, signer, addresses, moves):
+        txn = create_battleship_transaction(
+            moves=moves,
+            addresses=addresses,
+            signer=signer)
+
+        batch = create_batch(transactions=[txn], signer=signer)
+        batch_id = batch.header_signature
+
+        submitted = time.time()
+        (code, _) = post_batches(
+            game.url, batch_pb2.BatchList(batches=[batch]),
+            auth_info=self._auth_info)
+
+        if code == 202:
+            with self._lock:
+                self._pending_batches[batch_id] = (game, action, submitted)
+            self.delegate.on_new_batch(batch_id, game.url)
+
+    def _report(self):
+        self._last_report = time.time()
+        for action, stats in sorted(self.latencies.summary().items()):
+            LOGGER.warning(
+                '%s: %d batches committed, latency mean %.3fs, '
+                'p50 %.3fs, p95 %.3fs, max %.3fs',
+                action, stats['count'], stats['mean'], stats['p50'],
+                stats['p95'], stats['max'])
+
+
+def create_battleship_transaction(moves, addresses, signer):
+    """Creates a signed battleship transaction.
+
+    Args:
+        moves ([tuple]): the (name, action, space) moves the transaction
+            carries, in the form taken by serialize_payload()
+        addresses ([str]): the addresses the transaction reads and writes
+        signer (:obj:`Signer`): the cryptographic signer for signing the
+            transaction
+
+    Returns:
+        transaction (transaction_pb2.Transaction): the signed battleship
+            transaction
+    """
+    payload = serialize_payload(moves)
+
+    header = transaction_pb2.TransactionHeader(
+        signer_public_key=signer.get_public_key().as_hex(),
+        family_name='battleship',
+        family_version='1.0',
+        inputs=addresses,
+        outputs=addresses,
+        dependencies=[],
+        payload_sha512=hashlib.sha512(payload).hexdigest(),
+        batcher_public_key=signer.get_public_key().as_hex(),
+        nonce=hex(random.randint(0, 2**64)))
+
+    header_bytes = header.SerializeToString()
+
+    return transaction_pb2.Transaction(
+        header=header_bytes,
+        payload=payload,
+        header_signature=signer.sign(header_bytes))
+
+
+def do_workload(args):
+    """
+    Create WorkloadGenerator and BattleshipWorkload. Set the Battleship
+    workload in the generator and run.
+    """
+    try:
+        args.auth_info = _get_auth_info(args.auth_user, args.auth_password)
+        generator = WorkloadGenerator(args)
+        workload = BattleshipWorkload(generator, args)
+        generator.set_workload(workload)
+        generator.run()
+    except KeyboardInterrupt:
+        generator.stop()
+
+
+def _get_auth_info(auth_user, auth_password):
+    if auth_user is not None:
+        if auth_password is None:
+            auth_password = getpass.getpass(prompt="Auth Password: ")
+        auth_string = "{}:{}".format(auth_user, auth_password)
+        return b64encode(auth_string.encode()).decode()
+
+    return None
+
+
+def add_workload_parser(subparsers, parent_parser):
+    parser = subparsers.add_parser(
+        'workload',
+        help='Plays battleship games to generate load',
+        description='Plays many battleship games at once, from creation '
+        'to deletion, and reports the commit latency of each action.',
+        parents=[parent_parser],
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument('--rate',
+                        type=int,
+                        help='Batch rate in batches per second. '
+                             'Should be greater then 0.',
+                        default=1)
+    parser.add_argument('-d', '--display-frequency',
+                        type=int,
+                        help='time in seconds between display of batches '
+                             'rate and latency updates.',
+                        default=30)
+    parser.add_argument('-u', '--urls',
+                        help='comma separated urls of the REST API to connect '
+                        'to.',
+                        default="http://127.0.0.1:8008")
+    parser.add_argument('--auth-user',
+                        type=str,
+                        help='username for authentication '
+                             'if REST API is using Basic Auth')
+    parser.add_argument('--auth-password',
+                        type=str,
+                        help='password for authentication '
+                             'if REST API is using Basic Auth')
+    parser.add_argument('--key-pool',
+                        type=str,
+                        help="A keystore file of pre-generated keys; "
+                             "players are given its keys in turn instead "
+                             "of new random keys. Create one with 'intkey "
+                             "create_key_pool'.")
+    parser.add_argument('--games',
+                        type=int,
+                        help='the largest number of games played at once',
+                        default=100)
+    parser.add_argument('--players',
+                        type=int,
+                        choices=[1, 2],
+                        help='the number of signers playing each game; a '
+                             'single signer plays both sides',
+                        default=2)
+    parser.add_argument('--strategy',
+                        choices=STRATEGIES,
+                        help='the order in which players shoot the cells',
+                        default=RANDOM)
+    parser.add_argument('--shots',
+                        type=int,
+                        help='the largest number of shots in a game',
+                        default=None)
@@ -0,0 +1,372 @@
+import logging
+import sqlite3
+from collections import namedtuple
+from urllib.request import pathname2url
+
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_state import Game
+from sawtooth_battleship.processor.battleship_state import PLAYERS
+from sawtooth_battleship.processor.battleship_state import RECORD_BOARD
+from sawtooth_battleship.processor.battleship_state import RECORD_HISTORY
+from sawtooth_battleship.processor.battleship_state import RECORD_METADATA
+from sawtooth_battleship.processor.battleship_state import deserialize_boards
+from sawtooth_battleship.processor.battleship_state import deserialize_games
+from sawtooth_battleship.processor.battleship_state \
+    import deserialize_metadata
+from sawtooth_battleship.processor.battleship_state import record_type
+
+
+LOGGER = logging.getLogger(__name__)
+
+WINS = {'P1-WIN': 1, 'P2-WIN': 2}
+
+# Every game and board row is kept with the range of blocks it holds for:
+# from start_block_num, until end_block_num when a later block replaced
+# it, or NULL while it is current. Moves hold from their block_num until
+# the end_block_num that deleted their game, so that a game created again
+# under the same name starts with none. A fork is undone by dropping the
+# rows its blocks started and reopening those they ended.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    block_num INTEGER PRIMARY KEY,
+    block_id TEXT NOT NULL,
+    state_root_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    name TEXT NOT NULL,
+    address TEXT NOT NULL,
+    state TEXT NOT NULL,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    start_block_num INTEGER NOT NULL,
+    end_block_num INTEGER
+);
+CREATE INDEX IF NOT EXISTS games_current
+    ON games (end_block_num, address, name);
+CREATE TABLE IF NOT EXISTS boards (
+    name TEXT NOT NULL,
+    player INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    board BLOB NOT NULL,
+    hulls BLOB NOT NULL,
+    start_block_num INTEGER NOT NULL,
+    end_block_num INTEGER
+);
+CREATE INDEX IF NOT EXISTS boards_current
+    ON boards (end_block_num, name, player);
+CREATE TABLE IF NOT EXISTS moves (
+    name TEXT NOT NULL,
+    block_num INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    cell INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    state TEXT NOT NULL,
+    end_block_num INTEGER
+);
+CREATE INDEX IF NOT EXISTS moves_current
+    ON moves (end_block_num, name, block_num, seq);
+CREATE TABLE IF NOT EXISTS results (
+    name TEXT NOT NULL,
+    block_num INTEGER NOT NULL,
+    winner TEXT NOT NULL,
+    loser TEXT NOT NULL
+);
+"""
+
+_VERSIONED = ('games', 'boards')
+
+
+# A shot, as recorded by the index
+Move = namedtuple(
+    'Move', ['block_num', 'player', 'cell', 'result', 'state'])
+
+
+class BattleshipIndex:
+    """A SQLite view of the battleship games on the chain, kept by the
+    indexer block by block, and read by the CLI in its place.
+
+    Games and boards are decoded from the state records the blocks write,
+    and shots from the events of the handler.
+    """
+
+    def __init__(self, path, read_only=False):
+        """
+        Args:
+            path (str): the database file, created if missing unless
+                read_only
+            read_only (bool): open an existing index for queries only, so
+                that it can be read without write access to its directory
+        """
+        if read_only:
+            self._connection = sqlite3.connect(
+                'file:{}?mode=ro'.format(pathname2url(path)),
+                uri=True,
+                check_same_thread=False)
+            return
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # Readers are not blocked by the indexer's writes
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def block_id(self, block_num):
+        """Return the id of the block indexed at `block_num`, or None."""
+        row = self._connection.execute(
+            'SELECT block_id FROM blocks WHERE block_num = ?',
+            (block_num,)).fetchone()
+        return row[0] if row else None
+
+    def last_known_block_ids(self, count=15):
+        """Return the ids of the `count` latest blocks indexed, newest
+        first, for the validator to resume the events from.
+        """
+        return [
+            row[0] for row in self._connection.execute(
+                'SELECT block_id FROM blocks '
+                'ORDER BY block_num DESC LIMIT ?', (count,))
+        ]
+
+    def add_block(self, block_num, block_id, state_root_hash, changes=(),
+                  shots=()):
+        """Index a block: its state changes and its shots, in a single
+        database transaction.
+
+        A block already indexed is skipped. One replacing another at the
+        same height is a fork: the blocks from that height are dropped
+        first.
+
+        Args:
+            changes (iterable of (str, bytes)): the battleship addresses
+                the block set, each with its data, or with None if deleted
+            shots (iterable of dict): the attributes of the shot events,
+                in the order they were emitted
+
+        Returns:
+            bool: whether the block was indexed
+        """
+        known_id = self.block_id(block_num)
+        if known_id == block_id:
+            return False
+
+        with self._connection:
+            if known_id is not None:
+                LOGGER.info('Fork at block %s: %s replaces %s',
+                            block_num, block_id[:8], known_id[:8])
+                self._drop_from(block_num)
+
+            self._connection.execute(
+                'INSERT INTO blocks VALUES (?, ?, ?)',
+                (block_num, block_id, state_root_hash))
+            # The shots go first, so that those of a game the block
+            # deleted end with it
+            for seq, shot in enumerate(shots):
+                self._add_shot(block_num, seq, shot)
+            removed = set()
+            for address, data in changes:
+                removed |= self._apply_change(block_num, address, data)
+            self._end_moves(block_num, removed)
+
+        return True
+
+    def drop_from(self, block_num):
+        """Forget the blocks from `block_num` on, as if never indexed."""
+        with self._connection:
+            self._drop_from(block_num)
+
+    def get_game(self, name):
+        """Return the game named `name` with both its boards, or None."""
+        row = self._connection.execute(
+            'SELECT name, state, player1, player2 FROM games '
+            'WHERE end_block_num IS NULL AND name = ?', (name,)).fetchone()
+        if row is None:
+            return None
+
+        game = _game_from_row(row)
+        for player, board, hulls in self._connection.execute(
+                'SELECT player, board, hulls FROM boards '
+                'WHERE end_block_num IS NULL AND name = ?', (name,)):
+            game.set_fleet(player, Board.from_bytes(board), list(hulls))
+        return game
+
+    def list_games(self, start=None, limit=None, player=None, state=None):
+        """Return the games, without their boards, in the order of their
+        state addresses, like BattleshipClient.list().
+
+        Args:
+            start (str): the state address to list from
+            limit (int): the largest number of games to return
+            player (str): if given, only games with a player whose public
+                key starts with it are returned
+            state (str): if given, only games in this state are returned
+        """
+        query = ['SELECT name, state, player1, player2 FROM games '
+                 'WHERE end_block_num IS NULL']
+        params = []
+        if start is not None:
+            query.append('AND address >= ?')
+            params.append(start)
+        if state is not None:
+            query.append('AND state = ?')
+            params.append(state)
+        if player is not None:
+            query.append('AND (substr(player1, 1, ?) = ? '
+                         'OR substr(player2, 1, ?) = ?)')
+            params.extend([len(player), player] * 2)
+        query.append('ORDER BY address, name')
+        if limit is not None:
+            query.append('LIMIT ?')
+            params.append(limit)
+
+        return [
+            _game_from_row(row) for row in
+            self._connection.execute(' '.join(query), params)
+        ]
+
+    def get_moves(self, name):
+        """Return the shots of the current game named `name`, oldest
+        first.
+        """
+        return [
+            Move(*row) for row in self._connection.execute(
+                'SELECT block_num, player, cell, result, state FROM moves '
+                'WHERE end_block_num IS NULL AND name = ? '
+                'ORDER BY block_num, seq', (name,))
+        ]
+
+    def leaderboard(self, limit=10):
+        """Return the players who won the most games, as (public key, wins,
+        games finished) tuples, most wins first.
+        """
+        return self._connection.execute(
+            'SELECT player, SUM(won), COUNT(*) FROM ('
+            '    SELECT winner AS player, 1 AS won FROM results'
+            '    UNION ALL'
+            '    SELECT loser AS player, 0 AS won FROM results'
+            '    WHERE loser != winner) '
+            'GROUP BY player ORDER BY SUM(won) DESC, COUNT(*), player '
+            'LIMIT ?', (limit,)).fetchall()
+
+    def _drop_from(self, block_num):
+        for table in _VERSIONED:
+            self._connection.execute(
+                'DELETE FROM {} WHERE start_block_num >= ?'.format(table),
+                (block_num,))
+        for table in _VERSIONED + ('moves',):
+            self._connection.execute(
+                'UPDATE {} SET end_block_num = NULL '
+                'WHERE end_block_num >= ?'.format(table), (block_num,))
+        for table in ('moves', 'results', 'blocks'):
+            self._connection.execute(
+                'DELETE FROM {} WHERE block_num >= ?'.format(table),
+                (block_num,))
+
+    def _apply_change(self, block_num, address, data):
+        # The record at an address holds every game stored there, so the
+        # rows of the address are replaced as a whole. The names of the
+        # games gone from the address are returned.
+        previous = {
+            name for name, in self._connection.execute(
+                'SELECT name FROM games '
+                'WHERE end_block_num IS NULL AND address = ?', (address,))
+        }
+        for table in _VERSIONED:
+            self._connection.execute(
+                'UPDATE {} SET end_block_num = ? '
+                'WHERE end_block_num IS NULL AND address = ?'.format(table),
+                (block_num, address))
+        if data is None:
+            return previous
+
+        try:
+            kind = record_type(data)
+            if kind == RECORD_METADATA:
+                games = deserialize_metadata(data).values()
+                boards = []
+            elif kind == RECORD_BOARD:
+                games = []
+                player = int(address[6:8], 16)
+                boards = [
+                    (name, player, board, hulls)
+                    for name, (board, hulls) in
+                    deserialize_boards(data).items()
+                ]
+            elif kind == RECORD_HISTORY:
+                # The moves are indexed from the shot events
+                return set()
+            else:
+                games = deserialize_games(data).values()
+                boards = [
+                    (game.name, player) + tuple(game.fleet(player))
+                    for game in games for player in PLAYERS
+                ]
+        except ValueError as err:
+            LOGGER.warning('Skipping the record at %s: %s', address, err)
+            return set()
+
+        for game in games:
+            self._add_game(block_num, address, game)
+        for name, player, board, hulls in boards:
+            self._connection.execute(
+                'INSERT INTO boards VALUES (?, ?, ?, ?, ?, ?, NULL)',
+                (name, player, address, board.to_bytes(), bytes(hulls),
+                 block_num))
+
+        return previous - {game.name for game in games}
+
+    def _add_game(self, block_num, address, game):
+        # A result is recorded when a game is first seen won
+        if game.state in WINS:
+            previous = self._connection.execute(
+                'SELECT state FROM games WHERE name = ? '
+                'AND end_block_num = ?', (game.name, block_num)).fetchall()
+            if not any(state == game.state for state, in previous):
+                winner, loser = (game.player1, game.player2) \
+                    if WINS[game.state] == 1 \
+                    else (game.player2, game.player1)
+                self._connection.execute(
+                    'INSERT INTO results VALUES (?, ?, ?, ?)',
+                    (game.name, block_num, winner, loser))
+
+        self._connection.execute(
+            'INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, NULL)',
+            (game.name, address, game.state, game.player1, game.player2,
+             block_num))
+
+    def _end_moves(self, block_num, names):
+        # Games gone from an address may have moved to another, as when
+        # moved to the leaves; only the moves of those gone from all end
+        for name in names:
+            self._connection.execute(
+                'UPDATE moves SET end_block_num = ? '
+                'WHERE end_block_num IS NULL AND name = ? AND NOT EXISTS ('
+                '    SELECT 1 FROM games '
+                '    WHERE end_block_num IS NULL AND name = ?)',
+                (block_num, name, name))
+
+    def _add_shot(self, block_num, seq, shot):
+        # The player who shot is known from the state the shot left
+        player = 1 if shot['state'] in ('P2-NEXT', 'P1-WIN') else 2
+        self._connection.execute(
+            'INSERT INTO moves VALUES (?, ?, ?, ?, ?, ?, ?, NULL)',
+            (shot['game'], block_num, seq, player, int(shot['cell']),
+             shot['result'], shot['state']))
+
+
+def _game_from_row(row):
+    name, state, player1, player2 = row
+    return Game(name=name,
+                board_P1=None,
+                board_P2=None,
+                state=state,
+                player1=player1,
+                player2=player2)
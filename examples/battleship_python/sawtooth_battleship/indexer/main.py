@@ -0,0 +1,97 @@
+import argparse
+import logging
+import os
+import signal
+import sys
+
+import pkg_resources
+
+from sawtooth_battleship.indexer.battleship_index import BattleshipIndex
+from sawtooth_battleship.indexer.subscriber import BattleshipSubscriber
+
+from sawtooth_sdk.processor.config import get_data_dir
+from sawtooth_sdk.processor.config import get_log_config
+from sawtooth_sdk.processor.config import get_log_dir
+from sawtooth_sdk.processor.log import init_console_logging
+from sawtooth_sdk.processor.log import log_configuration
+
+
+DISTRIBUTION_NAME = 'sawtooth-battleship'
+
+DEFAULT_CONNECT = 'tcp://localhost:4004'
+
+LOGGER = logging.getLogger(__name__)
+
+
+def default_index_path():
+    """Return where the indexer keeps its database by default."""
+    return os.path.join(get_data_dir(), 'battleship-index.db')
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        description='Keeps a SQLite index of the battleship games, for the '
+        'battleship CLI to query with --index.',
+        formatter_class=argparse.RawTextHelpFormatter)
+
+    parser.add_argument(
+        '-C', '--connect',
+        default=DEFAULT_CONNECT,
+        help='Endpoint for the validator connection')
+
+    parser.add_argument(
+        '--db',
+        metavar='FILE',
+        help='The index database file\n'
+             '(default: {})'.format(default_index_path()))
+
+    parser.add_argument('-v', '--verbose',
+                        action='count',
+                        default=0,
+                        help='Increase output sent to stderr')
+
+    try:
+        version = pkg_resources.get_distribution(DISTRIBUTION_NAME).version
+    except pkg_resources.DistributionNotFound:
+        version = 'UNKNOWN'
+
+    parser.add_argument(
+        '-V', '--version',
+        action='version',
+        version=(DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}')
+        .format(version),
+        help='print version information')
+
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    opts = parse_args(args)
+    index = None
+    subscriber = None
+    try:
+        log_config = get_log_config(
+            filename="battleship_indexer_log_config.toml")
+        if log_config is not None:
+            log_configuration(log_config=log_config)
+        else:
+            log_configuration(log_dir=get_log_dir(), name="battleship-indexer")
+
+        init_console_logging(verbose_level=opts.verbose)
+
+        index = BattleshipIndex(opts.db or default_index_path())
+        subscriber = BattleshipSubscriber(opts.connect, index)
+        signal.signal(signal.SIGTERM, lambda *_: subscriber.stop())
+
+        subscriber.start()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:  # pylint: disable=broad-except
+        print("Error: {}".format(e))
+    finally:
+        if subscriber is not None:
+            subscriber.close()
+        if index is not None:
+            index.close()
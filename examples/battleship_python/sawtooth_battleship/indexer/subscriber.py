@@ -0,0 +1,180 @@
+import logging
+import re
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from sawtooth_battleship.battleship_events import BLOCK_COMMIT_EVENT
+from sawtooth_battleship.battleship_exceptions import BattleshipException
+from sawtooth_battleship.processor.battleship_state import NAMESPACE
+from sawtooth_battleship.processor.handler import SHOT_EVENT
+
+from sawtooth_sdk.messaging.stream import RECONNECT_EVENT
+from sawtooth_sdk.messaging.stream import Stream
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsSubscribeRequest
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsSubscribeResponse
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsUnsubscribeRequest
+from sawtooth_sdk.protobuf.events_pb2 import EventFilter
+from sawtooth_sdk.protobuf.events_pb2 import EventList
+from sawtooth_sdk.protobuf.events_pb2 import EventSubscription
+from sawtooth_sdk.protobuf.transaction_receipt_pb2 import StateChange
+from sawtooth_sdk.protobuf.transaction_receipt_pb2 import StateChangeList
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+LOGGER = logging.getLogger(__name__)
+
+STATE_DELTA_EVENT = 'sawtooth/state-delta'
+
+# Asks the validator for the events of every block since genesis
+NULL_BLOCK_ID = '0000000000000000'
+
+# Seconds to wait for the validator to answer a request
+REQUEST_TIMEOUT = 10
+
+# Seconds between checks for a stop while waiting for events
+_POLL_INTERVAL = 1
+
+
+class BattleshipSubscriber:
+    """Keeps a BattleshipIndex in step with the chain by following the
+    validator's events.
+
+    On start, and whenever the connection is regained, the subscriber
+    subscribes from the latest blocks of the index, so that the validator
+    sends the events of every block committed since. Blocks from a fork
+    replace those of the chain they were indexed from.
+    """
+
+    def __init__(self, url, index):
+        """
+        Args:
+            url (str): the validator's component endpoint
+            index (BattleshipIndex): the index to keep up to date
+        """
+        self._url = url
+        self._index = index
+        self._stream = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Subscribe, then index blocks as they come until stop()."""
+        self._stream = Stream(self._url)
+        self._subscribe()
+
+        received = None
+        while not self._stopped.is_set():
+            if received is None:
+                received = self._stream.receive()
+            try:
+                message = received.result(_POLL_INTERVAL)
+            except FutureTimeoutError:
+                continue
+            received = None
+
+            if message is RECONNECT_EVENT:
+                LOGGER.info('Reconnected to %s, catching up', self._url)
+                self._subscribe()
+            elif message.message_type == Message.CLIENT_EVENTS:
+                events = EventList()
+                events.ParseFromString(message.content)
+                self.handle_events(events.events)
+
+    def stop(self):
+        self._stopped.set()
+
+    def close(self):
+        if self._stream is None:
+            return
+        try:
+            self._request(
+                Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST,
+                ClientEventsUnsubscribeRequest())
+        except BattleshipException as err:
+            LOGGER.warning('Unable to unsubscribe: %s', err)
+        finally:
+            self._stream.close()
+            self._stream = None
+
+    def handle_events(self, events):
+        """Index the block that `events`, the events of a block commit,
+        belong to.
+        """
+        block = None
+        changes = []
+        shots = []
+        for event in events:
+            if event.event_type == BLOCK_COMMIT_EVENT:
+                block = {attribute.key: attribute.value
+                         for attribute in event.attributes}
+            elif event.event_type == STATE_DELTA_EVENT:
+                state_changes = StateChangeList()
+                state_changes.ParseFromString(event.data)
+                changes.extend(
+                    (change.address,
+                     change.value if change.type == StateChange.SET
+                     else None)
+                    for change in state_changes.state_changes
+                    if change.address.startswith(NAMESPACE.prefix))
+            elif event.event_type == SHOT_EVENT:
+                shots.append({attribute.key: attribute.value
+                              for attribute in event.attributes})
+
+        if block is None:
+            LOGGER.warning('Ignoring events without a block commit')
+            return
+
+        if self._index.add_block(
+                int(block['block_num']), block['block_id'],
+                block['state_root_hash'], changes, shots):
+            LOGGER.debug('Indexed block %s (%s)',
+                         block['block_num'], block['block_id'][:8])
+
+    def _subscribe(self):
+        last_known_block_ids = self._index.last_known_block_ids()
+        status = self._send_subscribe(last_known_block_ids or [NULL_BLOCK_ID])
+
+        # None of the blocks indexed is on the chain any more: the index
+        # is started over
+        if status == ClientEventsSubscribeResponse.UNKNOWN_BLOCK:
+            LOGGER.warning('No indexed block is known to the validator, '
+                           'rebuilding the index')
+            self._index.drop_from(0)
+            status = self._send_subscribe([NULL_BLOCK_ID])
+
+        if status != ClientEventsSubscribeResponse.OK:
+            raise BattleshipException(
+                'Unable to subscribe to events: {}'.format(
+                    ClientEventsSubscribeResponse.Status.Name(status)))
+
+    def _send_subscribe(self, last_known_block_ids):
+        subscriptions = [
+            EventSubscription(event_type=BLOCK_COMMIT_EVENT),
+            EventSubscription(
+                event_type=STATE_DELTA_EVENT,
+                filters=[EventFilter(
+                    key='address',
+                    match_string='^{}'.format(
+                        re.escape(NAMESPACE.prefix)),
+                    filter_type=EventFilter.REGEX_ANY)]),
+            EventSubscription(event_type=SHOT_EVENT),
+        ]
+
+        response = ClientEventsSubscribeResponse()
+        response.ParseFromString(self._request(
+            Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST,
+            ClientEventsSubscribeRequest(
+                subscriptions=subscriptions,
+                last_known_block_ids=last_known_block_ids)))
+        return response.status
+
+    def _request(self, message_type, request):
+        try:
+            return self._stream.send(
+                message_type,
+                request.SerializeToString()).result(REQUEST_TIMEOUT).content
+        except Exception as err:
+            raise BattleshipException(
+                'Validator request failed: {}'.format(err)) from err
@@ -0,0 +1,265 @@
+import random
+
+
+SIZE = 10
+CELLS = SIZE * SIZE
+
+# Cell marks of the string form of a board
+EMPTY = '-'
+HIT = 'O'
+MISS = 'X'
+SHIP_IDS = 'ABCDE'
+
+# The number of cells of each ship, in SHIP_IDS order
+SHIP_SIZES = (5, 4, 3, 3, 2)
+
+# The binary form of a board: each ship's bitboard, then the hits and the
+# misses, each as a big-endian integer
+BITBOARD_BYTES = (CELLS + 7) // 8
+BOARD_BYTES = BITBOARD_BYTES * (len(SHIP_IDS) + 2)
+
+_HIDE_SHIPS = str.maketrans(SHIP_IDS, EMPTY * len(SHIP_IDS))
+
+_FULL = (1 << CELLS) - 1
+_LEFT_COLUMN = sum(1 << row * SIZE for row in range(SIZE))
+_RIGHT_COLUMN = _LEFT_COLUMN << SIZE - 1
+
+
+class Board:
+    """A board held as bitboards: bit i of each integer stands for cell i,
+    counted row by row from the top left corner.
+
+    Attributes:
+        ships (list of int): the cells of each ship, in SHIP_IDS order
+        hits (int): the cells shot that held a ship
+        misses (int): the cells shot that were empty
+    """
+
+    __slots__ = ('ships', 'hits', 'misses')
+
+    def __init__(self, ships=None, hits=0, misses=0):
+        self.ships = list(ships) if ships else [0] * len(SHIP_IDS)
+        self.hits = hits
+        self.misses = misses
+
+    @classmethod
+    def from_string(cls, board):
+        """Build a board from its string form: one mark per cell, EMPTY,
+        HIT, MISS or the id of the ship occupying the cell.
+
+        Raises:
+            ValueError: if the string is not a valid board
+        """
+        if len(board) != CELLS:
+            raise ValueError('A board has {} cells, not {}'.format(
+                CELLS, len(board)))
+
+        ships = [0] * len(SHIP_IDS)
+        hits = 0
+        misses = 0
+        for index, mark in enumerate(board):
+            if mark == EMPTY:
+                continue
+            bit = 1 << index
+            if mark == HIT:
+                hits |= bit
+            elif mark == MISS:
+                misses |= bit
+            elif mark in SHIP_IDS:
+                ships[SHIP_IDS.index(mark)] |= bit
+            else:
+                raise ValueError('Invalid board mark: {}'.format(mark))
+
+        return cls(ships, hits, misses)
+
+    def to_string(self):
+        """Return the string form of the board.
+
+        A hit cell reads HIT whichever ship it belonged to, so ships that
+        were hit cannot be fully recovered from the string.
+        """
+        cells = bytearray(EMPTY * CELLS, 'ascii')
+        for ship_id, ship in zip(SHIP_IDS, self.ships):
+            _mark(cells, ship, ship_id)
+        _mark(cells, self.hits, HIT)
+        _mark(cells, self.misses, MISS)
+        return cells.decode('ascii')
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Build a board from the bytes returned by to_bytes().
+
+        Raises:
+            ValueError: if the bytes are not a valid board
+        """
+        if len(data) != BOARD_BYTES:
+            raise ValueError('A board takes {} bytes, not {}'.format(
+                BOARD_BYTES, len(data)))
+
+        bitboards = [
+            int.from_bytes(data[start:start + BITBOARD_BYTES], 'big')
+            for start in range(0, BOARD_BYTES, BITBOARD_BYTES)
+        ]
+        if any(bits >> CELLS for bits in bitboards):
+            raise ValueError('Board bits set beyond the last cell')
+
+        return cls(bitboards[:-2], bitboards[-2], bitboards[-1])
+
+    def to_bytes(self):
+        return b''.join(
+            bits.to_bytes(BITBOARD_BYTES, 'big')
+            for bits in self.ships + [self.hits, self.misses])
+
+    @property
+    def occupied(self):
+        occupied = 0
+        for ship in self.ships:
+            occupied |= ship
+        return occupied
+
+    def is_shot(self, index):
+        return bool((self.hits | self.misses) >> index & 1)
+
+    def ship_at(self, index):
+        """Return the id of the ship occupying the cell, or None."""
+        bit = 1 << index
+        for ship_id, ship in zip(SHIP_IDS, self.ships):
+            if ship & bit:
+                return ship_id
+        return None
+
+    def shoot(self, index):
+        """Fire at the cell.
+
+        Returns:
+            str: the id of the ship hit, or None for a miss
+
+        Raises:
+            ValueError: if the cell was already shot at
+        """
+        if self.is_shot(index):
+            raise ValueError('Cell {} was already shot at'.format(index))
+
+        ship_id = self.ship_at(index)
+        if ship_id is None:
+            self.misses |= 1 << index
+        else:
+            self.hits |= 1 << index
+        return ship_id
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (self.ships, self.hits, self.misses) == \
+            (other.ships, other.hits, other.misses)
+
+    def __repr__(self):
+        return 'Board.from_string({!r})'.format(self.to_string())
+
+
+def place_fleet(fleet):
+    """Return the ship bitboards of a fleet, given as one (index, vertical)
+    pair per ship in SHIP_IDS order: the cell of the ship's top left end,
+    and whether it runs down rather than across.
+
+    Ships must lie on the board, and may neither overlap nor touch, even
+    at a corner.
+
+    Raises:
+        ValueError: if the fleet cannot be placed
+    """
+    if len(fleet) != len(SHIP_SIZES):
+        raise ValueError('A fleet has {} ships, not {}'.format(
+            len(SHIP_SIZES), len(fleet)))
+
+    ships = []
+    occupied = 0
+    surrounded = 0
+    for ship_id, size, (index, vertical) in zip(SHIP_IDS, SHIP_SIZES, fleet):
+        if not 0 <= index < CELLS:
+            raise ValueError('Ship {} lies off the board'.format(ship_id))
+        placement = _PLACEMENTS[size][index][bool(vertical)]
+        if placement is None:
+            raise ValueError('Ship {} lies off the board'.format(ship_id))
+
+        ship, surroundings = placement
+        if ship & occupied:
+            raise ValueError('Ship {} overlaps another ship'.format(ship_id))
+        if ship & surrounded:
+            raise ValueError('Ship {} touches another ship'.format(ship_id))
+
+        ships.append(ship)
+        occupied |= ship
+        surrounded |= surroundings
+
+    return ships
+
+
+def random_fleet(rng=random):
+    """Return a fleet for place_fleet(), each ship placed at random where
+    it fits.
+    """
+    while True:
+        fleet = []
+        surrounded = 0
+        for size in SHIP_SIZES:
+            free = [
+                (index, vertical)
+                for index, placements in enumerate(_PLACEMENTS[size])
+                for vertical, placement in enumerate(placements)
+                if placement is not None and not placement[0] & surrounded
+            ]
+            # The ships placed so far can leave no room for the next one
+            if not free:
+                break
+            index, vertical = rng.choice(free)
+            fleet.append((index, bool(vertical)))
+            surrounded |= _PLACEMENTS[size][index][vertical][1]
+        else:
+            return fleet
+
+
+def hide_ships(board):
+    """Return the string form of a board as its opponent may see it."""
+    return board.translate(_HIDE_SHIPS)
+
+
+def _mark(cells, bits, mark):
+    mark = ord(mark)
+    while bits:
+        low = bits & -bits
+        cells[low.bit_length() - 1] = mark
+        bits ^= low
+
+
+def _surroundings(bits):
+    """Return the cells set in `bits` and every cell next to them,
+    diagonals included.
+    """
+    # Shifting across a row edge would wrap to the other side
+    across = bits | (bits << 1 & ~_LEFT_COLUMN) | (bits >> 1 & ~_RIGHT_COLUMN)
+    return (across | across << SIZE | across >> SIZE) & _FULL
+
+
+def _placement(size, index, vertical):
+    row, column = divmod(index, SIZE)
+    if vertical:
+        if row + size > SIZE:
+            return None
+        ship = sum(1 << index + step * SIZE for step in range(size))
+    else:
+        if column + size > SIZE:
+            return None
+        ship = ((1 << size) - 1) << index
+    return ship, _surroundings(ship)
+
+
+# For each ship size and cell, the bitboard of a ship there across and
+# down, along with its surroundings, or None where it lies off the board
+_PLACEMENTS = {
+    size: [
+        (_placement(size, index, False), _placement(size, index, True))
+        for index in range(CELLS)
+    ]
+    for size in set(SHIP_SIZES)
+}
@@ -1,56 +1,239 @@
+import struct
+
+from sawtooth_battleship.processor.battleship_board import SHIP_SIZES
+from sawtooth_battleship.processor.battleship_state import PLAYERS
+
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 
 
-class BattleshipPayload:
+CELLS = 100
 
-    def __init__(self, payload):
-        try:
-            # The payload is csv utf-8 encoded string
-            name, action, space = payload.decode().split(",")
-        except ValueError as e:
-            raise InvalidTransaction("Invalid payload serialization") from e
+ACTIONS = ('create', 'shoot', 'delete', 'place')
 
-        if not name:
-            raise InvalidTransaction('Name is required')
+# Binary payloads begin with their version, which as a control character
+# never begins a CSV payload's game name
+VERSION = 1
 
-        if '|' in name:
-            raise InvalidTransaction('Name cannot contain "|"')
+_HEADER = struct.Struct('>BB')
+_ACTION = struct.Struct('>BB')
+_CELL = struct.Struct('>B')
+_PLAYER = struct.Struct('>B')
 
-        if not action:
-            raise InvalidTransaction('Action is required')
+# A placed ship's byte holds the cell of its top left end, with the high
+# bit set when the ship runs down rather than across
+_VERTICAL = 0x80
+_SHIPS = len(SHIP_SIZES)
 
-        if action not in ('create', 'shoot', 'delete'):
-            raise InvalidTransaction('Invalid action: {}'.format(action))
+_SHOOT = ACTIONS.index('shoot')
+_PLACE = ACTIONS.index('place')
 
-        if action == 'shoot':
-            try:
-                ## modified: case name for position as an index 
-                if int(space) not in range(1, 10):
-                    raise InvalidTransaction(
-                        "Space must be an integer from 0 to 99")
-            except ValueError:
-                raise InvalidTransaction(
-                    'Space must be an integer from 0 to 99') from ValueError
+_MAX_ACTIONS = 255
+_MAX_NAME = 255
 
-        if action == 'shoot':
-            space = int(space)
 
+class BattleshipAction:
+    """A single action on a game, as carried by a payload."""
+
+    __slots__ = ('_name', '_action', '_space', '_player', '_fleet')
+
+    def __init__(self, name, action, space=None, player=None, fleet=None):
         self._name = name
         self._action = action
         self._space = space
+        self._player = player
+        self._fleet = fleet
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def action(self):
+        return self._action
+
+    @property
+    def space(self):
+        """The cell shot at, from 1 to 100, or None."""
+        return self._space
+
+    @property
+    def player(self):
+        """The player whose fleet is placed, 1 or 2, or None."""
+        return self._player
+
+    @property
+    def fleet(self):
+        """The ships placed, in SHIP_IDS order, as (space, vertical) pairs:
+        the cell of the ship's top left end, from 1 to 100, and whether it
+        runs down rather than across. None for other actions.
+        """
+        return self._fleet
+
+
+class BattleshipPayload:
+    """The actions of a transaction, applied in order.
+
+    Payloads are either binary, as written by serialize_payload(), or a
+    single action as a CSV utf-8 string: name,action,space.
+    """
+
+    def __init__(self, payload):
+        if payload and payload[0] == VERSION:
+            self._actions = _decode_binary(payload)
+        else:
+            self._actions = [_decode_csv(payload)]
 
     @staticmethod
     def from_bytes(payload):
         return BattleshipPayload(payload=payload)
 
+    @property
+    def actions(self):
+        return self._actions
+
     @property
     def name(self):
-        return self._name
+        return self._actions[0].name
 
     @property
     def action(self):
-        return self._action
+        return self._actions[0].action
 
     @property
     def space(self):
-        return self._space
\ No newline at end of file
+        return self._actions[0].space
+
+
+def serialize_payload(actions):
+    """Encode (name, action, space) tuples into a binary payload. The space
+    is the cell shot at, from 1 to 100, or for a placement the pair of the
+    player and their fleet, in the form of BattleshipAction.fleet. It is
+    ignored by other actions.
+
+    Raises:
+        ValueError: if an action cannot be encoded
+    """
+    if not 0 < len(actions) <= _MAX_ACTIONS:
+        raise ValueError(
+            'A payload holds from 1 to {} actions'.format(_MAX_ACTIONS))
+
+    parts = [_HEADER.pack(VERSION, len(actions))]
+    for name, action, space in actions:
+        name = name.encode('utf-8')
+        if len(name) > _MAX_NAME:
+            raise ValueError('Name is longer than {} bytes'.format(_MAX_NAME))
+        if action not in ACTIONS:
+            raise ValueError('Invalid action: {}'.format(action))
+
+        parts.append(_ACTION.pack(ACTIONS.index(action), len(name)))
+        parts.append(name)
+        if action == 'shoot':
+            if int(space) not in range(1, CELLS + 1):
+                raise ValueError('Space must be an integer from 1 to 100')
+            parts.append(_CELL.pack(int(space) - 1))
+        elif action == 'place':
+            parts.append(_encode_placement(*space))
+
+    return b''.join(parts)
+
+
+def _decode_binary(payload):
+    # The fixed-size fields are read in place, and only the names are
+    # copied out
+    actions = []
+    offset = _HEADER.size
+    size = len(payload)
+    try:
+        while offset < size:
+            code, length = payload[offset], payload[offset + 1]
+            offset += _ACTION.size
+            name = str(payload[offset:offset + length], 'utf-8')
+            offset += length
+
+            if code == _SHOOT:
+                if payload[offset] >= CELLS:
+                    raise InvalidTransaction(
+                        'Space must be an integer from 1 to 100')
+                space = payload[offset] + 1
+                offset += _CELL.size
+                actions.append(BattleshipAction(name, 'shoot', space))
+            elif code == _PLACE:
+                player = payload[offset]
+                fleet = tuple(
+                    ((cell & ~_VERTICAL) + 1, bool(cell & _VERTICAL))
+                    for cell in payload[offset + 1:offset + 1 + _SHIPS])
+                offset += _PLAYER.size + _SHIPS
+                if player not in PLAYERS:
+                    raise InvalidTransaction('Player must be 1 or 2')
+                if len(fleet) != _SHIPS:
+                    raise IndexError('Fleet is cut short')
+                if any(space > CELLS for space, _ in fleet):
+                    raise InvalidTransaction(
+                        'Ships must lie on cells from 1 to 100')
+                actions.append(BattleshipAction(
+                    name, 'place', player=player, fleet=fleet))
+            else:
+                actions.append(BattleshipAction(name, ACTIONS[code]))
+
+            _validate_name(name)
+    except (IndexError, UnicodeDecodeError) as e:
+        raise InvalidTransaction("Invalid payload serialization") from e
+
+    if offset != size or not actions or len(actions) != payload[1]:
+        raise InvalidTransaction("Invalid payload serialization")
+
+    return actions
+
+
+def _decode_csv(payload):
+    try:
+        # The payload is csv utf-8 encoded string
+        name, action, space = payload.decode().split(",")
+    except ValueError as e:
+        raise InvalidTransaction("Invalid payload serialization") from e
+
+    _validate_name(name)
+
+    if not action:
+        raise InvalidTransaction('Action is required')
+
+    if action not in ACTIONS:
+        raise InvalidTransaction('Invalid action: {}'.format(action))
+
+    if action == 'place':
+        raise InvalidTransaction('Fleets are only placed by binary payloads')
+
+    if action == 'shoot':
+        try:
+            space = int(space)
+        except ValueError:
+            raise InvalidTransaction(
+                'Space must be an integer from 1 to 100') from ValueError
+        if not 1 <= space <= CELLS:
+            raise InvalidTransaction('Space must be an integer from 1 to 100')
+    else:
+        space = None
+
+    return BattleshipAction(name, action, space)
+
+
+def _encode_placement(player, fleet):
+    if player not in PLAYERS:
+        raise ValueError('Player must be 1 or 2')
+    if len(fleet) != _SHIPS:
+        raise ValueError('A fleet has {} ships'.format(_SHIPS))
+
+    cells = bytearray(_PLAYER.pack(player))
+    for space, vertical in fleet:
+        if int(space) not in range(1, CELLS + 1):
+            raise ValueError('Ships must lie on cells from 1 to 100')
+        cells.append(int(space) - 1 | (_VERTICAL if vertical else 0))
+    return bytes(cells)
+
+
+def _validate_name(name):
+    if not name:
+        raise InvalidTransaction('Name is required')
+
+    if '|' in name:
+        raise InvalidTransaction('Name cannot contain "|"')
@@ -1,24 +1,123 @@
-import hashlib
+import struct
+from collections import namedtuple
 
+from sawtooth_sdk.processor.address import Namespace
 from sawtooth_sdk.processor.exceptions import InternalError
 
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_board import BOARD_BYTES
+from sawtooth_battleship.processor.battleship_board import SHIP_SIZES
 
-BATTLESHIP_NAMESPACE = hashlib.sha512('battleship'.encode("utf-8")).hexdigest()[0:6]
+
+NAMESPACE = Namespace('battleship')
+BATTLESHIP_NAMESPACE = NAMESPACE.prefix
+
+PLAYERS = (1, 2)
+
+# Each game is stored in four leaves, so that a shot only reads and
+# writes the game's metadata, the board shot at and its history:
+#   namespace | leaf (2 hex) | hash of the game name (62 hex)
+# with leaf METADATA_LEAF for the state and players, the player number
+# for each player's board and hull counts, and HISTORY_LEAF for the shots
+# taken, in order.
+METADATA_LEAF = '00'
+HISTORY_LEAF = '03'
+
+# Binary state records hold the entries for the games at an address:
+#   record:    version (u8) | kind (u8) | entry count (u16) | entries
+#   metadata:  state (u8) | name | player 1 | player 2
+#   board:     hulls (u8 per ship) | board | name
+#   history:   name | shots
+#   shot:      player and cell (u8) | result (u8)
+# Boards are in the form of Board.to_bytes(). The name is UTF-8 and the
+# players are public key bytes, each preceded by its length (u16), as are
+# the shots. A shot's cell is counted from 0, with the high bit set for
+# the shots of player 2, and its result is an index in RESULTS.
+#
+# Games stored before the leaves were introduced hold both boards and the
+# metadata at a single address, as a VERSION_GAMES record or in text:
+#   record:  version (u8) | game count (u16) | games
+#   game:    state (u8) | hulls P1 (u8 per ship) | hulls P2 (u8 per ship)
+#            | board P1 | board P2 | name | player 1 | player 2
+# They are read from there and moved to the leaves on their next write.
+VERSION_GAMES = 1
+VERSION = 2
+STATES = ('P1-NEXT', 'P2-NEXT', 'P1-WIN', 'P2-WIN')
+
+RECORD_GAMES = 'games'
+RECORD_METADATA = 'metadata'
+RECORD_BOARD = 'board'
+RECORD_HISTORY = 'history'
+_KINDS = (RECORD_METADATA, RECORD_BOARD, RECORD_HISTORY)
+
+RESULTS = ('miss', 'hit', 'sunk')
+
+# A shot of a game's history: the player who took it, the space shot at,
+# from 1 to 100, and its result, one of RESULTS
+Shot = namedtuple('Shot', ['player', 'space', 'result'])
+
+_PLAYER_2 = 0x80
+
+_GAMES_HEADER = struct.Struct('>BH')
+_GAME = struct.Struct('>B{ships}B{ships}B{board}s{board}s'.format(
+    ships=len(SHIP_SIZES), board=BOARD_BYTES))
+_HEADER = struct.Struct('>BBH')
+_METADATA = struct.Struct('>B')
+_BOARD = struct.Struct('>{ships}B{board}s'.format(
+    ships=len(SHIP_SIZES), board=BOARD_BYTES))
+_LENGTH = struct.Struct('>H')
+
+
+def make_metadata_address(name):
+    return NAMESPACE.make_address(name, METADATA_LEAF)
+
+
+def make_board_address(name, player):
+    return NAMESPACE.make_address(name, '{:02x}'.format(player))
+
+
+def make_history_address(name):
+    return NAMESPACE.make_address(name, HISTORY_LEAF)
+
+
+def make_game_addresses(name):
+    """Return every address a game may be stored at: its leaves and, last,
+    the address of games stored before the leaves.
+    """
+    return [make_metadata_address(name)] + [
+        make_board_address(name, player) for player in PLAYERS
+    ] + [make_history_address(name), _make_battleship_address(name)]
 
 
 def _make_battleship_address(name):
-    return BATTLESHIP_NAMESPACE + \
-        hashlib.sha512(name.encode('utf-8')).hexdigest()[:64]
+    return NAMESPACE.make_address(name)
 
 
 class Game:
-    def __init__(self, name, board_P1, board_P2, state, player1, player2):
+    def __init__(self, name, board_P1, board_P2, state, player1, player2,
+                 hulls_P1=None, hulls_P2=None):
         self.name = name
         self.board_P1 = board_P1
         self.board_P2 = board_P2
         self.state = state
         self.player1 = player1
         self.player2 = player2
+        # The cells of each of the player's ships not hit yet, in SHIP_IDS
+        # order, kept up to date shot by shot
+        self.hulls_P1 = list(SHIP_SIZES if hulls_P1 is None else hulls_P1)
+        self.hulls_P2 = list(SHIP_SIZES if hulls_P2 is None else hulls_P2)
+
+    def fleet(self, player):
+        """Return the board and hull counts of player 1 or 2."""
+        if player == 1:
+            return self.board_P1, self.hulls_P1
+        return self.board_P2, self.hulls_P2
+
+    def set_fleet(self, player, board, hulls):
+        if player == 1:
+            self.board_P1, self.hulls_P1 = board, list(hulls)
+        else:
+            self.board_P2, self.hulls_P2 = board, list(hulls)
 
 
 class BattleshipState:
@@ -35,132 +134,404 @@ class BattleshipState:
 
         self._context = context
         self._address_cache = {}
+        # Games read from the address used before the leaves, which are
+        # written to the leaves in full on their next write
+        self._unmigrated = {}
 
     def delete_game(self, game_name):
         """Delete the Game named game_name from state.
 
         Args:
             game_name (str): The name.
-
-        Raises:
-            KeyError: The Game with game_name does not exist.
         """
 
-        games = self._load_games(game_name=game_name)
-
-        del games[game_name]
-        if games:
-            self._store_game(game_name, games=games)
-        else:
-            self._delete_game(game_name)
-
-    def set_game(self, game_name, game):
+        if game_name in self._unmigrated:
+            self._remove(_make_battleship_address(game_name), game_name,
+                         deserialize_games, serialize_games)
+            del self._unmigrated[game_name]
+            return
+
+        self._remove(make_metadata_address(game_name), game_name,
+                     deserialize_metadata, serialize_metadata)
+        for player in PLAYERS:
+            self._remove(make_board_address(game_name, player), game_name,
+                         deserialize_boards, serialize_boards)
+        self._remove(make_history_address(game_name), game_name,
+                     deserialize_history, serialize_history)
+
+    def set_game(self, game_name, game, players=PLAYERS):
         """Store the game in the validator state.
 
         Args:
             game_name (str): The name.
             game (Game): The information specifying the current game.
+            players (tuple of int): The players whose boards changed.
         """
 
-        games = self._load_games(game_name=game_name)
-
-        games[game_name] = game
-
-        self._store_game(game_name, games=games)
+        if game_name in self._unmigrated:
+            players = PLAYERS
+            self._remove(_make_battleship_address(game_name), game_name,
+                         deserialize_games, serialize_games)
+            del self._unmigrated[game_name]
+
+        self._put(make_metadata_address(game_name), game_name, game,
+                  deserialize_metadata, serialize_metadata)
+        for player in players:
+            self._put(make_board_address(game_name, player), game_name,
+                      game.fleet(player), deserialize_boards,
+                      serialize_boards)
+
+    def add_shot(self, game_name, shot):
+        """Append a Shot to the history of the game named game_name."""
+        histories = self._load(make_history_address(game_name),
+                               deserialize_history)
+        histories[game_name] = histories.get(game_name, []) + [shot]
+        self._store(make_history_address(game_name),
+                    serialize_history(histories))
+
+    def get_history(self, game_name):
+        """Return the Shots taken in the game named game_name, in order.
+        Games stored before histories were kept have none for their
+        earlier shots.
+        """
+        return self._load(make_history_address(game_name),
+                          deserialize_history).get(game_name, [])
 
-    def get_game(self, game_name):
+    def get_game(self, game_name, players=PLAYERS):
         """Get the game associated with game_name.
 
         Args:
             game_name (str): The name.
+            players (tuple of int): The players whose boards are read.
+                The boards of the others are None.
 
         Returns:
             (Game): All the information specifying a game.
         """
 
-        return self._load_games(game_name=game_name).get(game_name)
-
-    def _store_game(self, game_name, games):
-        address = _make_battleship_address(game_name)
+        games = self._load(make_metadata_address(game_name),
+                           deserialize_metadata)
+        game = games.get(game_name)
+        if game is None:
+            game = self._load(_make_battleship_address(game_name),
+                              deserialize_games).get(game_name)
+            if game is not None:
+                self._unmigrated[game_name] = game
+            return game
+
+        self.load_boards(game, players)
+        return game
+
+    def load_boards(self, game, players):
+        """Read the boards of `players` into a game from get_game().
+        """
 
-        state_data = self._serialize(games)
+        if game.name in self._unmigrated:
+            return
+
+        for player in players:
+            boards = self._load(make_board_address(game.name, player),
+                                deserialize_boards)
+            try:
+                game.set_fleet(player, *boards[game.name])
+            except KeyError:
+                raise InternalError(
+                    "Board {} of game {} is missing".format(
+                        player, game.name)) from None
+
+    def _put(self, address, name, value, deserialize, serialize):
+        entries = self._load(address, deserialize)
+        entries[name] = value
+        self._store(address, serialize(entries))
+
+    def _remove(self, address, name, deserialize, serialize):
+        entries = self._load(address, deserialize)
+        entries.pop(name, None)
+        if entries:
+            self._store(address, serialize(entries))
+        else:
+            self._delete(address)
 
+    def _store(self, address, state_data):
         self._address_cache[address] = state_data
 
         self._context.set_state(
             {address: state_data},
             timeout=self.TIMEOUT)
 
-    def _delete_game(self, game_name):
-        address = _make_battleship_address(game_name)
-
+    def _delete(self, address):
         self._context.delete_state(
             [address],
             timeout=self.TIMEOUT)
 
         self._address_cache[address] = None
 
-    def _load_games(self, game_name):
-        address = _make_battleship_address(game_name)
-
+    def _load(self, address, deserialize):
         if address in self._address_cache:
-            if self._address_cache[address]:
-                serialized_games = self._address_cache[address]
-                games = self._deserialize(serialized_games)
-            else:
-                games = {}
+            data = self._address_cache[address]
         else:
             state_entries = self._context.get_state(
                 [address],
                 timeout=self.TIMEOUT)
-            if state_entries:
-
-                self._address_cache[address] = state_entries[0].data
-
-                games = self._deserialize(data=state_entries[0].data)
-
-            else:
-                self._address_cache[address] = None
-                games = {}
-
-        return games
+            data = state_entries[0].data if state_entries else None
+            self._address_cache[address] = data
 
-    def _deserialize(self, data):
-        """Take bytes stored in state and deserialize them into Python
-        Game objects.
+        if not data:
+            return {}
 
-        Args:
-            data (bytes): The UTF-8 encoded string stored in state.
-
-        Returns:
-            (dict): game name (str) keys, Game values.
-        """
-
-        games = {}
         try:
-            for game in data.decode().split("|"):
-                name, board, state, player1, player2 = game.split(",")
-
-                games[name] = Game(name, board, state, player1, player2)
+            return deserialize(data)
         except ValueError as e:
             raise InternalError("Failed to deserialize game data") from e
 
-        return games
 
-    def _serialize(self, games):
-        """Takes a dict of game objects and serializes them into bytes.
-
-        Args:
-            games (dict): game name (str) keys, Game values.
-
-        Returns:
-            (bytes): The UTF-8 encoded string stored in state.
-        """
+def record_type(data):
+    """Return the kind of a state record: RECORD_METADATA, RECORD_BOARD or
+    RECORD_GAMES for records stored before the leaves.
+
+    Raises:
+        ValueError: if the record is of no known kind
+    """
+    # Text records begin with a game name, never with a control character
+    if data[:1] >= b' ' or data[:1] == bytes([VERSION_GAMES]):
+        return RECORD_GAMES
+    if data[:1] == bytes([VERSION]) and len(data) >= _HEADER.size \
+            and data[1] < len(_KINDS):
+        return _KINDS[data[1]]
+    raise ValueError("Unsupported state record version")
 
-        game_strs = []
-        for name, g in games.items():
-            game_str = ",".join(
-                [name, g.board, g.state, g.player1, g.player2])
-            game_strs.append(game_str)
 
-        return "|".join(sorted(game_strs)).encode()
\ No newline at end of file
+def serialize_metadata(games):
+    """Encode the metadata of games, in the order given, into a binary
+    state record.
+    """
+    parts = [_HEADER.pack(VERSION, _KINDS.index(RECORD_METADATA), len(games))]
+    for name, game in games.items():
+        parts.append(_METADATA.pack(STATES.index(game.state)))
+        parts.append(_pack_string(name.encode('utf-8')))
+        parts.append(_pack_string(bytes.fromhex(game.player1)))
+        parts.append(_pack_string(bytes.fromhex(game.player2)))
+
+    return b''.join(parts)
+
+
+def deserialize_metadata(data):
+    """Decode a metadata record.
+
+    Returns:
+        (dict): game name (str) keys, Game values without boards.
+
+    Raises:
+        ValueError: if the record cannot be decoded
+    """
+    def read(offset):
+        state, = _METADATA.unpack_from(data, offset)
+        name, offset = _unpack_string(data, offset + _METADATA.size)
+        player1, offset = _unpack_string(data, offset)
+        player2, offset = _unpack_string(data, offset)
+
+        name = name.decode('utf-8')
+        game = Game(name, None, None, STATES[state], player1.hex(),
+                    player2.hex())
+        return name, game, offset
+
+    return _read_entries(data, RECORD_METADATA, read)
+
+
+def serialize_boards(boards):
+    """Encode boards, in the order given, into a binary state record.
+
+    Args:
+        boards (dict): game name (str) keys, (Board, hull counts) values.
+    """
+    parts = [_HEADER.pack(VERSION, _KINDS.index(RECORD_BOARD), len(boards))]
+    for name, (board, hulls) in boards.items():
+        parts.append(_BOARD.pack(*hulls, board.to_bytes()))
+        parts.append(_pack_string(name.encode('utf-8')))
+
+    return b''.join(parts)
+
+
+def deserialize_boards(data):
+    """Decode a board record.
+
+    Returns:
+        (dict): game name (str) keys, (Board, hull counts) values.
+
+    Raises:
+        ValueError: if the record cannot be decoded
+    """
+    def read(offset):
+        fields = _BOARD.unpack_from(data, offset)
+        name, offset = _unpack_string(data, offset + _BOARD.size)
+        return name.decode('utf-8'), \
+            (Board.from_bytes(fields[-1]), list(fields[:-1])), offset
+
+    return _read_entries(data, RECORD_BOARD, read)
+
+
+def serialize_history(histories):
+    """Encode game histories, in the order given, into a binary state
+    record.
+
+    Args:
+        histories (dict): game name (str) keys, lists of Shot values.
+    """
+    parts = [_HEADER.pack(VERSION, _KINDS.index(RECORD_HISTORY),
+                          len(histories))]
+    for name, shots in histories.items():
+        parts.append(_pack_string(name.encode('utf-8')))
+        parts.append(_pack_string(bytes(
+            byte
+            for shot in shots
+            for byte in (
+                shot.space - 1 | (_PLAYER_2 if shot.player == 2 else 0),
+                RESULTS.index(shot.result)))))
+
+    return b''.join(parts)
+
+
+def deserialize_history(data):
+    """Decode a history record.
+
+    Returns:
+        (dict): game name (str) keys, lists of Shot values.
+
+    Raises:
+        ValueError: if the record cannot be decoded
+    """
+    def read(offset):
+        name, offset = _unpack_string(data, offset)
+        shots, offset = _unpack_string(data, offset)
+        if len(shots) % 2:
+            raise ValueError("Truncated shot in history")
+        return name.decode('utf-8'), [
+            Shot(2 if cell & _PLAYER_2 else 1,
+                 (cell & ~_PLAYER_2) + 1,
+                 RESULTS[result])
+            for cell, result in zip(shots[::2], shots[1::2])
+        ], offset
+
+    return _read_entries(data, RECORD_HISTORY, read)
+
+
+def serialize_games(games):
+    """Encode games, in the order given, into a record of the kind stored
+    before the leaves.
+    """
+    parts = [_GAMES_HEADER.pack(VERSION_GAMES, len(games))]
+    for name, game in games.items():
+        parts.append(_GAME.pack(
+            STATES.index(game.state),
+            *game.hulls_P1,
+            *game.hulls_P2,
+            game.board_P1.to_bytes(),
+            game.board_P2.to_bytes()))
+        parts.append(_pack_string(name.encode('utf-8')))
+        parts.append(_pack_string(bytes.fromhex(game.player1)))
+        parts.append(_pack_string(bytes.fromhex(game.player2)))
+
+    return b''.join(parts)
+
+
+def deserialize_games(data):
+    """Decode a record stored before the leaves, binary or in the text
+    format used before VERSION_GAMES.
+
+    Returns:
+        (dict): game name (str) keys, Game values.
+
+    Raises:
+        ValueError: if the record cannot be decoded
+    """
+    if record_type(data) != RECORD_GAMES:
+        raise ValueError("Not a game record")
+    if data[:1] != bytes([VERSION_GAMES]):
+        return _deserialize_text(data)
+
+    def read(offset):
+        fields = _GAME.unpack_from(data, offset)
+        name, offset = _unpack_string(data, offset + _GAME.size)
+        player1, offset = _unpack_string(data, offset)
+        player2, offset = _unpack_string(data, offset)
+
+        name = name.decode('utf-8')
+        ships = len(SHIP_SIZES)
+        game = Game(
+            name,
+            Board.from_bytes(fields[-2]),
+            Board.from_bytes(fields[-1]),
+            STATES[fields[0]],
+            player1.hex(),
+            player2.hex(),
+            list(fields[1:1 + ships]),
+            list(fields[1 + ships:1 + 2 * ships]))
+        return name, game, offset
+
+    return _read(data, _GAMES_HEADER, read)
+
+
+def _read_entries(data, kind, read_entry):
+    if record_type(data) != kind:
+        raise ValueError("Not a {} record".format(kind))
+
+    return _read(data, _HEADER, read_entry)
+
+
+def _read(data, header, read_entry):
+    entries = {}
+    try:
+        count = header.unpack_from(data)[-1]
+        offset = header.size
+        for _ in range(count):
+            name, entry, offset = read_entry(offset)
+            entries[name] = entry
+    except (struct.error, IndexError) as e:
+        raise ValueError("Malformed state record: {}".format(e)) from e
+
+    if offset != len(data):
+        raise ValueError("Trailing bytes in state record")
+
+    return entries
+
+
+def _deserialize_text(data):
+    games = {}
+    for game in data.decode().split("|"):
+        fields = game.split(",")
+        # Games stored before hull counts were kept have six fields, and
+        # start from a full fleet
+        if len(fields) == 6:
+            fields += [None, None]
+        name, board_P1, board_P2, state, player1, player2, \
+            hulls_P1, hulls_P2 = fields
+
+        games[name] = Game(
+            name,
+            Board.from_string(board_P1),
+            Board.from_string(board_P2),
+            state,
+            player1,
+            player2,
+            _hulls_from_str(hulls_P1),
+            _hulls_from_str(hulls_P2))
+
+    return games
+
+
+def _hulls_from_str(hulls):
+    if hulls is None:
+        return None
+    return [int(count) for count in hulls]
+
+
+def _pack_string(value):
+    return _LENGTH.pack(len(value)) + value
+
+
+def _unpack_string(data, offset):
+    length, = _LENGTH.unpack_from(data, offset)
+    start = offset + _LENGTH.size
+    if start + length > len(data):
+        raise ValueError("Truncated state record")
+    return data[start:start + length], start + length
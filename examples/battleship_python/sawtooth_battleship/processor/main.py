@@ -12,6 +12,7 @@ from sawtooth_battleship.processor.config.battleship import \
 from sawtooth_battleship.processor.config.battleship import \
     merge_battleship_config
 
+from sawtooth_sdk.messaging.recorder import TrafficRecorder
 from sawtooth_sdk.processor.core import TransactionProcessor
 from sawtooth_sdk.processor.log import init_console_logging
 from sawtooth_sdk.processor.log import log_configuration
@@ -31,6 +32,12 @@ def parse_args(args):
         '-C', '--connect',
         help='Endpoint for the validator connection')
 
+    parser.add_argument(
+        '--record',
+        metavar='FILE',
+        help='Record the transactions processed and their state accesses\n'
+             'to FILE, for replay with sawtooth_processor_test.replay')
+
     parser.add_argument('-v', '--verbose',
                         action='count',
                         default=0,
@@ -71,10 +78,14 @@ def main(args=None):
         args = sys.argv[1:]
     opts = parse_args(args)
     processor = None
+    recorder = None
     try:
         arg_config = create_battleship_config(opts)
         battleship_config = load_battleship_config(arg_config)
-        processor = TransactionProcessor(url=battleship_config.connect)
+        if opts.record:
+            recorder = TrafficRecorder(opts.record)
+        processor = TransactionProcessor(
+            url=battleship_config.connect, recorder=recorder)
         log_config = get_log_config(filename="battleship_log_config.toml")
 
         # If no toml, try loading yaml
@@ -103,4 +114,6 @@ def main(args=None):
         print("Error: {}".format(e))
     finally:
         if processor is not None:
-            processor.stop()
\ No newline at end of file
+            processor.stop()
+        if recorder is not None:
+            recorder.close()
\ No newline at end of file
@@ -13,11 +13,13 @@ data_files = [
 
 if os.path.exists("/etc/default"):
     data_files.append(
-        ('/etc/default', ['packaging/systemd/sawtooth-battleship-tp-python']))
+        ('/etc/default', ['packaging/systemd/sawtooth-battleship-tp-python',
+                          'packaging/systemd/sawtooth-battleship-indexer']))
 
 if os.path.exists("/lib/systemd/system"):
     data_files.append(('/lib/systemd/system',
-                       ['packaging/systemd/sawtooth-battleship-tp-python.service']))
+                       ['packaging/systemd/sawtooth-battleship-tp-python.service',
+                        'packaging/systemd/sawtooth-battleship-indexer.service']))
 
 setup(
     name='sawtooth-battleship',
@@ -32,6 +34,7 @@ setup(
         'colorlog',
         'protobuf',
         'sawtooth-sdk',
+        'sawtooth-intkey',
         'PyYAML',
     ],
     data_files=data_files,
@@ -39,5 +42,6 @@ setup(
         'console_scripts': [
             'battleship = sawtooth_battleship.battleship_cli:main_wrapper',
             'battleship-tp-python = sawtooth_battleship.processor.main:main',
+            'battleship-indexer = sawtooth_battleship.indexer.main:main',
         ]
     })
\ No newline at end of file
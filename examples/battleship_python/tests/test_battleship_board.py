@@ -0,0 +1,92 @@
+import unittest
+
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_board import hide_ships
+from sawtooth_battleship.processor.battleship_board import place_fleet
+from sawtooth_battleship.processor.battleship_board import random_fleet
+
+
+BOARD = 'AAAAA-----BBBB--XO-X' + '-' * 80
+
+# Ships A to E, as (index, vertical) pairs
+FLEET = [(0, False), (20, False), (9, True), (60, True), (98, False)]
+FLEET_BOARD = (
+    'AAAAA----C'
+    '---------C'
+    'BBBB-----C'
+    '----------'
+    '----------'
+    '----------'
+    'D---------'
+    'D---------'
+    'D---------'
+    '--------EE')
+
+
+class TestBoard(unittest.TestCase):
+    def test_string_round_trip(self):
+        board = Board.from_string(BOARD)
+
+        self.assertEqual(board.to_string(), BOARD)
+        self.assertEqual(board.ships[0], 0b11111)
+        self.assertEqual(board.ships[1], 0b1111 << 10)
+        self.assertEqual(board.hits, 1 << 17)
+        self.assertEqual(board.misses, 1 << 16 | 1 << 19)
+        self.assertEqual(Board(), Board.from_string('-' * 100))
+
+    def test_invalid_string(self):
+        with self.assertRaises(ValueError):
+            Board.from_string('-' * 99)
+        with self.assertRaises(ValueError):
+            Board.from_string('Z' + '-' * 99)
+
+    def test_shoot(self):
+        board = Board.from_string(BOARD)
+
+        self.assertEqual(board.shoot(3), 'A')
+        self.assertEqual(board.shoot(99), None)
+        self.assertTrue(board.is_shot(3))
+        self.assertTrue(board.is_shot(99))
+        self.assertFalse(board.is_shot(4))
+        self.assertEqual(board.ship_at(4), 'A')
+        self.assertEqual(
+            board.to_string(), 'AAAOA' + BOARD[5:99] + 'X')
+
+        with self.assertRaises(ValueError):
+            board.shoot(3)
+        with self.assertRaises(ValueError):
+            board.shoot(16)
+
+    def test_hide_ships(self):
+        self.assertEqual(
+            hide_ships(BOARD), '----------------XO-X' + '-' * 80)
+
+    def test_place_fleet(self):
+        self.assertEqual(
+            Board(place_fleet(FLEET)), Board.from_string(FLEET_BOARD))
+
+    def test_invalid_fleet(self):
+        invalid = [
+            # Too few ships
+            FLEET[:4],
+            # Off the board, across and down, and past the last cell
+            FLEET[:4] + [(99, False)],
+            [(6, False)] + FLEET[1:],
+            FLEET[:2] + [(89, True)] + FLEET[3:],
+            FLEET[:4] + [(100, False)],
+            FLEET[:4] + [(-1, False)],
+            # Overlapping and touching, at a side and at a corner
+            FLEET[:1] + [(2, True)] + FLEET[2:],
+            FLEET[:1] + [(10, False)] + FLEET[2:],
+            FLEET[:1] + [(15, False)] + FLEET[2:],
+        ]
+        for fleet in invalid:
+            with self.assertRaises(ValueError):
+                place_fleet(fleet)
+
+    def test_random_fleet(self):
+        for _ in range(20):
+            board = Board(place_fleet(random_fleet()))
+            self.assertEqual(
+                [bin(ship).count('1') for ship in board.ships],
+                [5, 4, 3, 3, 2])
@@ -0,0 +1,100 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import base64
+import json
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from sawtooth_battleship.battleship_client import BattleshipClient
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_board import SHIP_SIZES
+from sawtooth_battleship.processor.battleship_state import Game
+from sawtooth_battleship.processor.battleship_state import serialize_boards
+from sawtooth_battleship.processor.battleship_state import serialize_games
+from sawtooth_battleship.processor.battleship_state \
+    import serialize_metadata
+
+
+def _game(name, state='P1-NEXT', player1='', player2=''):
+    return Game(name=name, board_P1=Board(), board_P2=Board(), state=state,
+                player1=player1, player2=player2)
+
+
+def _entry(address, data):
+    return {'address': address, 'data': base64.b64encode(data).decode()}
+
+
+def _page(entries, next_position=None):
+    paging = {'start': None, 'limit': None}
+    if next_position is not None:
+        paging['next_position'] = next_position
+    return json.dumps({'data': entries, 'head': 'head', 'paging': paging})
+
+
+class TestBattleshipClientList(unittest.TestCase):
+    def setUp(self):
+        self.client = BattleshipClient(base_url='http://localhost:8008')
+
+        games = {
+            'a': _game('a', player1='aa11', player2='bb22'),
+            'b': _game('b', state='P1-WIN', player1='cc33'),
+            'c': _game('c', player1='bb22'),
+        }
+        board = serialize_boards({'a': (Board(), list(SHIP_SIZES))})
+        self.pages = [
+            _page([_entry('00a', serialize_metadata({'a': games['a']})),
+                   _entry('01a', board)],
+                  next_position='00b'),
+            _page([_entry('00b', serialize_metadata({'b': games['b']})),
+                   _entry('77c', serialize_games({'c': games['c']}))]),
+        ]
+
+    def _list(self, **kwargs):
+        with mock.patch.object(
+                self.client, '_send_request',
+                side_effect=self.pages) as send_request:
+            names = [game.name for game in self.client.list(**kwargs)]
+        queries = [
+            parse_qs(urlparse(call[0][0]).query)
+            for call in send_request.call_args_list
+        ]
+        return names, queries
+
+    def test_pages(self):
+        """Pages are followed at the block of the first, and boards are
+        skipped.
+        """
+        names, queries = self._list(start='00a')
+
+        self.assertEqual(names, ['a', 'b', 'c'])
+        self.assertEqual(queries[0]['start'], ['00a'])
+        self.assertNotIn('head', queries[0])
+        self.assertEqual(queries[1]['start'], ['00b'])
+        self.assertEqual(queries[1]['head'], ['head'])
+
+    def test_filters(self):
+        self.assertEqual(self._list(player='bb')[0], ['a', 'c'])
+        self.assertEqual(self._list(state='P1-WIN')[0], ['b'])
+
+    def test_limit(self):
+        """No page beyond the limit is fetched.
+        """
+        names, queries = self._list(limit=1)
+
+        self.assertEqual(names, ['a'])
+        self.assertEqual(len(queries), 1)
@@ -0,0 +1,78 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import threading
+import unittest
+
+from sawtooth_battleship.battleship_events import CommitWaiter
+from sawtooth_battleship.processor.handler import SHOT_EVENT
+from sawtooth_processor_test.mock_client_validator import MockClientValidator
+from sawtooth_sdk.protobuf.batch_pb2 import Batch
+from sawtooth_sdk.protobuf.events_pb2 import Event
+
+
+def _shot(game, cell, result='miss', state='P2-NEXT'):
+    return Event(
+        event_type=SHOT_EVENT,
+        attributes=[
+            Event.Attribute(key=key, value=value)
+            for key, value in (('game', game), ('cell', cell),
+                               ('result', result), ('state', state))
+        ])
+
+
+class TestCommitWaiter(unittest.TestCase):
+    def setUp(self):
+        self.validator = MockClientValidator()
+        self.url = self.validator.start()
+
+    def tearDown(self):
+        self.validator.stop()
+
+    def test_commit(self):
+        with CommitWaiter(self.url, game='game') as waiter:
+            waiter.submit([Batch(header_signature='batch')])
+
+            # A block without the batch, then later the block with it
+            self.validator.commit_block(['other'], [_shot('other', '1')])
+            timer = threading.Timer(
+                0.1, self.validator.commit_block,
+                args=(['batch'], [_shot('game', '7')]))
+            timer.start()
+
+            status = waiter.wait('batch', timeout=10)
+            timer.join()
+
+        self.assertEqual(status, 'COMMITTED')
+        self.assertEqual(
+            [batch.header_signature for batch in self.validator.batches],
+            ['batch'])
+        self.assertEqual(
+            waiter.shots,
+            [{'game': 'game', 'cell': '7', 'result': 'miss',
+              'state': 'P2-NEXT'}])
+
+    def test_invalid(self):
+        with CommitWaiter(self.url) as waiter:
+            self.validator.submit(['batch'])
+            self.validator.commit_block(invalid_batch_ids=['batch'])
+
+            self.assertEqual(waiter.wait('batch', timeout=10), 'INVALID')
+
+    def test_timeout(self):
+        with CommitWaiter(self.url) as waiter:
+            self.validator.submit(['batch'])
+
+            self.assertEqual(waiter.wait('batch', timeout=0.2), 'PENDING')
@@ -0,0 +1,340 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sawtooth_battleship.battleship_client import BattleshipClient
+from sawtooth_battleship.battleship_message_factory \
+    import BattleshipMessageFactory
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_state import BattleshipState
+from sawtooth_battleship.processor.battleship_state import Game
+from sawtooth_battleship.processor.battleship_state import PLAYERS
+from sawtooth_battleship.processor.battleship_state import Shot
+from sawtooth_battleship.processor.battleship_state import make_board_address
+from sawtooth_battleship.processor.battleship_state \
+    import make_game_addresses
+from sawtooth_battleship.processor.battleship_state \
+    import make_history_address
+from sawtooth_battleship.processor.handler import BattleshipTransactionHandler
+from sawtooth_battleship.processor.handler import SHOT_EVENT
+from sawtooth_sdk.processor.exceptions import AuthorizationException
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateEntry
+from sawtooth_signing import create_context
+
+# Ships A to E, as (space, vertical) pairs
+FLEET = ((1, False), (21, False), (10, True), (61, True), (99, False))
+FLEET_BOARD = (
+    'AAAAA----C'
+    '---------C'
+    'BBBB-----C'
+    + '-' * 30
+    + 'D---------' * 3
+    + '--------EE')
+
+
+class InMemoryContext:
+    """The part of sawtooth_sdk.processor.context.Context that the
+    handler uses, backed by a dict.
+    """
+
+    def __init__(self):
+        self.state = {}
+        self.events = []
+        # Every address set, in order
+        self.written = []
+        # If set, the transaction's header, whose inputs and outputs are
+        # enforced as the validator does
+        self.header = None
+
+    def _check(self, addresses, declared):
+        if self.header is None:
+            return
+        for address in addresses:
+            if address not in declared:
+                raise AuthorizationException(
+                    'Tried to access undeclared address {}'.format(address))
+
+    def get_state(self, addresses, timeout=None):
+        self._check(addresses, self.header and self.header.inputs)
+        return [
+            TpStateEntry(address=address, data=self.state[address])
+            for address in addresses if address in self.state
+        ]
+
+    def set_state(self, entries, timeout=None):
+        self._check(entries, self.header and self.header.outputs)
+        self.written.extend(entries)
+        self.state.update(entries)
+        return list(entries)
+
+    def delete_state(self, addresses, timeout=None):
+        self._check(addresses, self.header and self.header.outputs)
+        for address in addresses:
+            self.state.pop(address, None)
+        return list(addresses)
+
+    def add_event(self, event_type, attributes=None, data=None,
+                  timeout=None):
+        self.events.append((event_type, dict(attributes or [])))
+
+
+class TestBattleshipGame(unittest.TestCase):
+    def setUp(self):
+        self.context = InMemoryContext()
+        self.handler = BattleshipTransactionHandler()
+        self.players = BattleshipMessageFactory(), BattleshipMessageFactory()
+
+    def _new_game(self, name):
+        # Each fleet is a single destroyer on the first two cells
+        fleet = 'EE' + '-' * 98
+        BattleshipState(self.context).set_game(name, Game(
+            name=name,
+            board_P1=Board.from_string(fleet),
+            board_P2=Board.from_string(fleet),
+            state='P1-NEXT',
+            player1='',
+            player2='',
+            hulls_P1=[0, 0, 0, 0, 2],
+            hulls_P2=[0, 0, 0, 0, 2]))
+
+    def _place(self, signer, player, fleet, name='fleet'):
+        self.handler.apply(
+            self.players[signer].create_binary_tp_process_request(
+                [(name, 'place', (player, fleet))]),
+            self.context)
+
+    def _shoot(self, player, name, space):
+        self.handler.apply(
+            self.players[player].create_tp_process_request(
+                'shoot', name, space),
+            self.context)
+
+    def _game(self, name, players=PLAYERS):
+        return BattleshipState(self.context).get_game(name, players)
+
+    def test_win(self):
+        self._new_game('one')
+        self._new_game('two')
+
+        self._shoot(0, 'one', 1)
+        self._shoot(1, 'one', 5)
+        self.assertEqual(self._game('one').hulls_P2, [0, 0, 0, 0, 1])
+        self.assertEqual(self._game('one').hulls_P1, [0, 0, 0, 0, 2])
+
+        # Shots in another game do not count towards this one
+        self._shoot(0, 'two', 1)
+        self.assertEqual(self._game('two').hulls_P2, [0, 0, 0, 0, 1])
+
+        self._shoot(0, 'one', 2)
+        game = self._game('one')
+        self.assertEqual(game.hulls_P2, [0, 0, 0, 0, 0])
+        self.assertEqual(game.state, 'P1-WIN')
+        self.assertEqual(game.board_P2.to_string(), 'OO' + '-' * 98)
+        self.assertEqual(self._game('two').state, 'P2-NEXT')
+
+        self.assertEqual(
+            [event for event in self.context.events
+             if event[1]['game'] == 'one'],
+            [(SHOT_EVENT, {'game': 'one', 'cell': '1', 'result': 'hit',
+                           'state': 'P2-NEXT'}),
+             (SHOT_EVENT, {'game': 'one', 'cell': '5', 'result': 'miss',
+                           'state': 'P1-NEXT'}),
+             (SHOT_EVENT, {'game': 'one', 'cell': '2', 'result': 'sunk',
+                           'state': 'P1-WIN'})])
+
+    def test_history(self):
+        """Each shot is appended to the history of its game, which is
+        deleted with the game.
+        """
+        self._new_game('one')
+        self._new_game('two')
+
+        self._shoot(0, 'one', 1)
+        self._shoot(0, 'two', 3)
+        self._shoot(1, 'one', 5)
+        self._shoot(0, 'one', 2)
+
+        state = BattleshipState(self.context)
+        self.assertEqual(
+            state.get_history('one'),
+            [Shot(1, 1, 'hit'), Shot(2, 5, 'miss'), Shot(1, 2, 'sunk')])
+        self.assertEqual(state.get_history('two'), [Shot(1, 3, 'miss')])
+
+        self.handler.apply(
+            self.players[0].create_tp_process_request('delete', 'one'),
+            self.context)
+        self.assertNotIn(make_history_address('one'), self.context.state)
+        self.assertEqual(
+            BattleshipState(self.context).get_history('one'), [])
+
+    def test_binary_moves(self):
+        """The moves of a binary payload are applied in turn.
+        """
+        self._new_game('binary')
+        self.handler.apply(
+            self.players[0].create_binary_tp_process_request(
+                [('binary', 'shoot', 1), ('new', 'create', None)]),
+            self.context)
+
+        self.assertEqual(self._game('binary').hulls_P2, [0, 0, 0, 0, 1])
+        self.assertEqual(self._game('new').state, 'P1-NEXT')
+
+        with self.assertRaises(InvalidTransaction):
+            self.handler.apply(
+                self.players[1].create_binary_tp_process_request(
+                    [('binary', 'shoot', 3), ('binary', 'shoot', 4)]),
+                self.context)
+
+    def test_place(self):
+        """Each player places their fleet in one move, and the game is won
+        by sinking all of it.
+        """
+        self.handler.apply(
+            self.players[0].create_binary_tp_process_request(
+                [('fleet', 'create', None), ('fleet', 'place', (1, FLEET))]),
+            self.context)
+        self._place(1, 2, FLEET)
+
+        game = self._game('fleet')
+        self.assertEqual(game.board_P1.to_string(), FLEET_BOARD)
+        self.assertEqual(game.board_P2.to_string(), FLEET_BOARD)
+        self.assertEqual(game.hulls_P2, [5, 4, 3, 3, 2])
+        self.assertEqual(
+            (game.player1, game.player2),
+            (self.players[0].get_public_key(),
+             self.players[1].get_public_key()))
+
+        for player, fleet in (
+                # Taken by the other player
+                (1, FLEET),
+                # Placed already
+                (2, FLEET),
+                # Overlapping ships
+                (2, FLEET[:1] + ((3, True),) + FLEET[2:])):
+            with self.assertRaises(InvalidTransaction):
+                self._place(1, player, fleet)
+
+        ship_cells = [
+            index + 1 for index, mark in enumerate(FLEET_BOARD)
+            if mark != '-']
+        empty_cells = [
+            index + 1 for index, mark in enumerate(FLEET_BOARD)
+            if mark == '-']
+        for cell, miss in zip(ship_cells, empty_cells):
+            self._shoot(0, 'fleet', cell)
+            if cell != ship_cells[-1]:
+                self._shoot(1, 'fleet', miss)
+
+        game = self._game('fleet')
+        self.assertEqual(game.state, 'P1-WIN')
+        self.assertEqual(game.hulls_P2, [0, 0, 0, 0, 0])
+        self.assertEqual(
+            [event[1]['result'] for event in self.context.events
+             if event[1]['cell'] in ('99', '100')],
+            ['hit', 'sunk'])
+
+    def test_shot_leaves(self):
+        self._new_game('leaves')
+        board_P1 = self.context.state[make_board_address('leaves', 1)]
+        self.context.written = []
+
+        # Player 1's board is read to check that the fleet is placed, but
+        # not written by player 1's shot
+        self._shoot(0, 'leaves', 1)
+
+        self.assertNotIn(make_board_address('leaves', 1), self.context.written)
+        self.assertIn(make_board_address('leaves', 2), self.context.written)
+        self.assertEqual(
+            self.context.state[make_board_address('leaves', 1)], board_P1)
+        self.assertEqual(
+            self._game('leaves', players=[2]).hulls_P2, [0, 0, 0, 0, 1])
+
+    def test_unplaced_fleet(self):
+        """No shot is taken until both fleets are placed."""
+        self.handler.apply(
+            self.players[0].create_binary_tp_process_request(
+                [('fleet', 'create', None), ('fleet', 'place', (1, FLEET))]),
+            self.context)
+
+        with self.assertRaises(InvalidTransaction):
+            self._shoot(0, 'fleet', 1)
+
+        # The empty board is left unattacked, so it can still be placed
+        self._place(1, 2, FLEET)
+        self._shoot(0, 'fleet', 1)
+        self.assertEqual(self._game('fleet').hulls_P2, [4, 4, 3, 3, 2])
+
+    def test_legacy_record(self):
+        # A record stored before hull counts and leaves
+        self.context.state[make_game_addresses('old')[-1]] = ','.join(
+            ['old', 'EE' + '-' * 98, 'EE' + '-' * 98, 'P1-NEXT', '',
+             '']).encode()
+
+        game = self._game('old')
+        self.assertEqual(game.hulls_P1, [5, 4, 3, 3, 2])
+        self.assertEqual(game.hulls_P2, [5, 4, 3, 3, 2])
+
+        # The first write moves the game to its leaves
+        self._shoot(0, 'old', 5)
+
+        self.assertEqual(
+            sorted(self.context.state),
+            sorted(make_game_addresses('old')[:-1]))
+        game = self._game('old')
+        self.assertEqual(game.board_P1.to_string(), 'EE' + '-' * 98)
+        self.assertEqual(
+            game.board_P2.to_string(), 'EE--X' + '-' * 95)
+
+    def test_legacy_place(self):
+        """A client's placement on a game stored before the leaves
+        declares every address the move to the leaves writes.
+        """
+        self.context.state[make_game_addresses('old')[-1]] = ','.join(
+            ['old', '-' * 100, '-' * 100, 'P1-NEXT', '', '']).encode()
+
+        with tempfile.TemporaryDirectory() as key_dir:
+            keyfile = os.path.join(key_dir, 'player.priv')
+            with open(keyfile, 'w') as fd:
+                fd.write(create_context('secp256k1')
+                         .new_random_private_key().as_hex())
+            client = BattleshipClient(
+                base_url='http://localhost:8008', keyfile=keyfile)
+
+        with mock.patch.object(client, '_send_request') as send_request:
+            client.place('old', 2, FLEET)
+        transaction = BatchList.FromString(
+            send_request.call_args[0][1]).batches[0].transactions[0]
+
+        request = TpProcessRequest(
+            payload=transaction.payload,
+            signature=transaction.header_signature)
+        request.header.ParseFromString(transaction.header)
+        self.context.header = request.header
+        self.handler.apply(request, self.context)
+
+        # The metadata and both boards; no shot has been taken
+        self.assertEqual(
+            sorted(self.context.state),
+            sorted(make_game_addresses('old')[:3]))
+        game = self._game('old')
+        self.assertEqual(game.board_P1.to_string(), '-' * 100)
+        self.assertEqual(game.board_P2.to_string(), FLEET_BOARD)
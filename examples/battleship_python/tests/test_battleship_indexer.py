@@ -0,0 +1,355 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import timeit
+import unittest
+
+from sawtooth_battleship.indexer.battleship_index import BattleshipIndex
+from sawtooth_battleship.indexer.battleship_index import Move
+from sawtooth_battleship.indexer.subscriber import BattleshipSubscriber
+from sawtooth_battleship.indexer.subscriber import NULL_BLOCK_ID
+from sawtooth_battleship.indexer.subscriber import STATE_DELTA_EVENT
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_state import Game
+from sawtooth_battleship.processor.battleship_state import make_board_address
+from sawtooth_battleship.processor.battleship_state \
+    import make_game_addresses
+from sawtooth_battleship.processor.battleship_state \
+    import make_metadata_address
+from sawtooth_battleship.processor.battleship_state import serialize_boards
+from sawtooth_battleship.processor.battleship_state import serialize_games
+from sawtooth_battleship.processor.battleship_state \
+    import serialize_metadata
+from sawtooth_battleship.processor.handler import SHOT_EVENT
+from sawtooth_processor_test.mock_client_validator \
+    import MockClientValidator
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsSubscribeRequest
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsSubscribeResponse
+from sawtooth_sdk.protobuf.events_pb2 import Event
+from sawtooth_sdk.protobuf.transaction_receipt_pb2 import StateChange
+from sawtooth_sdk.protobuf.transaction_receipt_pb2 import StateChangeList
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+LOGGER = logging.getLogger(__name__)
+
+GAMES = 1000
+ROUNDS = 100
+
+ALICE = 'aa' * 33
+BOB = 'bb' * 33
+
+FLEET = 'EE' + '-' * 98
+
+
+def _game_changes(name, state, player1=ALICE, player2=BOB, board_P2=FLEET,
+                  hulls_P2=(0, 0, 0, 0, 2)):
+    """Return the state changes of a block that leaves the game as given.
+    """
+    game = Game(name, None, None, state, player1, player2)
+    return [
+        (make_metadata_address(name), serialize_metadata({name: game})),
+        (make_board_address(name, 1), serialize_boards(
+            {name: (Board.from_string(FLEET), (0, 0, 0, 0, 2))})),
+        (make_board_address(name, 2), serialize_boards(
+            {name: (Board.from_string(board_P2), hulls_P2)})),
+    ]
+
+
+def _shot(name, cell, result, state):
+    return {'game': name, 'cell': str(cell), 'result': result,
+            'state': state}
+
+
+class TestBattleshipIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index = BattleshipIndex(
+            os.path.join(self.directory, 'index.db'))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def test_games(self):
+        self.index.add_block(1, 'b1', 'r1', _game_changes('one', 'P1-NEXT'))
+        self.index.add_block(
+            2, 'b2', 'r2',
+            _game_changes('one', 'P2-NEXT', board_P2='OE' + '-' * 98,
+                          hulls_P2=(0, 0, 0, 0, 1))
+            + _game_changes('two', 'P1-NEXT', player2=''),
+            [_shot('one', 1, 'hit', 'P2-NEXT')])
+
+        game = self.index.get_game('one')
+        self.assertEqual(game.state, 'P2-NEXT')
+        self.assertEqual(game.board_P2.to_string(), 'OE' + '-' * 98)
+        self.assertEqual(game.hulls_P2, [0, 0, 0, 0, 1])
+        self.assertEqual(game.board_P1.to_string(), FLEET)
+        self.assertIsNone(self.index.get_game('three'))
+
+        self.assertEqual(
+            sorted(game.name for game in self.index.list_games()),
+            ['one', 'two'])
+        self.assertEqual(
+            [game.name for game in self.index.list_games(state='P2-NEXT')],
+            ['one'])
+        self.assertEqual(
+            [game.name for game in self.index.list_games(player=BOB[:6])],
+            ['one'])
+        self.assertEqual(len(self.index.list_games(limit=1)), 1)
+
+        self.assertEqual(
+            self.index.get_moves('one'),
+            [Move(2, 1, 1, 'hit', 'P2-NEXT')])
+
+        # Deleting a game removes its current rows
+        self.index.add_block(3, 'b3', 'r3', [
+            (address, None) for address, _ in _game_changes('two', 'P1-NEXT')])
+        self.assertIsNone(self.index.get_game('two'))
+
+        # Blocks already indexed are skipped
+        self.assertFalse(self.index.add_block(3, 'b3', 'r3'))
+        self.assertEqual(self.index.last_known_block_ids(2), ['b3', 'b2'])
+
+    def test_leaderboard(self):
+        self.index.add_block(1, 'b1', 'r1', _game_changes('one', 'P1-WIN'))
+        self.index.add_block(2, 'b2', 'r2', _game_changes('two', 'P2-WIN'))
+        # A won game written again does not count twice
+        self.index.add_block(3, 'b3', 'r3', _game_changes('one', 'P1-WIN'))
+        self.index.add_block(
+            4, 'b4', 'r4', _game_changes('three', 'P1-WIN', player2=ALICE))
+
+        # Wins are kept once the games are deleted
+        self.index.add_block(5, 'b5', 'r5', [
+            (address, None) for address, _ in _game_changes('one', 'P1-WIN')])
+
+        self.assertEqual(
+            self.index.leaderboard(),
+            [(ALICE, 2, 3), (BOB, 1, 2)])
+        self.assertEqual(self.index.leaderboard(limit=1), [(ALICE, 2, 3)])
+
+    def test_fork(self):
+        self.index.add_block(1, 'b1', 'r1', _game_changes('one', 'P1-NEXT'))
+        self.index.add_block(
+            2, 'b2', 'r2', _game_changes('one', 'P2-NEXT'),
+            [_shot('one', 3, 'miss', 'P2-NEXT')])
+        self.index.add_block(3, 'b3', 'r3', _game_changes('two', 'P1-NEXT'))
+
+        # Block 2 is replaced by a block of another fork
+        self.assertTrue(self.index.add_block(
+            2, 'c2', 's2', _game_changes('one', 'P1-WIN'),
+            [_shot('one', 5, 'sunk', 'P1-WIN')]))
+
+        self.assertEqual(self.index.get_game('one').state, 'P1-WIN')
+        self.assertIsNone(self.index.get_game('two'))
+        self.assertEqual(
+            self.index.get_moves('one'),
+            [Move(2, 1, 5, 'sunk', 'P1-WIN')])
+        self.assertEqual(self.index.last_known_block_ids(), ['c2', 'b1'])
+        self.assertEqual(self.index.leaderboard(), [(ALICE, 1, 1),
+                                                    (BOB, 0, 1)])
+
+        self.index.drop_from(2)
+        self.assertEqual(self.index.get_game('one').state, 'P1-NEXT')
+        self.assertEqual(self.index.leaderboard(), [])
+
+    def test_recreated_game(self):
+        """A game deleted and created again under its name starts with no
+        moves, while one moved to another address keeps them.
+        """
+        self.index.add_block(1, 'b1', 'r1', _game_changes('one', 'P1-NEXT'))
+        self.index.add_block(
+            2, 'b2', 'r2', _game_changes('one', 'P2-NEXT'),
+            [_shot('one', 3, 'miss', 'P2-NEXT')])
+        self.index.add_block(
+            3, 'b3', 'r3',
+            [(address, None) for address, _ in _game_changes('one', 'P1-WIN')]
+            + _game_changes('two', 'P1-NEXT'),
+            [_shot('one', 5, 'sunk', 'P1-WIN')])
+        self.assertEqual(self.index.get_moves('one'), [])
+
+        self.index.add_block(4, 'b4', 'r4', _game_changes('one', 'P1-NEXT'))
+        self.index.add_block(
+            5, 'b5', 'r5', _game_changes('one', 'P2-NEXT'),
+            [_shot('one', 7, 'hit', 'P2-NEXT')])
+        self.assertEqual(
+            self.index.get_moves('one'), [Move(5, 1, 7, 'hit', 'P2-NEXT')])
+
+        # Undoing the delete brings the moves of the first game back
+        self.index.drop_from(3)
+        self.assertEqual(
+            self.index.get_moves('one'),
+            [Move(2, 1, 3, 'miss', 'P2-NEXT')])
+
+    def test_moved_game(self):
+        """A game moved from the address used before the leaves keeps its
+        moves.
+        """
+        legacy = make_game_addresses('old')[-1]
+        self.index.add_block(1, 'b1', 'r1', [(legacy, serialize_games({
+            'old': Game('old', Board.from_string(FLEET),
+                        Board.from_string(FLEET), 'P2-NEXT', ALICE, BOB)
+        }))], [_shot('old', 3, 'miss', 'P2-NEXT')])
+
+        self.index.add_block(
+            2, 'b2', 'r2',
+            [(legacy, None)] + _game_changes('old', 'P1-NEXT'),
+            [_shot('old', 4, 'miss', 'P1-NEXT')])
+
+        self.assertEqual(self.index.get_game('old').state, 'P1-NEXT')
+        self.assertEqual(
+            self.index.get_moves('old'),
+            [Move(1, 1, 3, 'miss', 'P2-NEXT'),
+             Move(2, 2, 4, 'miss', 'P1-NEXT')])
+
+    def test_read_only(self):
+        self.index.add_block(1, 'b1', 'r1', _game_changes('one', 'P1-NEXT'))
+        path = os.path.join(self.directory, 'index.db')
+
+        # Queries are answered while the indexer writes, and once it has
+        # stopped
+        with BattleshipIndex(path, read_only=True) as index:
+            self.assertEqual(index.get_game('one').state, 'P1-NEXT')
+            with self.assertRaises(sqlite3.OperationalError):
+                index.add_block(2, 'b2', 'r2')
+        self.index.close()
+        with BattleshipIndex(path, read_only=True) as index:
+            self.assertEqual(index.last_known_block_ids(), ['b1'])
+        self.index = BattleshipIndex(path)
+
+        # A missing index is not created
+        with self.assertRaises(sqlite3.OperationalError):
+            BattleshipIndex(
+                os.path.join(self.directory, 'missing.db'), read_only=True)
+        self.assertFalse(
+            os.path.exists(os.path.join(self.directory, 'missing.db')))
+
+    def test_query_time(self):
+        changes = []
+        for i in range(GAMES):
+            changes.extend(_game_changes('game{}'.format(i), 'P1-NEXT'))
+        self.index.add_block(1, 'b1', 'r1', changes)
+
+        show = timeit.timeit(
+            lambda: self.index.get_game('game500'), number=ROUNDS)
+        page = timeit.timeit(
+            lambda: self.index.list_games(limit=100), number=ROUNDS)
+        LOGGER.warning(
+            'Battleship index of %s games: show %.3fms, list of 100 %.3fms',
+            GAMES, show / ROUNDS * 1000, page / ROUNDS * 1000)
+
+        self.assertEqual(self.index.get_game('game500').name, 'game500')
+
+
+class TestBattleshipSubscriber(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index = BattleshipIndex(
+            os.path.join(self.directory, 'index.db'))
+
+        self.validator = MockClientValidator()
+        self.subscribed = []
+        self.validator.set_responder(
+            Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST,
+            ClientEventsSubscribeRequest,
+            Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE,
+            self._subscribe)
+        self.url = self.validator.start()
+
+    def tearDown(self):
+        self.validator.stop()
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def _subscribe(self, ident, request):
+        self.subscribed.append(list(request.last_known_block_ids))
+        self.validator.subscriptions[ident] = list(request.subscriptions)
+        return ClientEventsSubscribeResponse(
+            status=ClientEventsSubscribeResponse.OK)
+
+    def _run(self, blocks):
+        """Run a subscriber until `blocks` are indexed."""
+        subscribed = len(self.subscribed)
+        block_num = self.validator.block_num + len(blocks)
+        subscriber = BattleshipSubscriber(self.url, self.index)
+        thread = threading.Thread(target=subscriber.start)
+        thread.start()
+        try:
+            deadline = time.time() + 10
+            while len(self.subscribed) == subscribed \
+                    and time.time() < deadline:
+                time.sleep(0.01)
+
+            for changes, shots in blocks:
+                self.validator.commit_block(events=[
+                    _state_delta(changes)
+                ] + [
+                    Event(event_type=SHOT_EVENT, attributes=[
+                        Event.Attribute(key=key, value=value)
+                        for key, value in shot.items()])
+                    for shot in shots
+                ])
+
+            while self.index.block_id(block_num) is None \
+                    and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            subscriber.stop()
+            thread.join()
+            subscriber.close()
+
+    def test_catch_up(self):
+        self._run([
+            (_game_changes('one', 'P1-NEXT'), []),
+            (_game_changes('one', 'P2-NEXT')
+             + [('0' * 70, b'not battleship')],
+             [_shot('one', 7, 'miss', 'P2-NEXT')]),
+        ])
+
+        self.assertEqual(self.subscribed, [[NULL_BLOCK_ID]])
+        self.assertEqual(self.index.get_game('one').state, 'P2-NEXT')
+        self.assertEqual(
+            self.index.get_moves('one'),
+            [Move(2, 1, 7, 'miss', 'P2-NEXT')])
+
+        # A restarted subscriber resumes from the blocks it indexed
+        known = self.index.last_known_block_ids()
+        self._run([(_game_changes('two', 'P1-NEXT'), [])])
+
+        self.assertEqual(self.subscribed[1], known)
+        self.assertEqual(self.index.get_game('two').state, 'P1-NEXT')
+
+
+def _state_delta(changes):
+    return Event(
+        event_type=STATE_DELTA_EVENT,
+        attributes=[Event.Attribute(key='address', value=address)
+                    for address, _ in changes],
+        data=StateChangeList(state_changes=[
+            StateChange(
+                address=address,
+                value=data or b'',
+                type=StateChange.SET if data else StateChange.DELETE)
+            for address, data in changes
+        ]).SerializeToString())
@@ -0,0 +1,136 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import timeit
+import unittest
+
+from sawtooth_battleship.processor.battleship_payload \
+    import BattleshipPayload
+from sawtooth_battleship.processor.battleship_payload \
+    import serialize_payload
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+
+LOGGER = logging.getLogger(__name__)
+
+ROUNDS = 20000
+
+
+def _moves(payload):
+    return [
+        (move.name, move.action, move.space)
+        for move in BattleshipPayload.from_bytes(payload).actions
+    ]
+
+
+class TestBattleshipPayload(unittest.TestCase):
+    def test_round_trip(self):
+        moves = [('game', 'create', None),
+                 ('game', 'shoot', 1),
+                 ('gàme', 'shoot', 100),
+                 ('game', 'delete', None)]
+
+        self.assertEqual(_moves(serialize_payload(moves)), moves)
+
+    def test_place(self):
+        fleet = ((1, False), (21, False), (10, True), (61, True), (99, False))
+        payload = BattleshipPayload.from_bytes(serialize_payload(
+            [('game', 'create', None), ('game', 'place', (2, fleet))]))
+
+        place = payload.actions[1]
+        self.assertEqual(
+            (place.name, place.action, place.space, place.player,
+             place.fleet),
+            ('game', 'place', None, 2, fleet))
+
+        binary = serialize_payload([('game', 'place', (1, fleet))])
+        for invalid in (binary[:-1],
+                        binary[:-6] + b'\3' + binary[-5:],
+                        binary[:-1] + bytes([100]),
+                        b'game,place,1'):
+            with self.assertRaises(InvalidTransaction, msg=invalid):
+                BattleshipPayload.from_bytes(invalid)
+
+        for moves in ([('game', 'place', (3, fleet))],
+                      [('game', 'place', (1, fleet[:4]))],
+                      [('game', 'place', (1, fleet[:4] + ((101, True),)))]):
+            with self.assertRaises(ValueError, msg=moves):
+                serialize_payload(moves)
+
+    def test_csv(self):
+        self.assertEqual(_moves(b'game,shoot,100'), [('game', 'shoot', 100)])
+        self.assertEqual(_moves(b'game,create,'), [('game', 'create', None)])
+
+        payload = BattleshipPayload.from_bytes(b'game,shoot,42')
+        self.assertEqual(
+            (payload.name, payload.action, payload.space),
+            ('game', 'shoot', 42))
+
+    def test_invalid(self):
+        binary = serialize_payload([('game', 'shoot', 5)])
+        for payload in (b'game,shoot,0',
+                        b'game,shoot,101',
+                        b'game,shoot,A1',
+                        b'game,take,1',
+                        b',create,',
+                        b'a|b,create,',
+                        b'game,create',
+                        binary[:-1],
+                        binary + b'\0',
+                        binary[:-1] + bytes([100]),
+                        binary[:2] + b'\x07' + binary[3:],
+                        serialize_payload([('game', 'create', None)])[:2]):
+            with self.assertRaises(InvalidTransaction, msg=payload):
+                BattleshipPayload.from_bytes(payload)
+
+        for moves in ([],
+                      [('game', 'take', 1)],
+                      [('game', 'shoot', 0)],
+                      [('g' * 256, 'create', None)]):
+            with self.assertRaises(ValueError, msg=moves):
+                serialize_payload(moves)
+
+    def test_benchmark(self):
+        """Logs the size and the decoding time of a shot in the binary and
+        CSV formats, and of several shots in one binary payload. Timings
+        are not asserted.
+        """
+        name = 'a-battleship-game'
+        binary = serialize_payload([(name, 'shoot', 57)])
+        csv = ','.join([name, 'shoot', '57']).encode()
+        several = serialize_payload([(name, 'shoot', 57)] * 10)
+
+        binary_time = timeit.timeit(
+            lambda: BattleshipPayload.from_bytes(binary),
+            number=ROUNDS) / ROUNDS
+        csv_time = timeit.timeit(
+            lambda: BattleshipPayload.from_bytes(csv), number=ROUNDS) / ROUNDS
+        several_time = timeit.timeit(
+            lambda: BattleshipPayload.from_bytes(several),
+            number=ROUNDS) / ROUNDS
+
+        LOGGER.warning(
+            'Per shot: binary %d bytes, decode %.2fus; '
+            'CSV %d bytes, decode %.2fus; '
+            '10 binary shots %d bytes, decode %.2fus',
+            len(binary),
+            binary_time * 1e6,
+            len(csv),
+            csv_time * 1e6,
+            len(several),
+            several_time * 1e6)
+
+        self.assertLess(len(binary), len(csv))
@@ -0,0 +1,82 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import unittest
+
+from sawtooth_battleship.battleship_replay import Stats
+from sawtooth_battleship.battleship_replay import replay
+from sawtooth_battleship.battleship_replay import stats
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_state import Game
+from sawtooth_battleship.processor.battleship_state import Shot
+
+
+FLEET = 'EE' + '-' * 98
+
+HISTORY = [Shot(1, 1, 'hit'), Shot(2, 5, 'miss'), Shot(1, 3, 'miss'),
+           Shot(2, 1, 'hit'), Shot(1, 2, 'sunk')]
+
+
+def _board(*cells):
+    board = Board.from_string(FLEET)
+    for cell in cells:
+        board.shoot(cell - 1)
+    return board
+
+
+def _game():
+    """The game as left by HISTORY."""
+    return Game(name='game',
+                board_P1=_board(5, 1),
+                board_P2=_board(1, 3, 2),
+                state='P1-WIN',
+                player1='aa' * 33,
+                player2='bb' * 33,
+                hulls_P1=[0, 0, 0, 0, 1],
+                hulls_P2=[0, 0, 0, 0, 0])
+
+
+class TestBattleshipReplay(unittest.TestCase):
+    def test_replay(self):
+        game = _game()
+
+        start = replay(game, HISTORY, 0)
+        self.assertEqual(start.state, 'P1-NEXT')
+        self.assertEqual(start.board_P1.to_string(), FLEET)
+        self.assertEqual(start.board_P2.to_string(), FLEET)
+        self.assertEqual(start.hulls_P2, [0, 0, 0, 0, 2])
+
+        middle = replay(game, HISTORY, 3)
+        self.assertEqual(middle.state, 'P2-NEXT')
+        self.assertEqual(middle.board_P1.to_string(), 'EE--X' + '-' * 95)
+        self.assertEqual(middle.board_P2.to_string(), 'OEX' + '-' * 97)
+        self.assertEqual(middle.hulls_P2, [0, 0, 0, 0, 1])
+
+        # The whole history leads to the game as it is
+        end = replay(game, HISTORY)
+        self.assertEqual(end.state, game.state)
+        for player in (1, 2):
+            board, hulls = end.fleet(player)
+            self.assertEqual(board.to_string(),
+                             game.fleet(player)[0].to_string())
+            self.assertEqual(hulls, game.fleet(player)[1])
+
+        # The game replayed from is left as it was
+        self.assertEqual(game.board_P2.to_string(), 'OOX' + '-' * 97)
+
+    def test_stats(self):
+        self.assertEqual(stats(HISTORY), {1: Stats(3, 2, 1),
+                                          2: Stats(2, 1, 0)})
+        self.assertEqual(stats([]), {1: Stats(0, 0, 0), 2: Stats(0, 0, 0)})
@@ -0,0 +1,186 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import timeit
+import unittest
+
+from sawtooth_battleship.processor.battleship_board import Board
+from sawtooth_battleship.processor.battleship_state import deserialize_boards
+from sawtooth_battleship.processor.battleship_state import deserialize_games
+from sawtooth_battleship.processor.battleship_state \
+    import deserialize_history
+from sawtooth_battleship.processor.battleship_state \
+    import deserialize_metadata
+from sawtooth_battleship.processor.battleship_state import Game
+from sawtooth_battleship.processor.battleship_state import record_type
+from sawtooth_battleship.processor.battleship_state import Shot
+from sawtooth_battleship.processor.battleship_state import RECORD_BOARD
+from sawtooth_battleship.processor.battleship_state import RECORD_GAMES
+from sawtooth_battleship.processor.battleship_state import RECORD_HISTORY
+from sawtooth_battleship.processor.battleship_state import RECORD_METADATA
+from sawtooth_battleship.processor.battleship_state import serialize_boards
+from sawtooth_battleship.processor.battleship_state import serialize_games
+from sawtooth_battleship.processor.battleship_state import serialize_history
+from sawtooth_battleship.processor.battleship_state import serialize_metadata
+
+
+LOGGER = logging.getLogger(__name__)
+
+ROUNDS = 2000
+
+PLAYER1 = '02' + 'a1' * 32
+PLAYER2 = '03' + 'b2' * 32
+BOARD = 'AAAAAX-O--' + 'BBBB--XX--' + 'CCC-DDD-EE' + '-' * 70
+
+
+def _game(name):
+    board = Board.from_string(BOARD)
+    return Game(name, board, board, 'P2-NEXT', PLAYER1, PLAYER2,
+                [5, 4, 3, 3, 1], [0, 4, 3, 3, 2])
+
+
+def _text_record(games):
+    return '|'.join(
+        ','.join([
+            game.name, game.board_P1.to_string(), game.board_P2.to_string(),
+            game.state, game.player1, game.player2,
+            ''.join(map(str, game.hulls_P1)),
+            ''.join(map(str, game.hulls_P2))])
+        for game in games.values()).encode()
+
+
+def _fields(games):
+    return {
+        name: (game.board_P1, game.board_P2, game.state, game.player1,
+               game.player2, game.hulls_P1, game.hulls_P2)
+        for name, game in games.items()
+    }
+
+
+class TestBattleshipState(unittest.TestCase):
+    def test_round_trip(self):
+        games = {'game': _game('game'), 'jeu é': _game('jeu é')}
+        games['game'].player2 = ''
+
+        decoded = deserialize_games(serialize_games(games))
+
+        self.assertEqual(list(decoded), ['game', 'jeu é'])
+        self.assertEqual(_fields(decoded), _fields(games))
+
+    def test_text_record(self):
+        games = {'game': _game('game'), 'other': _game('other')}
+
+        decoded = deserialize_games(_text_record(games))
+
+        # Ships hit cannot be recovered from the text format
+        self.assertEqual(
+            decoded['game'].board_P1.to_string(), BOARD)
+        self.assertEqual(decoded['other'].hulls_P2, [0, 4, 3, 3, 2])
+
+    def test_invalid_records(self):
+        record = serialize_games({'game': _game('game')})
+
+        for data in (b'', b'\x02' + record[1:], record[:-1], record + b'0'):
+            with self.assertRaises(ValueError):
+                deserialize_games(data)
+
+    def test_leaf_records(self):
+        games = {'game': _game('game'), 'jeu é': _game('jeu é')}
+        games['game'].player1 = ''
+        boards = {name: game.fleet(2) for name, game in games.items()}
+
+        metadata = serialize_metadata(games)
+        board = serialize_boards(boards)
+
+        self.assertEqual(record_type(metadata), RECORD_METADATA)
+        self.assertEqual(record_type(board), RECORD_BOARD)
+        self.assertEqual(record_type(serialize_games(games)), RECORD_GAMES)
+        self.assertEqual(record_type(_text_record(games)), RECORD_GAMES)
+
+        decoded = deserialize_metadata(metadata)
+        self.assertEqual(
+            [(game.name, game.state, game.player1, game.player2)
+             for game in decoded.values()],
+            [('game', 'P2-NEXT', '', PLAYER2),
+             ('jeu é', 'P2-NEXT', PLAYER1, PLAYER2)])
+        self.assertEqual(deserialize_boards(board), boards)
+
+        for data, deserialize in ((metadata, deserialize_boards),
+                                  (board, deserialize_metadata),
+                                  (metadata, deserialize_games),
+                                  (metadata[:-1], deserialize_metadata),
+                                  (board + b'0', deserialize_boards)):
+            with self.assertRaises(ValueError):
+                deserialize(data)
+
+    def test_history_records(self):
+        histories = {
+            'game': [Shot(1, 1, 'hit'), Shot(2, 100, 'miss'),
+                     Shot(1, 2, 'sunk')],
+            'jeu é': [],
+        }
+
+        record = serialize_history(histories)
+
+        self.assertEqual(record_type(record), RECORD_HISTORY)
+        self.assertEqual(deserialize_history(record), histories)
+        # A shot takes two bytes
+        self.assertEqual(
+            len(serialize_history({'game': histories['game'] * 2,
+                                   'jeu é': []})),
+            len(record) + 6)
+
+        for data, deserialize in ((record, deserialize_metadata),
+                                  (record[:-1], deserialize_history),
+                                  (record + b'0', deserialize_history)):
+            with self.assertRaises(ValueError):
+                deserialize(data)
+
+    def test_benchmark(self):
+        """Logs the size and the encoding and decoding times of a game in
+        the binary and text formats. Timings are not asserted.
+        """
+        games = {'game': _game('game')}
+        binary = serialize_games(games)
+        text = _text_record(games)
+
+        encode_time = timeit.timeit(
+            lambda: serialize_games(games), number=ROUNDS) / ROUNDS
+        decode_time = timeit.timeit(
+            lambda: deserialize_games(binary), number=ROUNDS) / ROUNDS
+        text_decode_time = timeit.timeit(
+            lambda: deserialize_games(text), number=ROUNDS) / ROUNDS
+
+        LOGGER.warning(
+            'Per game: binary %d bytes, encode %.1fus, decode %.1fus; '
+            'text %d bytes, decode %.1fus',
+            len(binary),
+            encode_time * 1e6,
+            decode_time * 1e6,
+            len(text),
+            text_decode_time * 1e6)
+
+        # A shot rewrites the game's metadata and the board shot at
+        game = games['game']
+        shot = len(serialize_metadata(games)) + \
+            len(serialize_boards({'game': game.fleet(2)}))
+        LOGGER.warning(
+            'Per shot: %d bytes written, %d with both boards at one address',
+            shot,
+            len(binary))
+
+        self.assertLess(len(binary), len(text))
+        self.assertLess(shot, len(binary))
@@ -0,0 +1,157 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import argparse
+import unittest
+from unittest import mock
+
+from sawtooth_battleship.battleship_workload import BattleshipWorkload
+from sawtooth_battleship.battleship_workload import PARITY
+from sawtooth_battleship.battleship_workload import STRATEGIES
+from sawtooth_battleship.battleship_workload import shot_order
+from sawtooth_battleship.processor.battleship_payload \
+    import BattleshipPayload
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+
+URL = 'http://localhost:8008'
+
+
+class Delegate:
+    def __init__(self):
+        self.batches = []
+
+    def on_new_batch(self, batch_id, url):
+        self.batches.append(batch_id)
+
+
+class TestBattleshipWorkload(unittest.TestCase):
+    def setUp(self):
+        self.posted = []
+        patcher = mock.patch(
+            'sawtooth_battleship.battleship_workload.post_batches',
+            side_effect=self._post_batches)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.delegate = Delegate()
+
+    def _post_batches(self, url, batch_list, auth_info=None):
+        self.posted.extend(batch_list.batches)
+        return (202, {})
+
+    def _workload(self, **kwargs):
+        args = dict(auth_info=None, key_pool=None, games=1, players=2,
+                    strategy=PARITY, shots=None, display_frequency=30)
+        args.update(kwargs)
+        workload = BattleshipWorkload(
+            self.delegate, argparse.Namespace(**args))
+        workload.on_validator_discovered(URL)
+        return workload
+
+    def _last_move(self):
+        return self._move(self.posted[-1])
+
+    def _move(self, batch):
+        txn = batch.transactions[0]
+        header = TransactionHeader()
+        header.ParseFromString(txn.header)
+        move = BattleshipPayload.from_bytes(txn.payload)
+        return move.name, move.action, move.space, header.signer_public_key
+
+    def _actions(self, batch):
+        return [
+            move.action for move in BattleshipPayload.from_bytes(
+                batch.transactions[0].payload).actions
+        ]
+
+    def test_lifecycle(self):
+        """A game is created, its players place their fleets and take turns
+        until the shots run out, and it is deleted.
+        """
+        workload = self._workload(shots=3)
+
+        workload.on_all_batches_committed()
+        name, action, _, creator = self._last_move()
+        self.assertEqual(action, 'create')
+        self.assertEqual(self._actions(self.posted[-1]), ['create', 'place'])
+
+        # The game limit is reached
+        workload.on_all_batches_committed()
+        self.assertEqual(len(self.posted), 1)
+
+        moves = []
+        for _ in range(5):
+            workload.on_batch_committed(self.delegate.batches[-1])
+            moves.append(self._last_move())
+
+        self.assertEqual(
+            [(move[0], move[1]) for move in moves],
+            [(name, 'place')] + [(name, 'shoot')] * 3 + [(name, 'delete')])
+        self.assertNotEqual(moves[0][3], creator)
+        self.assertEqual(moves[1][3], creator)
+        self.assertEqual(moves[3][3], creator)
+        self.assertNotEqual(moves[2][3], creator)
+
+        workload.on_batch_committed(self.delegate.batches[-1])
+        self.assertEqual(len(self.posted), 6)
+
+        summary = workload.latencies.summary()
+        self.assertEqual(
+            {action: stats['count'] for action, stats in summary.items()},
+            {'create': 1, 'place': 1, 'shoot': 3, 'delete': 1})
+
+    def test_single_player(self):
+        workload = self._workload(players=1, shots=2)
+
+        workload.on_all_batches_committed()
+        self.assertEqual(
+            self._actions(self.posted[-1]), ['create', 'place', 'place'])
+
+        signers = set()
+        for _ in range(2):
+            workload.on_batch_committed(self.delegate.batches[-1])
+            self.assertEqual(self._last_move()[1], 'shoot')
+            signers.add(self._last_move()[3])
+
+        self.assertEqual(len(signers), 1)
+
+    def test_win(self):
+        """Games end once a fleet is sunk, before the cells run out."""
+        workload = self._workload(strategy=PARITY)
+
+        workload.on_all_batches_committed()
+        while self._last_move()[1] != 'delete':
+            workload.on_batch_committed(self.delegate.batches[-1])
+
+        game, _, _ = workload._pending_batches[self.delegate.batches[-1]]
+        shots = [move for move in map(self._move, self.posted)
+                 if move[1] == 'shoot']
+        self.assertIn(game.winner, (1, 2))
+        self.assertEqual(len(shots) % 2, game.winner % 2)
+
+        # Every cell of the loser's fleet was hit
+        board = game.boards[2 if game.winner == 1 else 1]
+        self.assertEqual(board.occupied & ~board.hits, 0)
+
+    def test_shot_order(self):
+        for strategy in STRATEGIES:
+            self.assertEqual(
+                sorted(shot_order(strategy)), list(range(1, 101)))
+
+        # No ship fits between the first 50 cells shot
+        first = shot_order(PARITY)[:50]
+        self.assertEqual(
+            {sum(divmod(cell - 1, 10)) % 2 for cell in first}, {0})
@@ -0,0 +1,119 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import unittest
+
+from sawtooth_battleship.battleship_message_factory \
+    import BattleshipMessageFactory
+from sawtooth_battleship.processor.battleship_board import random_fleet
+from sawtooth_battleship.processor.handler import BattleshipTransactionHandler
+from sawtooth_processor_test.mock_validator import benchmark_handler
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
+
+
+LOGGER = logging.getLogger(__name__)
+
+GAMES = 500
+SHOTS = 100
+
+# Each player fires at these spaces in turn
+SPACES = 1, 2, 3, 4
+
+
+class TestBattleshipBenchmark(unittest.TestCase):
+    """Applies a stream of battleship transactions through the handler
+    against a MockValidator that keeps its own state, and logs the
+    throughput.
+    """
+
+    def test_create_and_delete(self):
+        factory = BattleshipMessageFactory()
+        games = ['game{}'.format(i) for i in range(GAMES)]
+
+        requests = factory.create_tp_process_requests(
+            [(game, 'create', None) for game in games]
+            + [(game, 'delete', None) for game in games])
+
+        state = {}
+        result = benchmark_handler(
+            BattleshipTransactionHandler(), requests, state=state)
+
+        LOGGER.warning('Battleship handler: %s', result)
+
+        self.assertEqual(result.count(TpProcessResponse.OK), 2 * GAMES)
+        self.assertEqual(state, {})
+
+    def test_shots(self):
+        players = BattleshipMessageFactory(), BattleshipMessageFactory()
+        games = ['game{}'.format(i) for i in range(SHOTS)]
+
+        # Each game is created with player 1's fleet, then player 2 places
+        # theirs
+        requests = [
+            players[0].create_binary_tp_process_request(
+                [(game, 'create', None), _placement(game, 1)])
+            for game in games
+        ] + [
+            players[1].create_binary_tp_process_request(
+                [_placement(game, 2)])
+            for game in games
+        ]
+
+        # Each player's shots are built in bulk, then put back in the
+        # order they are fired
+        moves = [], []
+        order = []
+        for space in SPACES:
+            for player, player_moves in enumerate(moves):
+                player_moves.extend(
+                    (game, 'shoot', space) for game in games)
+                order.extend([player] * len(games))
+
+        player_requests = [
+            iter(player.create_tp_process_requests(player_moves))
+            for player, player_moves in zip(players, moves)
+        ]
+        requests.extend(next(player_requests[player]) for player in order)
+
+        result = benchmark_handler(BattleshipTransactionHandler(), requests)
+
+        LOGGER.warning('Battleship handler, shots: %s', result)
+
+        self.assertEqual(result.count(TpProcessResponse.OK), len(requests))
+
+    def test_place(self):
+        factory = BattleshipMessageFactory()
+        games = ['game{}'.format(i) for i in range(GAMES)]
+
+        # Each game is created and both its fleets placed by a single
+        # transaction
+        requests = [
+            factory.create_binary_tp_process_request(
+                [(game, 'create', None)] + [
+                    _placement(game, player) for player in (1, 2)])
+            for game in games
+        ]
+
+        result = benchmark_handler(BattleshipTransactionHandler(), requests)
+
+        LOGGER.warning('Battleship handler, placements: %s', result)
+
+        self.assertEqual(result.count(TpProcessResponse.OK), GAMES)
+
+
+def _placement(game, player):
+    return (game, 'place', (player, [
+        (index + 1, vertical) for index, vertical in random_fleet()]))
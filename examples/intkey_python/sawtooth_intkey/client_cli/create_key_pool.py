@@ -0,0 +1,73 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import argparse
+import logging
+
+from sawtooth_intkey.client_cli.exceptions import IntKeyCliException
+
+from sawtooth_signing import create_context
+from sawtooth_signing.key_pool import KeyPool
+
+LOGGER = logging.getLogger(__name__)
+
+
+def do_create_key_pool(args):
+    if args.count < 1:
+        raise IntKeyCliException('count must be at least 1')
+
+    context = create_context('secp256k1')
+    pool = KeyPool.generate(context, args.count, workers=args.workers)
+    print("Writing {} keys to {}...".format(len(pool), args.output))
+    try:
+        pool.save(args.output)
+    except OSError as err:
+        raise IntKeyCliException(
+            'Unable to write {}: {}'.format(args.output, err)) from err
+
+
+def add_create_key_pool_parser(subparsers, parent_parser):
+
+    epilog = '''
+    details:
+     create a keystore of signing keys for the workload --key-pool
+     option. The file is only readable by its owner.
+    '''
+
+    parser = subparsers.add_parser(
+        'create_key_pool',
+        parents=[parent_parser],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=epilog)
+
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        help='location of output file',
+        default='keys.pool',
+        metavar='')
+
+    parser.add_argument(
+        '-c', '--count',
+        type=int,
+        help='number of keys to generate',
+        default=1000,
+        metavar='')
+
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        help='number of processes generating keys (default: one per CPU)',
+        metavar='')
@@ -29,6 +29,9 @@ from sawtooth_intkey.client_cli.populate import add_populate_parser
 from sawtooth_intkey.client_cli.populate import do_populate
 from sawtooth_intkey.client_cli.create_batch import add_create_batch_parser
 from sawtooth_intkey.client_cli.create_batch import do_create_batch
+from sawtooth_intkey.client_cli.create_key_pool \
+    import add_create_key_pool_parser
+from sawtooth_intkey.client_cli.create_key_pool import do_create_key_pool
 from sawtooth_intkey.client_cli.load import add_load_parser
 from sawtooth_intkey.client_cli.load import do_load
 from sawtooth_intkey.client_cli.intkey_workload import add_workload_parser
@@ -119,6 +122,7 @@ def create_parser(prog_name):
     add_load_parser(subparsers, parent_parser)
     add_populate_parser(subparsers, parent_parser)
     add_create_batch_parser(subparsers, parent_parser)
+    add_create_key_pool_parser(subparsers, parent_parser)
     add_workload_parser(subparsers, parent_parser)
 
     return parser
@@ -360,6 +364,8 @@ def main(prog_name=os.path.basename(sys.argv[0]), args=None):
         do_load(args)
     elif args.command == 'create_batch':
         do_create_batch(args)
+    elif args.command == 'create_key_pool':
+        do_create_key_pool(args)
     elif args.command == 'workload':
         do_workload(args)
 
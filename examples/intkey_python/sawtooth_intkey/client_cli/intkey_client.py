@@ -15,10 +15,9 @@
 
 import hashlib
 import base64
+import json
 import time
 import random
-import requests
-import yaml
 import cbor
 
 from sawtooth_intkey.client_cli.exceptions import IntkeyClientException
@@ -28,6 +27,10 @@ from sawtooth_signing import CryptoFactory
 from sawtooth_signing import ParseError
 from sawtooth_signing.secp256k1 import Secp256k1PrivateKey
 
+from sawtooth_sdk.client.exceptions import RestApiError
+from sawtooth_sdk.client.exceptions import RestApiUnavailable
+from sawtooth_sdk.client.rest_client import RestClient
+from sawtooth_sdk.processor.address import Namespace
 from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 from sawtooth_sdk.protobuf.transaction_pb2 import Transaction
 from sawtooth_sdk.protobuf.batch_pb2 import BatchList
@@ -35,6 +38,9 @@ from sawtooth_sdk.protobuf.batch_pb2 import BatchHeader
 from sawtooth_sdk.protobuf.batch_pb2 import Batch
 
 
+_NAMESPACE = Namespace('intkey', from_end=True)
+
+
 def _sha512(data):
     return hashlib.sha512(data).hexdigest()
 
@@ -42,6 +48,7 @@ def _sha512(data):
 class IntkeyClient:
     def __init__(self, url, keyfile=None):
         self.url = url
+        self._rest_client = RestClient(url)
 
         if keyfile is not None:
             try:
@@ -76,7 +83,7 @@ class IntkeyClient:
                 self._get_prefix()))
 
         try:
-            encoded_entries = yaml.safe_load(result)["data"]
+            encoded_entries = json.loads(result)["data"]
 
             return [
                 cbor.loads(base64.b64decode(entry["data"]))
@@ -94,7 +101,7 @@ class IntkeyClient:
         try:
             return cbor.loads(
                 base64.b64decode(
-                    yaml.safe_load(result)["data"]))[name]
+                    json.loads(result)["data"]))[name]
 
         except BaseException:
             return None
@@ -103,50 +110,29 @@ class IntkeyClient:
         try:
             result = self._send_request(
                 'batch_statuses?id={}&wait={}'.format(batch_id, wait),)
-            return yaml.safe_load(result)['data'][0]['status']
+            return json.loads(result)['data'][0]['status']
         except BaseException as err:
             raise IntkeyClientException(err) from err
 
     def _get_prefix(self):
-        return _sha512('intkey'.encode('utf-8'))[0:6]
+        return _NAMESPACE.prefix
 
     def _get_address(self, name):
-        prefix = self._get_prefix()
-        game_address = _sha512(name.encode('utf-8'))[64:]
-        return prefix + game_address
+        return _NAMESPACE.make_address(name)
 
     def _send_request(self, suffix, data=None, content_type=None, name=None):
-        if self.url.startswith("http://"):
-            url = "{}/{}".format(self.url, suffix)
-        else:
-            url = "http://{}/{}".format(self.url, suffix)
-
-        headers = {}
-
-        if content_type is not None:
-            headers['Content-Type'] = content_type
-
         try:
-            if data is not None:
-                result = requests.post(url, headers=headers, data=data)
-            else:
-                result = requests.get(url, headers=headers)
-
-            if result.status_code == 404:
-                raise IntkeyClientException("No such key: {}".format(name))
+            return self._rest_client.request(
+                suffix, data=data, content_type=content_type).text
 
-            if not result.ok:
-                raise IntkeyClientException("Error {}: {}".format(
-                    result.status_code, result.reason))
-
-        except requests.ConnectionError as err:
-            raise IntkeyClientException(
-                'Failed to connect to REST API: {}'.format(err)) from err
-
-        except BaseException as err:
-            raise IntkeyClientException(err) from err
+        except RestApiError as err:
+            if err.status_code == 404:
+                raise IntkeyClientException(
+                    "No such key: {}".format(name)) from err
+            raise IntkeyClientException(str(err)) from err
 
-        return result.text
+        except RestApiUnavailable as err:
+            raise IntkeyClientException(str(err)) from err
 
     def _send_transaction(self, verb, name, value, wait=None):
         payload = cbor.dumps({
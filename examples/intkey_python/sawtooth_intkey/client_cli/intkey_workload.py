@@ -35,6 +35,7 @@ from sawtooth_intkey.client_cli.exceptions import IntKeyCliException
 from sawtooth_signing import create_context
 from sawtooth_signing import CryptoFactory
 from sawtooth_signing import ParseError
+from sawtooth_signing.key_pool import KeyPool
 from sawtooth_signing.secp256k1 import Secp256k1PrivateKey
 from sawtooth_sdk.protobuf import batch_pb2
 
@@ -112,11 +113,26 @@ class IntKeyWorkload(Workload):
             self._signer = crypto_factory.new_signer(
                 context.new_random_private_key())
 
+        self._key_pool = None
+        if args.key_pool is not None:
+            try:
+                self._key_pool = KeyPool.load(context, args.key_pool)
+            except ParseError as pe:
+                raise IntKeyCliException(str(pe)) from pe
+            except IOError as ioe:
+                raise IntKeyCliException(str(ioe)) from ioe
+
+    def _next_signer(self):
+        if self._key_pool is not None:
+            return self._key_pool.next_signer()
+        return self._signer
+
     def on_will_start(self):
         pass
 
     def on_will_stop(self):
-        pass
+        if self._key_pool is not None:
+            self._key_pool.close()
 
     def on_validator_discovered(self, url):
         self._urls.append(url)
@@ -138,16 +154,17 @@ class IntKeyWorkload(Workload):
 
         if key is not None:
             if key.value < 1000000:
+                signer = self._next_signer()
                 txn = create_intkey_transaction(
                     verb="inc",
                     name=key.name,
                     value=1,
                     deps=[self._deps[key.name]],
-                    signer=self._signer)
+                    signer=signer)
 
                 batch = create_batch(
                     transactions=[txn],
-                    signer=self._signer)
+                    signer=signer)
 
                 batch_id = batch.header_signature
 
@@ -179,16 +196,17 @@ class IntKeyWorkload(Workload):
         batch_id = None
         if url is not None:
             name = datetime.now().isoformat()[-20:]
+            signer = self._next_signer()
             txn = create_intkey_transaction(
                 verb="set",
                 name=name,
                 value=0,
                 deps=[],
-                signer=self._signer)
+                signer=signer)
 
             batch = create_batch(
                 transactions=[txn],
-                signer=self._signer)
+                signer=signer)
 
             self._deps[name] = txn.header_signature
             batch_id = batch.header_signature
@@ -266,3 +284,10 @@ def add_workload_parser(subparsers, parent_parser):
                         type=str,
                         help="A file containing a private key "
                              "to sign transactions and batches.")
+
+    parser.add_argument('--key-pool',
+                        type=str,
+                        help="A keystore file of pre-generated keys; "
+                             "batches are signed by its keys in turn "
+                             "instead of the --key-file key. Create one "
+                             "with 'intkey create_key_pool'.")
@@ -41,6 +41,16 @@ class IntkeyMessageFactory:
     def create_tp_response(self, status):
         return self._factory.create_tp_response(status)
 
+    def _create_txns(self, txns_function, triples):
+        payloads = []
+        addresses = []
+        for verb, name, value in triples:
+            payloads.append(
+                self._dumps({'Verb': verb, 'Name': name, 'Value': value}))
+            addresses.append([make_intkey_address(name)])
+
+        return txns_function(payloads, addresses, addresses)
+
     def _create_txn(self, txn_function, verb, name, value):
         payload = self._dumps({'Verb': verb, 'Name': name, 'Value': value})
 
@@ -56,13 +66,22 @@ class IntkeyMessageFactory:
         txn_function = self._factory.create_transaction
         return self._create_txn(txn_function, verb, name, value)
 
-    def create_batch(self, triples):
-        txns = [
-            self.create_transaction(verb, name, value)
-            for verb, name, value in triples
-        ]
+    def create_tp_process_requests(self, triples):
+        """Create a TpProcessRequest for each (verb, name, value) triple,
+        signing them in parallel.
+        """
+        txns_function = self._factory.create_tp_process_requests
+        return self._create_txns(txns_function, triples)
 
-        return self._factory.create_batch(txns)
+    def create_transactions(self, triples):
+        """Create a transaction for each (verb, name, value) triple,
+        signing them in parallel.
+        """
+        txns_function = self._factory.create_transactions
+        return self._create_txns(txns_function, triples)
+
+    def create_batch(self, triples):
+        return self._factory.create_batch(self.create_transactions(triples))
 
     def create_get_request(self, name):
         addresses = [make_intkey_address(name)]
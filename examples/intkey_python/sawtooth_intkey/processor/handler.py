@@ -14,11 +14,11 @@
 # ------------------------------------------------------------------------------
 
 import logging
-import hashlib
 
 import cbor
 
 
+from sawtooth_sdk.processor.address import Namespace
 from sawtooth_sdk.processor.handler import TransactionHandler
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 from sawtooth_sdk.processor.exceptions import InternalError
@@ -35,13 +35,13 @@ MAX_NAME_LENGTH = 20
 
 FAMILY_NAME = 'intkey'
 
-INTKEY_ADDRESS_PREFIX = hashlib.sha512(
-    FAMILY_NAME.encode('utf-8')).hexdigest()[0:6]
+# Intkey addresses end with the last 64 hex characters of the digest
+NAMESPACE = Namespace(FAMILY_NAME, from_end=True)
+INTKEY_ADDRESS_PREFIX = NAMESPACE.prefix
 
 
 def make_intkey_address(name):
-    return INTKEY_ADDRESS_PREFIX + hashlib.sha512(
-        name.encode('utf-8')).hexdigest()[-64:]
+    return NAMESPACE.make_address(name)
 
 
 class IntkeyTransactionHandler(TransactionHandler):
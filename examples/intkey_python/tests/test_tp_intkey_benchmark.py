@@ -0,0 +1,75 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import unittest
+
+from sawtooth_intkey.intkey_message_factory import IntkeyMessageFactory
+from sawtooth_intkey.processor.handler import IntkeyTransactionHandler
+from sawtooth_processor_test.mock_validator import benchmark_handler
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
+
+
+LOGGER = logging.getLogger(__name__)
+
+NAMES = 100
+INCREMENTS = 9
+PROCESSORS = 4
+
+
+class TestIntkeyBenchmark(unittest.TestCase):
+    """Applies a stream of intkey transactions through the handler against
+    a MockValidator that keeps its own state, and logs the throughput.
+    """
+
+    def test_set_and_inc(self):
+        result = benchmark_handler(IntkeyTransactionHandler(), _requests())
+
+        LOGGER.warning('Intkey handler: %s', result)
+
+        self.assertEqual(
+            result.count(TpProcessResponse.OK), NAMES * (INCREMENTS + 1))
+
+    def test_processors(self):
+        # Consecutive requests touch different names, so they may be
+        # applied concurrently
+        result = benchmark_handler(
+            IntkeyTransactionHandler(),
+            _requests(),
+            processors=PROCESSORS)
+
+        LOGGER.warning('Intkey handler, %s processors: %s', PROCESSORS, result)
+        for stats in result.processor_stats().values():
+            LOGGER.warning(
+                '  %d transactions, %.1f tps, latency %.2fms mean, '
+                '%.2fms max',
+                stats.transactions,
+                stats.transactions_per_second,
+                stats.mean_latency * 1e3,
+                stats.max_latency * 1e3)
+
+        self.assertEqual(
+            result.count(TpProcessResponse.OK), NAMES * (INCREMENTS + 1))
+        self.assertEqual(len(result.processor_stats()), PROCESSORS)
+
+
+def _requests():
+    factory = IntkeyMessageFactory()
+
+    triples = [('set', 'name{}'.format(i), 0) for i in range(NAMES)]
+    for _ in range(INCREMENTS):
+        triples.extend(('inc', 'name{}'.format(i), 1) for i in range(NAMES))
+
+    return factory.create_tp_process_requests(triples)
@@ -13,17 +13,16 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
-import hashlib
-
+from sawtooth_sdk.processor.address import Namespace
 from sawtooth_sdk.processor.exceptions import InternalError
 
 
-XO_NAMESPACE = hashlib.sha512('xo'.encode("utf-8")).hexdigest()[0:6]
+NAMESPACE = Namespace('xo')
+XO_NAMESPACE = NAMESPACE.prefix
 
 
 def _make_xo_address(name):
-    return XO_NAMESPACE + \
-        hashlib.sha512(name.encode('utf-8')).hexdigest()[:64]
+    return NAMESPACE.make_address(name)
 
 
 class Game:
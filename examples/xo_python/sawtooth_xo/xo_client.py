@@ -15,11 +15,9 @@
 
 import hashlib
 import base64
-from base64 import b64encode
+import json
 import time
 import random
-import requests
-import yaml
 
 from sawtooth_xo.xo_exceptions import XoException
 
@@ -28,6 +26,10 @@ from sawtooth_signing import CryptoFactory
 from sawtooth_signing import ParseError
 from sawtooth_signing.secp256k1 import Secp256k1PrivateKey
 
+from sawtooth_sdk.client.exceptions import RestApiError
+from sawtooth_sdk.client.exceptions import RestApiUnavailable
+from sawtooth_sdk.client.rest_client import RestClient
+from sawtooth_sdk.processor.address import Namespace
 from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 from sawtooth_sdk.protobuf.transaction_pb2 import Transaction
 from sawtooth_sdk.protobuf.batch_pb2 import BatchList
@@ -35,6 +37,9 @@ from sawtooth_sdk.protobuf.batch_pb2 import BatchHeader
 from sawtooth_sdk.protobuf.batch_pb2 import Batch
 
 
+_NAMESPACE = Namespace('xo')
+
+
 def _sha512(data):
     return hashlib.sha512(data).hexdigest()
 
@@ -43,6 +48,7 @@ class XoClient:
     def __init__(self, base_url, keyfile=None):
 
         self._base_url = base_url
+        self._rest_client = RestClient(base_url)
 
         if keyfile is None:
             self._signer = None
@@ -99,7 +105,7 @@ class XoClient:
             auth_password=auth_password)
 
         try:
-            encoded_entries = yaml.safe_load(result)["data"]
+            encoded_entries = json.loads(result)["data"]
 
             return [
                 base64.b64decode(entry["data"]) for entry in encoded_entries
@@ -117,7 +123,7 @@ class XoClient:
             auth_user=auth_user,
             auth_password=auth_password)
         try:
-            return base64.b64decode(yaml.safe_load(result)["data"])
+            return base64.b64decode(json.loads(result)["data"])
 
         except BaseException:
             return None
@@ -128,17 +134,15 @@ class XoClient:
                 'batch_statuses?id={}&wait={}'.format(batch_id, wait),
                 auth_user=auth_user,
                 auth_password=auth_password)
-            return yaml.safe_load(result)['data'][0]['status']
+            return json.loads(result)['data'][0]['status']
         except BaseException as err:
             raise XoException(err) from err
 
     def _get_prefix(self):
-        return _sha512('xo'.encode('utf-8'))[0:6]
+        return _NAMESPACE.prefix
 
     def _get_address(self, name):
-        xo_prefix = self._get_prefix()
-        game_address = _sha512(name.encode('utf-8'))[0:64]
-        return xo_prefix + game_address
+        return _NAMESPACE.make_address(name)
 
     def _send_request(self,
                       suffix,
@@ -147,42 +151,22 @@ class XoClient:
                       name=None,
                       auth_user=None,
                       auth_password=None):
-        if self._base_url.startswith("http://"):
-            url = "{}/{}".format(self._base_url, suffix)
-        else:
-            url = "http://{}/{}".format(self._base_url, suffix)
-
-        headers = {}
-        if auth_user is not None:
-            auth_string = "{}:{}".format(auth_user, auth_password)
-            b64_string = b64encode(auth_string.encode()).decode()
-            auth_header = 'Basic {}'.format(b64_string)
-            headers['Authorization'] = auth_header
-
-        if content_type is not None:
-            headers['Content-Type'] = content_type
-
         try:
-            if data is not None:
-                result = requests.post(url, headers=headers, data=data)
-            else:
-                result = requests.get(url, headers=headers)
-
-            if result.status_code == 404:
-                raise XoException("No such game: {}".format(name))
-
-            if not result.ok:
-                raise XoException("Error {}: {}".format(
-                    result.status_code, result.reason))
-
-        except requests.ConnectionError as err:
-            raise XoException(
-                'Failed to connect to {}: {}'.format(url, str(err))) from err
+            return self._rest_client.request(
+                suffix,
+                data=data,
+                content_type=content_type,
+                auth_user=auth_user,
+                auth_password=auth_password).text
 
-        except BaseException as err:
-            raise XoException(err) from err
+        except RestApiError as err:
+            if err.status_code == 404:
+                raise XoException(
+                    "No such game: {}".format(name)) from err
+            raise XoException(str(err)) from err
 
-        return result.text
+        except RestApiUnavailable as err:
+            raise XoException(str(err)) from err
 
     def _send_xo_txn(self,
                      name,
@@ -34,15 +34,28 @@ class XoMessageFactory:
     def create_tp_response(self, status):
         return self._factory.create_tp_response(status)
 
-    def _create_txn(self, txn_function, game, action, space=None):
-        payload = ",".join([
+    @staticmethod
+    def _create_payload(game, action, space=None):
+        return ",".join([
             str(game), str(action), str(space)
         ]).encode()
 
+    def _create_txn(self, txn_function, game, action, space=None):
+        payload = self._create_payload(game, action, space)
+
         addresses = [self._game_to_address(game)]
 
         return txn_function(payload, addresses, addresses, [])
 
+    def _create_txns(self, txns_function, moves):
+        payloads = []
+        addresses = []
+        for game, action, space in moves:
+            payloads.append(self._create_payload(game, action, space))
+            addresses.append([self._game_to_address(game)])
+
+        return txns_function(payloads, addresses, addresses)
+
     def create_tp_process_request(self, action, game, space=None):
         txn_function = self._factory.create_tp_process_request
         return self._create_txn(txn_function, game, action, space)
@@ -51,6 +64,22 @@ class XoMessageFactory:
         txn_function = self._factory.create_transaction
         return self._create_txn(txn_function, game, action, space)
 
+    def create_tp_process_requests(self, moves):
+        """Create a TpProcessRequest for each (action, game, space) tuple,
+        signing them in parallel.
+        """
+        txns_function = self._factory.create_tp_process_requests
+        return self._create_txns(
+            txns_function,
+            ((game, action, space) for action, game, space in moves))
+
+    def create_transactions(self, moves):
+        """Create a transaction for each (game, action, space) tuple,
+        signing them in parallel.
+        """
+        txns_function = self._factory.create_transactions
+        return self._create_txns(txns_function, moves)
+
     def create_get_request(self, game):
         addresses = [self._game_to_address(game)]
         return self._factory.create_get_request(addresses)
@@ -0,0 +1,64 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import unittest
+
+from sawtooth_xo.processor.handler import XoTransactionHandler
+from sawtooth_xo.xo_message_factory import XoMessageFactory
+from sawtooth_processor_test.mock_validator import benchmark_handler
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
+
+
+LOGGER = logging.getLogger(__name__)
+
+GAMES = 100
+
+# Player 1 wins on the top row after five moves
+MOVES = 1, 4, 2, 5, 3
+
+
+class TestXoBenchmark(unittest.TestCase):
+    """Plays many xo games through the handler against a MockValidator
+    that keeps its own state, and logs the throughput.
+    """
+
+    def test_games(self):
+        players = XoMessageFactory(), XoMessageFactory()
+
+        # Each player's moves are built in bulk, then put back in the
+        # order they are played
+        moves = [], []
+        order = []
+        for i in range(GAMES):
+            game = 'game{}'.format(i)
+            moves[0].append(('create', game, None))
+            order.append(0)
+            for turn, space in enumerate(MOVES):
+                moves[turn % 2].append(('take', game, space))
+                order.append(turn % 2)
+
+        player_requests = [
+            iter(player.create_tp_process_requests(player_moves))
+            for player, player_moves in zip(players, moves)
+        ]
+        requests = [next(player_requests[player]) for player in order]
+
+        result = benchmark_handler(XoTransactionHandler(), requests)
+
+        LOGGER.warning('XO handler: %s', result)
+
+        self.assertEqual(
+            result.count(TpProcessResponse.OK), GAMES * (len(MOVES) + 1))
@@ -139,6 +139,56 @@ class MessageFactory:
         signature = self._create_signature(header.SerializeToString())
         return header, signature
 
+    def _create_transaction_headers(self, payloads, inputs, outputs, deps,
+                                    set_nonce=True, batcher_pub_key=None):
+        txn_pub_key = self._signer.get_public_key().as_hex()
+        if batcher_pub_key is None:
+            batcher_pub_key = txn_pub_key
+
+        # The fields shared by every header are serialized once. Fields
+        # are serialized in field number order, and the shared fields are
+        # interleaved with the others, so each header is assembled from
+        # the pieces in that order to give the same bytes as
+        # TransactionHeader.SerializeToString().
+        batcher_bytes = TransactionHeader(
+            batcher_public_key=batcher_pub_key).SerializeToString()
+        family_bytes = TransactionHeader(
+            family_name=self.family_name,
+            family_version=self.family_version).SerializeToString()
+        signer_bytes = TransactionHeader(
+            signer_public_key=txn_pub_key).SerializeToString()
+
+        if deps is None:
+            deps = [[]] * len(payloads)
+
+        headers = []
+        for payload, txn_inputs, txn_outputs, txn_deps in zip(
+                payloads, inputs, outputs, deps):
+            if set_nonce:
+                nonce = hex(random.randint(0, 2**64))
+            else:
+                nonce = ""
+            headers.append(b''.join([
+                batcher_bytes,
+                TransactionHeader(
+                    dependencies=txn_deps).SerializeToString(),
+                family_bytes,
+                TransactionHeader(
+                    inputs=txn_inputs,
+                    outputs=txn_outputs,
+                    payload_sha512=self.sha512(payload),
+                    nonce=nonce).SerializeToString(),
+                signer_bytes,
+            ]))
+        return headers
+
+    def _create_headers_and_sigs(self, payloads, inputs, outputs, deps,
+                                 set_nonce=True, batcher=None, workers=None):
+        headers = self._create_transaction_headers(
+            payloads, inputs, outputs, deps, set_nonce, batcher)
+        signatures = self._signer.sign_many(headers, workers)
+        return headers, signatures
+
     def create_transaction(self, payload, inputs, outputs, deps, batcher=None):
         header, signature = self._create_header_and_sig(
             payload, inputs, outputs, deps, batcher=batcher)
@@ -148,6 +198,25 @@ class MessageFactory:
             payload=payload,
             header_signature=signature)
 
+    def create_transactions(self, payloads, inputs, outputs, deps=None,
+                            batcher=None, workers=None):
+        """Create many transactions at once. The inputs, outputs and
+        dependencies are given as one list of addresses per payload, and
+        the headers are signed in parallel.
+        """
+        payloads = list(payloads)
+        headers, signatures = self._create_headers_and_sigs(
+            payloads, inputs, outputs, deps, batcher=batcher, workers=workers)
+
+        return [
+            Transaction(
+                header=header,
+                payload=payload,
+                header_signature=signature)
+            for header, payload, signature in zip(
+                headers, payloads, signatures)
+        ]
+
     @staticmethod
     def _validate_addresses(addresses):
         for a in addresses:
@@ -165,6 +234,21 @@ class MessageFactory:
             payload=payload,
             signature=signature)
 
+    def create_tp_process_requests(self, payloads, inputs, outputs, deps=None,
+                                   set_nonce=True, workers=None):
+        """Create many TpProcessRequests at once; see create_transactions.
+        """
+        payloads = list(payloads)
+        headers, signatures = self._create_headers_and_sigs(
+            payloads, inputs, outputs, deps, set_nonce, workers=workers)
+
+        requests = []
+        for header, payload, signature in zip(headers, payloads, signatures):
+            request = TpProcessRequest(payload=payload, signature=signature)
+            request.header.ParseFromString(header)
+            requests.append(request)
+        return requests
+
     def create_batch(self, transactions):
         # Transactions have a header_signature;
         # TpProcessRequests have a signature
@@ -0,0 +1,331 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import hashlib
+import logging
+import queue
+import re
+import threading
+import uuid
+
+import zmq
+
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import ClientBatchStatus
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 \
+    import ClientBatchStatusRequest
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 \
+    import ClientBatchSubmitRequest
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 \
+    import ClientBatchSubmitResponse
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 \
+    import ClientBatchStatusResponse
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsSubscribeRequest
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsSubscribeResponse
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsUnsubscribeRequest
+from sawtooth_sdk.protobuf.client_event_pb2 \
+    import ClientEventsUnsubscribeResponse
+from sawtooth_sdk.protobuf.client_list_control_pb2 \
+    import ClientPagingResponse
+from sawtooth_sdk.protobuf.client_state_pb2 import ClientStateGetRequest
+from sawtooth_sdk.protobuf.client_state_pb2 import ClientStateGetResponse
+from sawtooth_sdk.protobuf.client_state_pb2 import ClientStateListRequest
+from sawtooth_sdk.protobuf.client_state_pb2 import ClientStateListResponse
+from sawtooth_sdk.protobuf.events_pb2 import Event
+from sawtooth_sdk.protobuf.events_pb2 import EventFilter
+from sawtooth_sdk.protobuf.events_pb2 import EventList
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+LOGGER = logging.getLogger(__name__)
+
+BLOCK_COMMIT_EVENT = 'sawtooth/block-commit'
+
+# The page size of state listings that do not set a limit
+DEFAULT_PAGE_LIMIT = 100
+
+# How long the serving thread waits for requests before it looks for
+# blocks to publish
+_POLL_INTERVAL = 0.05
+
+
+class MockClientValidator:
+    """Plays the validator side of the client protocol, for testing
+    clients without a network.
+
+    The mock binds a ROUTER socket that a Stream can connect to and
+    answers client requests from a background thread. It keeps the batches
+    submitted and a status for each batch, serves reads of the `state`
+    dict, keeps the event subscriptions of each connection and publishes
+    blocks on request: commit_block() marks batches committed or invalid
+    and sends each subscriber the block-commit event and the events it
+    asked for.
+
+    Answers can be added or overridden per request type with
+    set_responder().
+    """
+
+    def __init__(self):
+        self._context = zmq.Context.instance()
+        self._socket = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._blocks = queue.Queue()
+
+        self.batches = []
+        self.batch_statuses = {}
+        self.state = {}
+        self.subscriptions = {}
+        self.block_num = 0
+        self.block_id = '0' * 128
+
+        self._responders = {
+            Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST: (
+                ClientEventsSubscribeRequest,
+                Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE,
+                self._respond_subscribe),
+            Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST: (
+                ClientEventsUnsubscribeRequest,
+                Message.CLIENT_EVENTS_UNSUBSCRIBE_RESPONSE,
+                self._respond_unsubscribe),
+            Message.CLIENT_BATCH_SUBMIT_REQUEST: (
+                ClientBatchSubmitRequest,
+                Message.CLIENT_BATCH_SUBMIT_RESPONSE,
+                self._respond_batch_submit),
+            Message.CLIENT_STATE_GET_REQUEST: (
+                ClientStateGetRequest,
+                Message.CLIENT_STATE_GET_RESPONSE,
+                self._respond_state_get),
+            Message.CLIENT_STATE_LIST_REQUEST: (
+                ClientStateListRequest,
+                Message.CLIENT_STATE_LIST_RESPONSE,
+                self._respond_state_list),
+            Message.CLIENT_BATCH_STATUS_REQUEST: (
+                ClientBatchStatusRequest,
+                Message.CLIENT_BATCH_STATUS_RESPONSE,
+                self._respond_batch_status),
+        }
+
+    def start(self, url='tcp://127.0.0.1:*'):
+        """Bind the validator socket, start answering requests and return
+        the endpoint to connect to.
+        """
+        self._socket = self._context.socket(zmq.ROUTER)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        self._socket.bind(url)
+        endpoint = self._socket.getsockopt_string(zmq.LAST_ENDPOINT)
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return endpoint
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def set_responder(self, request_type, request_class, response_type,
+                      responder):
+        """Answer a request type with `responder`, which is called with the
+        connection identity and the parsed request and returns the
+        response protobuf.
+        """
+        self._responders[request_type] = (
+            request_class, response_type, responder)
+
+    def submit(self, batch_ids):
+        """Mark batches as received and not yet committed."""
+        for batch_id in batch_ids:
+            self.batch_statuses[batch_id] = ClientBatchStatus.PENDING
+
+    def commit_block(self, batch_ids=(), events=(), invalid_batch_ids=()):
+        """Publish a block committing `batch_ids` and rejecting
+        `invalid_batch_ids`, with the given transaction events.
+
+        The block is published from the serving thread; the batch statuses
+        are updated before its events are sent.
+        """
+        self._blocks.put((list(batch_ids), list(events),
+                          list(invalid_batch_ids)))
+
+    def _serve(self):
+        while not self._stopped.is_set():
+            if self._socket.poll(int(_POLL_INTERVAL * 1000)):
+                self._answer(*self._socket.recv_multipart())
+
+            while True:
+                try:
+                    block = self._blocks.get_nowait()
+                except queue.Empty:
+                    break
+                self._publish(*block)
+
+        self._socket.close()
+        self._socket = None
+
+    def _answer(self, ident, content):
+        message = Message()
+        message.ParseFromString(content)
+
+        if message.message_type not in self._responders:
+            LOGGER.warning(
+                "Ignoring unexpected message of type %s",
+                Message.MessageType.Name(message.message_type))
+            return
+
+        request_class, response_type, responder = \
+            self._responders[message.message_type]
+        request = request_class()
+        request.ParseFromString(message.content)
+
+        response = responder(ident, request)
+        self._send(ident, response_type, response, message.correlation_id)
+
+    def _send(self, ident, message_type, content, correlation_id=None):
+        if correlation_id is None:
+            correlation_id = uuid.uuid4().hex
+        self._socket.send_multipart([
+            ident,
+            Message(
+                message_type=message_type,
+                correlation_id=correlation_id,
+                content=content.SerializeToString()).SerializeToString()])
+
+    def _publish(self, batch_ids, events, invalid_batch_ids):
+        for batch_id in batch_ids:
+            self.batch_statuses[batch_id] = ClientBatchStatus.COMMITTED
+        for batch_id in invalid_batch_ids:
+            self.batch_statuses[batch_id] = ClientBatchStatus.INVALID
+
+        previous_block_id = self.block_id
+        self.block_num += 1
+        self.block_id = hashlib.sha512(
+            previous_block_id.encode() + str(batch_ids).encode()).hexdigest()
+
+        block_commit = Event(
+            event_type=BLOCK_COMMIT_EVENT,
+            attributes=[
+                Event.Attribute(key='block_id', value=self.block_id),
+                Event.Attribute(key='block_num', value=str(self.block_num)),
+                Event.Attribute(key='state_root_hash', value=''),
+                Event.Attribute(
+                    key='previous_block_id', value=previous_block_id),
+            ])
+
+        for ident, subscriptions in self.subscriptions.items():
+            matching = [
+                event for event in [block_commit] + events
+                if any(_matches(subscription, event)
+                       for subscription in subscriptions)
+            ]
+            if matching:
+                self._send(
+                    ident, Message.CLIENT_EVENTS,
+                    EventList(events=matching))
+
+    def _respond_subscribe(self, ident, request):
+        self.subscriptions[ident] = list(request.subscriptions)
+        return ClientEventsSubscribeResponse(
+            status=ClientEventsSubscribeResponse.OK)
+
+    def _respond_unsubscribe(self, ident, request):
+        self.subscriptions.pop(ident, None)
+        return ClientEventsUnsubscribeResponse(
+            status=ClientEventsUnsubscribeResponse.OK)
+
+    def _respond_batch_submit(self, ident, request):
+        self.batches.extend(request.batches)
+        self.submit(batch.header_signature for batch in request.batches)
+        return ClientBatchSubmitResponse(
+            status=ClientBatchSubmitResponse.OK)
+
+    def _respond_state_get(self, ident, request):
+        if request.address not in self.state:
+            return ClientStateGetResponse(
+                status=ClientStateGetResponse.NO_RESOURCE)
+        return ClientStateGetResponse(
+            status=ClientStateGetResponse.OK,
+            value=self.state[request.address])
+
+    def _respond_state_list(self, ident, request):
+        addresses = sorted(
+            address for address in self.state
+            if address.startswith(request.address)
+            and address >= request.paging.start)
+        if not addresses:
+            return ClientStateListResponse(
+                status=ClientStateListResponse.NO_RESOURCE)
+
+        limit = request.paging.limit or DEFAULT_PAGE_LIMIT
+        page, rest = addresses[:limit], addresses[limit:]
+        return ClientStateListResponse(
+            status=ClientStateListResponse.OK,
+            entries=[
+                ClientStateListResponse.Entry(
+                    address=address, data=self.state[address])
+                for address in page
+            ],
+            paging=ClientPagingResponse(
+                start=request.paging.start,
+                limit=limit,
+                next=rest[0] if rest else ''))
+
+    def _respond_batch_status(self, ident, request):
+        return ClientBatchStatusResponse(
+            status=ClientBatchStatusResponse.OK,
+            batch_statuses=[
+                ClientBatchStatus(
+                    batch_id=batch_id,
+                    status=self.batch_statuses.get(
+                        batch_id, ClientBatchStatus.UNKNOWN))
+                for batch_id in request.batch_ids
+            ])
+
+
+def _matches(subscription, event):
+    if subscription.event_type != event.event_type:
+        return False
+
+    for event_filter in subscription.filters:
+        values = [
+            attribute.value for attribute in event.attributes
+            if attribute.key == event_filter.key
+        ]
+        if event_filter.filter_type in (EventFilter.REGEX_ANY,
+                                        EventFilter.REGEX_ALL):
+            pattern = re.compile(event_filter.match_string)
+            results = [pattern.search(value) is not None for value in values]
+        else:
+            results = [value == event_filter.match_string for value in values]
+
+        if event_filter.filter_type in (EventFilter.SIMPLE_ALL,
+                                        EventFilter.REGEX_ALL):
+            passed = bool(results) and all(results)
+        else:
+            passed = any(results)
+        if not passed:
+            return False
+
+    return True
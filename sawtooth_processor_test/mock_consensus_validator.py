@@ -0,0 +1,595 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+import zmq
+
+from sawtooth_sdk.protobuf import consensus_pb2
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10
+
+
+class MockConsensusValidatorError(Exception):
+    pass
+
+
+class ConsensusBenchmarkResult:
+    """Timings collected while streaming a synthetic chain to an engine.
+
+    Notification latencies are measured from the moment a notification is
+    sent until the driver acknowledges it. Commit latencies are measured
+    from the BLOCK_VALID notification of a block until the engine asks to
+    commit it, and are only collected for engines that call commit_block.
+    """
+
+    def __init__(self):
+        self.blocks = 0
+        self.elapsed = 0.0
+        self.notification_latencies = {}
+        self.commit_latencies = []
+
+    @property
+    def blocks_per_second(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.blocks / self.elapsed
+
+    def record_notification(self, message_type, latency):
+        self.notification_latencies.setdefault(
+            message_type, []).append(latency)
+
+    def latency_summary(self, message_type=None):
+        """Return (count, mean, max) of the recorded notification latencies.
+
+        Args:
+            message_type (int): Restrict the summary to one notification
+                type; all notifications are summarized if omitted.
+        """
+        if message_type is None:
+            latencies = [
+                latency
+                for values in self.notification_latencies.values()
+                for latency in values
+            ]
+        else:
+            latencies = self.notification_latencies.get(message_type, [])
+
+        if not latencies:
+            return 0, 0.0, 0.0
+
+        return (
+            len(latencies),
+            sum(latencies) / len(latencies),
+            max(latencies))
+
+    def __str__(self):
+        count, mean, maximum = self.latency_summary()
+        return (
+            '{} blocks in {:.3f}s ({:.1f} blocks/s), {} notifications, '
+            'ack latency mean {:.3f}ms max {:.3f}ms'.format(
+                self.blocks,
+                self.elapsed,
+                self.blocks_per_second,
+                count,
+                mean * 1000,
+                maximum * 1000))
+
+
+class MockConsensusValidator:
+    """Plays the validator side of the consensus engine protocol.
+
+    The mock binds a ROUTER socket that a ZmqDriver can connect to. It
+    answers the registration request, activates the engine, streams
+    notifications and answers every service request the engine sends
+    while it waits for acknowledgements. Blocks are kept in memory so
+    that chain head and block queries are answered consistently with the
+    notifications that were sent.
+
+    Service responses can be overridden per request type with
+    set_responder(), e.g. to make commit_block fail.
+    """
+
+    def __init__(self, settings=None, state=None, timeout=DEFAULT_TIMEOUT):
+        self._context = zmq.Context.instance()
+        self._socket = None
+        self._connection_id = None
+        self._timeout = timeout
+
+        self.settings = settings if settings is not None else {}
+        self.state = state if state is not None else {}
+
+        self.blocks = {}
+        self.chain_head = None
+        self.service_requests = []
+
+        self._valid_times = {}
+        self._commit_requests = {}
+
+        self._responders = {
+            Message.CONSENSUS_SEND_TO_REQUEST: (
+                Message.CONSENSUS_SEND_TO_RESPONSE,
+                self._respond_ok(consensus_pb2.ConsensusSendToResponse)),
+            Message.CONSENSUS_BROADCAST_REQUEST: (
+                Message.CONSENSUS_BROADCAST_RESPONSE,
+                self._respond_ok(consensus_pb2.ConsensusBroadcastResponse)),
+            Message.CONSENSUS_INITIALIZE_BLOCK_REQUEST: (
+                Message.CONSENSUS_INITIALIZE_BLOCK_RESPONSE,
+                self._respond_ok(
+                    consensus_pb2.ConsensusInitializeBlockResponse)),
+            Message.CONSENSUS_SUMMARIZE_BLOCK_REQUEST: (
+                Message.CONSENSUS_SUMMARIZE_BLOCK_RESPONSE,
+                self._respond_summarize_block),
+            Message.CONSENSUS_FINALIZE_BLOCK_REQUEST: (
+                Message.CONSENSUS_FINALIZE_BLOCK_RESPONSE,
+                self._respond_finalize_block),
+            Message.CONSENSUS_CANCEL_BLOCK_REQUEST: (
+                Message.CONSENSUS_CANCEL_BLOCK_RESPONSE,
+                self._respond_ok(consensus_pb2.ConsensusCancelBlockResponse)),
+            Message.CONSENSUS_CHECK_BLOCKS_REQUEST: (
+                Message.CONSENSUS_CHECK_BLOCKS_RESPONSE,
+                self._respond_check_blocks),
+            Message.CONSENSUS_COMMIT_BLOCK_REQUEST: (
+                Message.CONSENSUS_COMMIT_BLOCK_RESPONSE,
+                self._respond_commit_block),
+            Message.CONSENSUS_IGNORE_BLOCK_REQUEST: (
+                Message.CONSENSUS_IGNORE_BLOCK_RESPONSE,
+                self._respond_ok(consensus_pb2.ConsensusIgnoreBlockResponse)),
+            Message.CONSENSUS_FAIL_BLOCK_REQUEST: (
+                Message.CONSENSUS_FAIL_BLOCK_RESPONSE,
+                self._respond_ok(consensus_pb2.ConsensusFailBlockResponse)),
+            Message.CONSENSUS_BLOCKS_GET_REQUEST: (
+                Message.CONSENSUS_BLOCKS_GET_RESPONSE,
+                self._respond_blocks_get),
+            Message.CONSENSUS_CHAIN_HEAD_GET_REQUEST: (
+                Message.CONSENSUS_CHAIN_HEAD_GET_RESPONSE,
+                self._respond_chain_head_get),
+            Message.CONSENSUS_SETTINGS_GET_REQUEST: (
+                Message.CONSENSUS_SETTINGS_GET_RESPONSE,
+                self._respond_settings_get),
+            Message.CONSENSUS_STATE_GET_REQUEST: (
+                Message.CONSENSUS_STATE_GET_RESPONSE,
+                self._respond_state_get),
+        }
+
+    @property
+    def timeout(self):
+        """Seconds to wait for each message from the engine."""
+        return self._timeout
+
+    # -- Connection --
+
+    def listen(self, url='tcp://127.0.0.1:*'):
+        """Bind the validator socket and return the endpoint to connect to.
+        """
+        self._socket = self._context.socket(zmq.ROUTER)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        self._socket.bind(url)
+        return self._socket.getsockopt_string(zmq.LAST_ENDPOINT)
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def register(self, status=consensus_pb2.ConsensusRegisterResponse.OK):
+        """Wait for the engine's registration request and answer it.
+
+        The response carries no startup info, so the driver then waits for
+        the activation notification sent by activate().
+
+        Returns:
+            ConsensusRegisterRequest: The request sent by the driver.
+        """
+        message = self._receive()
+        if message.message_type != Message.CONSENSUS_REGISTER_REQUEST:
+            raise MockConsensusValidatorError(
+                'Expected register request, received message type {}'.format(
+                    message.message_type))
+
+        request = consensus_pb2.ConsensusRegisterRequest()
+        request.ParseFromString(message.content)
+
+        self._reply(
+            message,
+            Message.CONSENSUS_REGISTER_RESPONSE,
+            consensus_pb2.ConsensusRegisterResponse(status=status))
+
+        return request
+
+    def activate(self, chain_head=None, peers=None, local_peer_id=b'local'):
+        """Send the activation notification with the given startup state.
+
+        If no chain head is given, a genesis block is created.
+        """
+        if chain_head is None:
+            chain_head = self.create_block(
+                previous_id=b'\x00' * 32, block_num=0)
+        self.chain_head = chain_head
+
+        return self.notify(
+            Message.CONSENSUS_NOTIFY_ENGINE_ACTIVATED,
+            consensus_pb2.ConsensusNotifyEngineActivated(
+                chain_head=chain_head,
+                peers=[
+                    consensus_pb2.ConsensusPeerInfo(peer_id=peer_id)
+                    for peer_id in (peers or [])
+                ],
+                local_peer_info=consensus_pb2.ConsensusPeerInfo(
+                    peer_id=local_peer_id)))
+
+    def deactivate(self):
+        """Tell the driver to stop. No acknowledgement is waited for: the
+        driver closes its connection as soon as it is deactivated, so the
+        ack it sends back may never arrive, nor would the answer to a
+        request the engine still has in flight: answer those first with
+        process_requests(). To wait for the driver to stop, join its thread
+        while answering any later ones.
+        """
+        self._send(Message(
+            message_type=Message.CONSENSUS_NOTIFY_ENGINE_DEACTIVATED,
+            correlation_id=_generate_correlation_id(),
+            content=consensus_pb2.ConsensusNotifyEngineDeactivated()
+            .SerializeToString()))
+
+    # -- Notifications --
+
+    def notify(self, message_type, notification):
+        """Send a notification and wait for the driver's acknowledgement,
+        answering any service requests received in the meantime.
+
+        Returns:
+            float: Seconds elapsed between sending the notification and
+                receiving its acknowledgement.
+        """
+        correlation_id = _generate_correlation_id()
+        start = time.time()
+        self._send(Message(
+            message_type=message_type,
+            correlation_id=correlation_id,
+            content=notification.SerializeToString()))
+
+        while True:
+            message = self._receive()
+            if message.correlation_id == correlation_id:
+                if message.message_type != Message.CONSENSUS_NOTIFY_ACK:
+                    raise MockConsensusValidatorError(
+                        'Expected ack, received message type {}'.format(
+                            message.message_type))
+                return time.time() - start
+
+            self._answer(message)
+
+    def process_requests(self, timeout=0.1):
+        """Answer service requests until none arrive for `timeout` seconds.
+        """
+        while self._socket.poll(int(timeout * 1000)):
+            self._answer(self._receive())
+
+    def block_new(self, block):
+        self.blocks[block.block_id] = block
+        return self.notify(
+            Message.CONSENSUS_NOTIFY_BLOCK_NEW,
+            consensus_pb2.ConsensusNotifyBlockNew(block=block))
+
+    def block_valid(self, block_id):
+        self._valid_times[block_id] = time.time()
+        return self.notify(
+            Message.CONSENSUS_NOTIFY_BLOCK_VALID,
+            consensus_pb2.ConsensusNotifyBlockValid(block_id=block_id))
+
+    def block_invalid(self, block_id):
+        return self.notify(
+            Message.CONSENSUS_NOTIFY_BLOCK_INVALID,
+            consensus_pb2.ConsensusNotifyBlockInvalid(block_id=block_id))
+
+    def block_commit(self, block_id):
+        self.chain_head = self.blocks[block_id]
+        return self.notify(
+            Message.CONSENSUS_NOTIFY_BLOCK_COMMIT,
+            consensus_pb2.ConsensusNotifyBlockCommit(block_id=block_id))
+
+    # -- Synthetic chains --
+
+    def create_block(self, previous_id=None, block_num=None, payload=b'',
+                     signer_id=b'local'):
+        """Create a consensus block extending `previous_id`, which defaults
+        to the current chain head, and remember it.
+        """
+        if previous_id is None:
+            previous_id = self.chain_head.block_id
+        if block_num is None:
+            block_num = self.chain_head.block_num + 1
+
+        block_id = hashlib.sha256(
+            previous_id + str(block_num).encode() + payload).digest()
+
+        block = consensus_pb2.ConsensusBlock(
+            block_id=block_id,
+            previous_id=previous_id,
+            signer_id=signer_id,
+            block_num=block_num,
+            payload=payload,
+            summary=hashlib.sha256(payload).digest())
+
+        self.blocks[block_id] = block
+        return block
+
+    def create_chain(self, length, signer_id=b'local'):
+        """Create `length` blocks on top of the current chain head."""
+        chain = []
+        previous = self.chain_head
+        for _ in range(length):
+            previous = self.create_block(
+                previous_id=previous.block_id,
+                block_num=previous.block_num + 1,
+                signer_id=signer_id)
+            chain.append(previous)
+        return chain
+
+    def stream_blocks(self, blocks, wait_for_commit=False):
+        """Send BLOCK_NEW, BLOCK_VALID and BLOCK_COMMIT for each block.
+
+        Args:
+            blocks (list of ConsensusBlock): The blocks to send, in order.
+            wait_for_commit (bool): Wait for the engine to request a commit
+                of each block before notifying that it was committed, as a
+                real validator would.
+
+        Returns:
+            ConsensusBenchmarkResult: Throughput and latency figures.
+        """
+        result = ConsensusBenchmarkResult()
+        start = time.time()
+
+        for block in blocks:
+            result.record_notification(
+                Message.CONSENSUS_NOTIFY_BLOCK_NEW,
+                self.block_new(block))
+            result.record_notification(
+                Message.CONSENSUS_NOTIFY_BLOCK_VALID,
+                self.block_valid(block.block_id))
+
+            if wait_for_commit:
+                self._wait_for_commit_request(block.block_id)
+
+            result.record_notification(
+                Message.CONSENSUS_NOTIFY_BLOCK_COMMIT,
+                self.block_commit(block.block_id))
+            result.blocks += 1
+
+        result.elapsed = time.time() - start
+
+        for block in blocks:
+            if block.block_id in self._commit_requests:
+                result.commit_latencies.append(
+                    self._commit_requests[block.block_id]
+                    - self._valid_times[block.block_id])
+
+        return result
+
+    def set_responder(self, request_type, response_type, responder):
+        """Override how a service request is answered.
+
+        Args:
+            request_type (int): The request message type.
+            response_type (int): The response message type.
+            responder (callable): Called with the raw request content; must
+                return the response protobuf.
+        """
+        self._responders[request_type] = (response_type, responder)
+
+    # -- Internals --
+
+    def _wait_for_commit_request(self, block_id):
+        deadline = time.time() + self._timeout
+        while block_id not in self._commit_requests:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not self._socket.poll(int(remaining * 1000)):
+                raise MockConsensusValidatorError(
+                    'Engine did not commit block {}'.format(block_id.hex()))
+            self._answer(self._receive())
+
+    def _answer(self, message):
+        if message.message_type not in self._responders:
+            raise MockConsensusValidatorError(
+                'Unexpected message type {}'.format(message.message_type))
+
+        response_type, responder = self._responders[message.message_type]
+
+        self.service_requests.append(message.message_type)
+        self._reply(message, response_type, responder(message.content))
+
+    def _send(self, message):
+        if self._connection_id is None:
+            raise MockConsensusValidatorError('No engine has connected')
+        self._socket.send_multipart(
+            [self._connection_id, message.SerializeToString()])
+
+    def _reply(self, request, message_type, response):
+        self._send(Message(
+            message_type=message_type,
+            correlation_id=request.correlation_id,
+            content=response.SerializeToString()))
+
+    def _receive(self):
+        if not self._socket.poll(int(self._timeout * 1000)):
+            raise MockConsensusValidatorError(
+                'Timed out waiting for a message from the engine')
+
+        # pylint: disable=unbalanced-tuple-unpacking
+        connection_id, message_bytes = self._socket.recv_multipart()
+        self._connection_id = connection_id
+
+        message = Message()
+        message.ParseFromString(message_bytes)
+        return message
+
+    @staticmethod
+    def _respond_ok(response_type):
+        def responder(_content):
+            return response_type(status=response_type.OK)
+        return responder
+
+    def _respond_summarize_block(self, _content):
+        response_type = consensus_pb2.ConsensusSummarizeBlockResponse
+        return response_type(
+            status=response_type.OK,
+            summary=hashlib.sha256(self.chain_head.block_id).digest())
+
+    def _respond_finalize_block(self, content):
+        request = consensus_pb2.ConsensusFinalizeBlockRequest()
+        request.ParseFromString(content)
+
+        block = self.create_block(payload=request.data)
+
+        response_type = consensus_pb2.ConsensusFinalizeBlockResponse
+        return response_type(status=response_type.OK, block_id=block.block_id)
+
+    def _respond_check_blocks(self, content):
+        request = consensus_pb2.ConsensusCheckBlocksRequest()
+        request.ParseFromString(content)
+
+        response_type = consensus_pb2.ConsensusCheckBlocksResponse
+        if any(block_id not in self.blocks for block_id in request.block_ids):
+            return response_type(status=response_type.UNKNOWN_BLOCK)
+        return response_type(status=response_type.OK)
+
+    def _respond_commit_block(self, content):
+        request = consensus_pb2.ConsensusCommitBlockRequest()
+        request.ParseFromString(content)
+
+        response_type = consensus_pb2.ConsensusCommitBlockResponse
+        if request.block_id not in self.blocks:
+            return response_type(status=response_type.UNKNOWN_BLOCK)
+
+        self._commit_requests.setdefault(request.block_id, time.time())
+        return response_type(status=response_type.OK)
+
+    def _respond_blocks_get(self, content):
+        request = consensus_pb2.ConsensusBlocksGetRequest()
+        request.ParseFromString(content)
+
+        response_type = consensus_pb2.ConsensusBlocksGetResponse
+        if any(block_id not in self.blocks for block_id in request.block_ids):
+            return response_type(status=response_type.UNKNOWN_BLOCK)
+
+        return response_type(
+            status=response_type.OK,
+            blocks=[self.blocks[block_id] for block_id in request.block_ids])
+
+    def _respond_chain_head_get(self, _content):
+        response_type = consensus_pb2.ConsensusChainHeadGetResponse
+        if self.chain_head is None:
+            return response_type(status=response_type.NO_CHAIN_HEAD)
+        return response_type(status=response_type.OK, block=self.chain_head)
+
+    def _respond_settings_get(self, content):
+        request = consensus_pb2.ConsensusSettingsGetRequest()
+        request.ParseFromString(content)
+
+        response_type = consensus_pb2.ConsensusSettingsGetResponse
+        return response_type(
+            status=response_type.OK,
+            entries=[
+                consensus_pb2.ConsensusSettingsEntry(
+                    key=key, value=self.settings[key])
+                for key in request.keys
+                if key in self.settings
+            ])
+
+    def _respond_state_get(self, content):
+        request = consensus_pb2.ConsensusStateGetRequest()
+        request.ParseFromString(content)
+
+        response_type = consensus_pb2.ConsensusStateGetResponse
+        return response_type(
+            status=response_type.OK,
+            entries=[
+                consensus_pb2.ConsensusStateEntry(
+                    address=address, data=self.state[address])
+                for address in request.addresses
+                if address in self.state
+            ])
+
+
+def benchmark_engine(engine, num_blocks, wait_for_commit=False,
+                     driver_class=None):
+    """Run `engine` through a driver against a MockConsensusValidator and
+    stream a synthetic chain of `num_blocks` blocks to it.
+
+    Args:
+        engine (Engine): The engine under test.
+        num_blocks (int): The length of the synthetic chain.
+        wait_for_commit (bool): See MockConsensusValidator.stream_blocks.
+        driver_class: The driver to run the engine with; ZmqDriver by
+            default.
+
+    Returns:
+        ConsensusBenchmarkResult: Throughput and latency figures.
+    """
+    if driver_class is None:
+        # Imported here so the mock can be used without loading the driver
+        # pylint: disable=import-outside-toplevel
+        from sawtooth_sdk.consensus.zmq_driver import ZmqDriver
+        driver_class = ZmqDriver
+
+    validator = MockConsensusValidator()
+    url = validator.listen()
+    driver = driver_class(engine)
+
+    driver_thread = threading.Thread(target=driver.start, args=(url,))
+    driver_thread.start()
+
+    try:
+        validator.register()
+        validator.activate()
+        result = validator.stream_blocks(
+            validator.create_chain(num_blocks),
+            wait_for_commit=wait_for_commit)
+        # The driver closes its connection once deactivated, so a request
+        # the engine still had in flight would go unanswered and block it:
+        # the engine's last requests are answered first
+        validator.process_requests()
+        validator.deactivate()
+        deadline = time.time() + validator.timeout
+        while driver_thread.is_alive() and time.time() < deadline:
+            validator.process_requests()
+    finally:
+        if driver_thread.is_alive():
+            driver.stop()
+            driver_thread.join(validator.timeout)
+        validator.close()
+
+    if driver_thread.is_alive():
+        raise MockConsensusValidatorError(
+            'Driver did not stop within {} seconds'.format(
+                validator.timeout))
+
+    LOGGER.info('Engine %s: %s', engine.name(), result)
+
+    return result
+
+
+def _generate_correlation_id():
+    return uuid.uuid4().hex
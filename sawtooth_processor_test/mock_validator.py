@@ -15,14 +15,33 @@
 
 import asyncio
 import binascii
+from collections import namedtuple
+from collections import OrderedDict
 import logging
 import subprocess
+import threading
+import time
+import uuid
 
 import zmq
 import zmq.asyncio
 
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
 from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterRequest
 from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpEventAddRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpEventAddResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpReceiptAddDataRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpReceiptAddDataResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateDeleteRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateDeleteResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateEntry
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateGetRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateGetResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateSetRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateSetResponse
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 from sawtooth_sdk.protobuf.validator_pb2 import Message
 
 from sawtooth_processor_test.message_types import to_protobuf_class
@@ -48,10 +67,112 @@ class UnexpectedMessageException(Exception):
         self.received = received
 
 
+# Ways of spreading transactions over registered processors
+ROUND_ROBIN = 'round-robin'
+BY_FAMILY = 'by-family'
+
+ProcessOutcome = namedtuple(
+    'ProcessOutcome',
+    ['signature', 'status', 'message', 'extended_data', 'latency',
+     'processor'])
+
+ProcessorStats = namedtuple(
+    'ProcessorStats',
+    ['transactions', 'transactions_per_second', 'mean_latency',
+     'max_latency'])
+
+
+class ProcessingResult:
+    """The outcomes of a stream of TP_PROCESS_REQUESTs driven by
+    MockValidator.process(), in request order.
+    """
+
+    def __init__(self, outcomes, elapsed):
+        self.outcomes = outcomes
+        self.elapsed = elapsed
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    @property
+    def transactions_per_second(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return len(self.outcomes) / self.elapsed
+
+    def count(self, status):
+        return sum(1 for outcome in self.outcomes if outcome.status == status)
+
+    def processor_stats(self):
+        """Return the throughput and latency of each processor.
+
+        Returns:
+            OrderedDict: ProcessorStats by processor zmq identity, in the
+                order the processors first answered
+        """
+        latencies = OrderedDict()
+        for outcome in self.outcomes:
+            latencies.setdefault(outcome.processor, []).append(
+                outcome.latency)
+
+        stats = OrderedDict()
+        for processor, processor_latencies in latencies.items():
+            count = len(processor_latencies)
+            stats[processor] = ProcessorStats(
+                transactions=count,
+                transactions_per_second=(
+                    count / self.elapsed if self.elapsed > 0 else 0.0),
+                mean_latency=sum(processor_latencies) / count,
+                max_latency=max(processor_latencies))
+        return stats
+
+    def __str__(self):
+        return '{} transactions in {:.3f}s ({:.1f} tps, {} ok, {} invalid, ' \
+            '{} internal errors)'.format(
+                len(self.outcomes),
+                self.elapsed,
+                self.transactions_per_second,
+                self.count(TpProcessResponse.OK),
+                self.count(TpProcessResponse.INVALID_TRANSACTION),
+                self.count(TpProcessResponse.INTERNAL_ERROR))
+
+
+class _TransactionContext:
+    def __init__(self, signature, header):
+        self.signature = signature
+        self.inputs = list(header.inputs)
+        self.outputs = list(header.outputs)
+        # address -> data, or None for a deletion
+        self.changes = {}
+        self.events = []
+        self.receipt_data = []
+
+
+class _Processor:
+    def __init__(self, ident):
+        self.ident = ident
+        # (family name, family version) pairs
+        self.families = set()
+        # correlation id -> (request index, context id, time sent)
+        self.pending = {}
+
+
 class MockValidator:
-    def __init__(self):
+    def __init__(self, state=None):
+        """
+        Args:
+            state (dict): if given, the validator keeps state itself and
+                answers state, event and receipt requests from processors
+                automatically (see process()); addresses map to bytes
+        """
         self._comparators = {}
 
+        # Self-answering state
+        self.state = state
+        self.events = []
+        self.receipts = {}
+        self._contexts = {}
+
         # ZMQ connection
         self._url = None
         self._context = None
@@ -60,8 +181,11 @@ class MockValidator:
         # asyncio
         self._loop = None
 
-        # Transaction processor
+        # Transaction processors, by zmq identity. The first one to
+        # register is the target of send().
         self._tp_ident = None
+        self._processors = OrderedDict()
+        self._next_processor = 0
 
         # The set request comparison is a little more complex by default
         self.register_comparator(Message.TP_STATE_SET_REQUEST,
@@ -115,6 +239,8 @@ class MockValidator:
             # Raise the original error again
             raise
 
+        return self._socket.getsockopt_string(zmq.LAST_ENDPOINT)
+
     def close(self):
         """
         Closes the connection to the processor. Must be called at the end of
@@ -124,15 +250,31 @@ class MockValidator:
         self._context.term()
         self._loop.close()
 
+    @property
+    def processors(self):
+        """The zmq identities of the registered processors."""
+        return list(self._processors)
+
     def register_processor(self):
+        """Accept one TP_REGISTER_REQUEST. A processor with several
+        handlers sends one request per handler, and several processors may
+        register.
+        """
         message, ident = self.receive()
         if message.message_type != Message.TP_REGISTER_REQUEST:
             return False
 
-        self._tp_ident = ident
+        if self._tp_ident is None:
+            self._tp_ident = ident
 
         request = TpRegisterRequest()
         request.ParseFromString(message.content)
+
+        if ident not in self._processors:
+            self._processors[ident] = _Processor(ident)
+        self._processors[ident].families.add(
+            (request.family, request.version))
+
         LOGGER.debug(
             "Processor registered: %s, %s, %s",
             str(request.family), str(request.version),
@@ -141,7 +283,10 @@ class MockValidator:
         response = TpRegisterResponse(
             status=TpRegisterResponse.OK,
             protocol_version=request.protocol_version)
-        self.send(response, message.correlation_id)
+        self._loop.run_until_complete(self._send(ident, Message(
+            message_type=Message.TP_REGISTER_RESPONSE,
+            correlation_id=message.correlation_id,
+            content=response.SerializeToString())))
         return True
 
     def send(self, message_content, correlation_id=None):
@@ -267,6 +412,253 @@ class MockValidator:
         """
         return self.send(message_content, message.correlation_id)
 
+    def process(self, requests, max_pending=1, routing=ROUND_ROBIN,
+                send_times=None):
+        """
+        Send each TpProcessRequest to the registered processors as fast as
+        they answer and record the outcome. The validator must have been
+        created with a state dict; state, event and receipt requests
+        received meanwhile are answered from it, and the changes made by a
+        transaction are only applied if it is valid.
+
+        Requests in flight at the same time are not checked for conflicts,
+        so with more than one in flight they should not share addresses.
+
+        Args:
+            requests (iterable of TpProcessRequest): the requests, whose
+                context ids are replaced with unique ones
+            max_pending (int): the number of requests in flight at once on
+                each processor
+            routing (str): ROUND_ROBIN to rotate over all processors, or
+                BY_FAMILY to rotate over the processors registered for the
+                transaction's family and version
+            send_times (list of float): if given, each request is sent no
+                earlier than this many seconds after the first
+
+        Returns:
+            ProcessingResult: one outcome per request, in request order
+
+        Raises:
+            ValueError: if no processor is registered for a transaction
+        """
+        if self.state is None:
+            raise ValueError('MockValidator was created without state')
+        if not self._processors:
+            raise ValueError('No processor is registered')
+        if routing not in (ROUND_ROBIN, BY_FAMILY):
+            raise ValueError('Unknown routing: {}'.format(routing))
+
+        requests = [
+            (request, _transaction_header(request)) for request in requests
+        ]
+
+        return self._loop.run_until_complete(
+            self._process(requests, max_pending, routing, send_times))
+
+    async def _process(self, requests, max_pending, routing, send_times):
+        outcomes = [None] * len(requests)
+        next_index = 0
+
+        def until_due():
+            if send_times is None or next_index == len(requests):
+                return 0
+            return start + send_times[next_index] - time.time()
+
+        start = time.time()
+        while next_index < len(requests) or self._pending():
+            while next_index < len(requests) and until_due() <= 0:
+                request, header = requests[next_index]
+                processor = self._route(header, routing, max_pending)
+                if processor is None:
+                    break
+
+                correlation_id = uuid.uuid4().hex
+                sent = time.time()
+                context_id = await self._send_process_request(
+                    processor.ident, request, header, correlation_id)
+                processor.pending[correlation_id] = (
+                    next_index, context_id, sent)
+                next_index += 1
+
+            # Keep answering the processors until the next request is due
+            wait = until_due()
+            if wait > 0 and not await self._socket.poll(int(wait * 1000) + 1):
+                continue
+
+            ident, result = await self._socket.recv_multipart()
+            message = Message()
+            message.ParseFromString(result)
+
+            if message.message_type == Message.TP_PROCESS_RESPONSE:
+                pending = self._processors[ident].pending
+                if message.correlation_id not in pending:
+                    LOGGER.warning(
+                        "Ignoring response to unknown request %s from %s",
+                        message.correlation_id, ident)
+                    continue
+                index, context_id, sent = pending.pop(message.correlation_id)
+                outcomes[index] = self._finish(
+                    ident, context_id, message, sent)
+            else:
+                await self._answer(ident, message)
+
+        return ProcessingResult(outcomes, time.time() - start)
+
+    def _pending(self):
+        return any(
+            processor.pending for processor in self._processors.values())
+
+    def _route(self, header, routing, max_pending):
+        """Return the next processor in rotation that may take the
+        transaction and has room for it, or None if all are busy.
+        """
+        processors = list(self._processors.values())
+        if routing == BY_FAMILY:
+            family = (header.family_name, header.family_version)
+            processors = [
+                processor for processor in processors
+                if family in processor.families
+            ]
+            if not processors:
+                raise ValueError(
+                    'No processor is registered for {} {}'.format(*family))
+
+        for offset in range(len(processors)):
+            processor = processors[
+                (self._next_processor + offset) % len(processors)]
+            if len(processor.pending) < max_pending:
+                self._next_processor = \
+                    (self._next_processor + offset + 1) % len(processors)
+                return processor
+
+        return None
+
+    async def _send_process_request(self, ident, request, header,
+                                    correlation_id):
+        context_id = uuid.uuid4().hex
+        self._contexts[context_id] = _TransactionContext(
+            request.signature, header)
+
+        request_with_context = TpProcessRequest()
+        request_with_context.CopyFrom(request)
+        request_with_context.context_id = context_id
+
+        await self._send(ident, Message(
+            message_type=Message.TP_PROCESS_REQUEST,
+            correlation_id=correlation_id,
+            content=request_with_context.SerializeToString()))
+
+        return context_id
+
+    def _finish(self, ident, context_id, message, sent):
+        response = TpProcessResponse()
+        response.ParseFromString(message.content)
+
+        context = self._contexts.pop(context_id)
+        if response.status == TpProcessResponse.OK:
+            for address, data in context.changes.items():
+                if data is None:
+                    self.state.pop(address, None)
+                else:
+                    self.state[address] = data
+            self.events.extend(context.events)
+            self.receipts[context.signature] = context.receipt_data
+
+        return ProcessOutcome(
+            signature=context.signature,
+            status=response.status,
+            message=response.message,
+            extended_data=response.extended_data,
+            latency=time.time() - sent,
+            processor=ident)
+
+    async def _answer(self, ident, message):
+        answers = {
+            Message.TP_STATE_GET_REQUEST: (
+                TpStateGetRequest, self._answer_get),
+            Message.TP_STATE_SET_REQUEST: (
+                TpStateSetRequest, self._answer_set),
+            Message.TP_STATE_DELETE_REQUEST: (
+                TpStateDeleteRequest, self._answer_delete),
+            Message.TP_EVENT_ADD_REQUEST: (
+                TpEventAddRequest, self._answer_event_add),
+            Message.TP_RECEIPT_ADD_DATA_REQUEST: (
+                TpReceiptAddDataRequest, self._answer_receipt_add_data),
+        }
+
+        if message.message_type not in answers:
+            LOGGER.warning(
+                "Ignoring unexpected message of type %s",
+                Message.MessageType.Name(message.message_type))
+            return
+
+        request_class, answer = answers[message.message_type]
+        request = request_class()
+        request.ParseFromString(message.content)
+
+        response = answer(self._contexts[request.context_id], request)
+
+        await self._send(ident, Message(
+            message_type=to_message_type(response),
+            correlation_id=message.correlation_id,
+            content=response.SerializeToString()))
+
+    def _answer_get(self, context, request):
+        if not _authorized(request.addresses, context.inputs):
+            return TpStateGetResponse(
+                status=TpStateGetResponse.AUTHORIZATION_ERROR)
+
+        entries = []
+        for address in request.addresses:
+            if address in context.changes:
+                data = context.changes[address]
+            else:
+                data = self.state.get(address)
+            entries.append(TpStateEntry(address=address, data=data or b''))
+
+        return TpStateGetResponse(
+            status=TpStateGetResponse.OK, entries=entries)
+
+    def _answer_set(self, context, request):
+        addresses = [entry.address for entry in request.entries]
+        if not _authorized(addresses, context.outputs):
+            return TpStateSetResponse(
+                status=TpStateSetResponse.AUTHORIZATION_ERROR)
+
+        for entry in request.entries:
+            context.changes[entry.address] = entry.data
+
+        return TpStateSetResponse(
+            status=TpStateSetResponse.OK, addresses=addresses)
+
+    def _answer_delete(self, context, request):
+        if not _authorized(request.addresses, context.outputs):
+            return TpStateDeleteResponse(
+                status=TpStateDeleteResponse.AUTHORIZATION_ERROR)
+
+        deleted = []
+        for address in request.addresses:
+            if address in context.changes:
+                exists = context.changes[address] is not None
+            else:
+                exists = address in self.state
+            if exists:
+                deleted.append(address)
+            context.changes[address] = None
+
+        return TpStateDeleteResponse(
+            status=TpStateDeleteResponse.OK, addresses=deleted)
+
+    @staticmethod
+    def _answer_event_add(context, request):
+        context.events.append(request.event)
+        return TpEventAddResponse(status=TpEventAddResponse.OK)
+
+    @staticmethod
+    def _answer_receipt_add_data(context, request):
+        context.receipt_data.append(request.data)
+        return TpReceiptAddDataResponse(status=TpReceiptAddDataResponse.OK)
+
     def register_comparator(self, message_type, comparator):
         self._comparators[message_type] = comparator
 
@@ -283,6 +675,79 @@ class MockValidator:
         return obj1 == obj2
 
 
+def benchmark_handler(handler, requests, state=None, max_pending=1,
+                      processor_class=None, processors=1,
+                      routing=ROUND_ROBIN, send_times=None):
+    """Run `handler` in transaction processors against a MockValidator
+    that keeps its own state, and process `requests` as fast as possible.
+
+    Args:
+        handler (TransactionHandler): The handler under test.
+        requests (iterable of TpProcessRequest): The transactions to apply.
+        state (dict): The initial state; empty by default. It holds the
+            resulting state afterwards.
+        max_pending (int): See MockValidator.process.
+        processor_class: The processor to run the handler in;
+            TransactionProcessor by default.
+        processors (int): The number of processors to run, each in its
+            own thread.
+        routing (str): See MockValidator.process.
+        send_times (list of float): See MockValidator.process.
+
+    Returns:
+        ProcessingResult: The outcome of every request and the throughput.
+    """
+    if processor_class is None:
+        # Imported here so the mock can be used without loading the SDK core
+        # pylint: disable=import-outside-toplevel
+        from sawtooth_sdk.processor.core import TransactionProcessor
+        processor_class = TransactionProcessor
+
+    validator = MockValidator(state={} if state is None else state)
+    url = validator.listen('tcp://127.0.0.1:*')
+
+    running = []
+    for _ in range(processors):
+        processor = processor_class(url=url)
+        processor.add_handler(handler)
+        # The processor blocks on its stream until the stream is closed
+        threading.Thread(target=processor.start, daemon=True).start()
+        running.append(processor)
+
+    try:
+        for _ in range(processors):
+            if not validator.register_processor():
+                raise RuntimeError('Failed to register processor')
+        result = validator.process(
+            requests,
+            max_pending=max_pending,
+            routing=routing,
+            send_times=send_times)
+    finally:
+        for processor in running:
+            processor.stop()
+        validator.close()
+
+    LOGGER.info('Handler %s: %s', handler.family_name, result)
+
+    return result
+
+
+def _transaction_header(request):
+    if request.HasField('header'):
+        return request.header
+
+    header = TransactionHeader()
+    header.ParseFromString(request.header_bytes)
+    return header
+
+
+def _authorized(addresses, prefixes):
+    return all(
+        any(address.startswith(prefix) for prefix in prefixes)
+        for address in addresses)
+
+
 def compare_set_request(req1, req2):
     if len(req1.entries) != len(req2.entries):
         return False
@@ -0,0 +1,242 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""Replays transaction processor traffic recorded with TrafficRecorder.
+
+The recorded TP_PROCESS_REQUESTs are fed to a handler running in a
+TransactionProcessor against a MockValidator that keeps its own state. The
+state is seeded with the value of each address as first read in the
+recording, so handlers see the state they saw when the traffic was
+recorded.
+
+    python -m sawtooth_processor_test.replay traffic.log \\
+        sawtooth_intkey.processor.handler:IntkeyTransactionHandler
+"""
+
+import argparse
+import importlib
+import logging
+import sys
+
+from sawtooth_sdk.messaging.recorder import INBOUND
+from sawtooth_sdk.messaging.recorder import OUTBOUND
+from sawtooth_sdk.messaging.recorder import read_traffic
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateDeleteRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateGetResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateSetRequest
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+from sawtooth_processor_test.mock_validator import benchmark_handler
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Recording:
+    """The transactions in a traffic log and the state they started from.
+
+    Attributes:
+        requests (list of TpProcessRequest): the requests, in the order
+            received
+        send_times (list of float): the time each request was received, in
+            seconds after the first
+        statuses (list of int): the TpProcessResponse status recorded for
+            each request, or None if the response was not recorded
+        state (dict): the initial value of each address read
+    """
+
+    def __init__(self, requests, send_times, statuses, state):
+        self.requests = requests
+        self.send_times = send_times
+        self.statuses = statuses
+        self.state = state
+
+    @classmethod
+    def load(cls, path):
+        """Read a traffic log written by TrafficRecorder.
+
+        Raises:
+            TrafficLogError: if the file is not a valid traffic log
+        """
+        requests = []
+        send_times = []
+        statuses = []
+        state = {}
+
+        request_indexes = {}
+        # Addresses whose initial value is known, or that were written
+        # before being read
+        seen = set()
+        start = None
+
+        for record in read_traffic(path):
+            message = record.message
+            message_type = message.message_type
+
+            if message_type == Message.TP_PROCESS_REQUEST \
+                    and record.direction == INBOUND:
+                request = TpProcessRequest()
+                request.ParseFromString(message.content)
+                if start is None:
+                    start = record.timestamp
+                request_indexes[message.correlation_id] = len(requests)
+                requests.append(request)
+                send_times.append(record.timestamp - start)
+                statuses.append(None)
+
+            elif message_type == Message.TP_PROCESS_RESPONSE \
+                    and record.direction == OUTBOUND:
+                index = request_indexes.pop(message.correlation_id, None)
+                if index is not None:
+                    response = TpProcessResponse()
+                    response.ParseFromString(message.content)
+                    statuses[index] = response.status
+
+            elif message_type == Message.TP_STATE_GET_RESPONSE:
+                response = TpStateGetResponse()
+                response.ParseFromString(message.content)
+                for entry in response.entries:
+                    if entry.address not in seen and entry.data:
+                        state[entry.address] = entry.data
+                    seen.add(entry.address)
+
+            elif message_type == Message.TP_STATE_SET_REQUEST:
+                request = TpStateSetRequest()
+                request.ParseFromString(message.content)
+                seen.update(entry.address for entry in request.entries)
+
+            elif message_type == Message.TP_STATE_DELETE_REQUEST:
+                request = TpStateDeleteRequest()
+                request.ParseFromString(message.content)
+                seen.update(request.addresses)
+
+        return cls(requests, send_times, statuses, state)
+
+    def __len__(self):
+        return len(self.requests)
+
+    def compare(self, result):
+        """Compare the outcomes of a replay with the recorded ones.
+
+        Args:
+            result (ProcessingResult): the result of replay()
+
+        Returns:
+            list of tuple: (index, recorded status, replayed status) for
+                each request whose status differs
+        """
+        return [
+            (index, recorded, outcome.status)
+            for index, (recorded, outcome) in enumerate(
+                zip(self.statuses, result.outcomes))
+            if recorded is not None and recorded != outcome.status
+        ]
+
+
+def replay(handler, recording, recorded_timing=False, speed=1.0,
+           processor_class=None, processors=1):
+    """Feed a recording to a handler.
+
+    Args:
+        handler (TransactionHandler): the handler to replay against
+        recording (Recording): the recorded traffic
+        recorded_timing (bool): send the requests with the recorded
+            spacing rather than as fast as the handler answers
+        speed (float): with recorded_timing, how many times faster than
+            recorded to send the requests
+        processor_class: see benchmark_handler
+        processors (int): see benchmark_handler
+
+    Returns:
+        ProcessingResult: the outcome of each request
+    """
+    send_times = None
+    if recorded_timing:
+        send_times = [send_time / speed for send_time in recording.send_times]
+
+    return benchmark_handler(
+        handler,
+        recording.requests,
+        state=dict(recording.state),
+        processor_class=processor_class,
+        processors=processors,
+        send_times=send_times)
+
+
+def load_handler(path):
+    """Create a handler from its 'module.path:ClassName'."""
+    module_name, _, class_name = path.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        description='Replay recorded transaction processor traffic')
+
+    parser.add_argument(
+        'traffic_log',
+        help='the file written by the recording transaction processor')
+
+    parser.add_argument(
+        'handler',
+        help='the handler to replay against, as module.path:ClassName')
+
+    parser.add_argument(
+        '--recorded-timing',
+        action='store_true',
+        help='send transactions with the recorded spacing instead of as '
+             'fast as possible')
+
+    parser.add_argument(
+        '--speed',
+        type=float,
+        default=1.0,
+        help='with --recorded-timing, the speed-up over the recording')
+
+    parser.add_argument(
+        '--processors',
+        type=int,
+        default=1,
+        help='the number of processors to run the handler in')
+
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    opts = parse_args(args)
+
+    recording = Recording.load(opts.traffic_log)
+    result = replay(
+        load_handler(opts.handler),
+        recording,
+        recorded_timing=opts.recorded_timing,
+        speed=opts.speed,
+        processors=opts.processors)
+
+    print(result)
+    for index, recorded, replayed in recording.compare(result):
+        print('transaction {} ({}): recorded {}, replayed {}'.format(
+            index,
+            recording.requests[index].signature[:16],
+            TpProcessResponse.Status.Name(recorded),
+            TpProcessResponse.Status.Name(replayed)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+'''The client module defines:
+
+1. A RestClient, and its asyncio counterpart, which send requests to the
+REST API over a pooled, persistent session.
+
+2. A ZmqClient, which submits batches and reads state by talking to the
+validator's client endpoint directly, rather than through the REST API.
+'''
+
+__all__ = [
+    'exceptions',
+    'rest_client',
+    'zmq_client'
+]
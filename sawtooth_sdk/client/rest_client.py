@@ -0,0 +1,174 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import asyncio
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from sawtooth_sdk.client import exceptions
+
+
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.2
+DEFAULT_POOL_SIZE = 10
+
+# Gateway errors are retried, as the REST API or the validator behind it
+# may be restarting
+RETRY_STATUSES = (502, 503, 504)
+
+
+class RestClient:
+    """Sends requests to the REST API over a persistent session.
+
+    Connections are pooled and kept alive between requests. Connection
+    failures are retried, and so are gateway errors of requests that are
+    safe to repeat, with an exponential backoff.
+    """
+
+    def __init__(self, base_url, retries=DEFAULT_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 pool_size=DEFAULT_POOL_SIZE, timeout=None):
+        """
+        Args:
+            base_url (str): the REST API URL, with or without the http://
+                scheme
+            retries (int): the number of times a failed request is retried
+            backoff_factor (float): the base of the delay between retries,
+                in seconds
+            pool_size (int): the number of connections kept open
+            timeout (float): seconds to wait for each response, or None to
+                wait indefinitely
+        """
+        if base_url.startswith(('http://', 'https://')):
+            self._base_url = base_url.rstrip('/')
+        else:
+            self._base_url = 'http://{}'.format(base_url.rstrip('/'))
+        self._timeout = timeout
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+                raise_on_status=False))
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    @property
+    def base_url(self):
+        return self._base_url
+
+    def close(self):
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def request(self, path, data=None, content_type=None, auth_user=None,
+                auth_password=None):
+        """Send a request, a POST if `data` is given and a GET otherwise,
+        and return the response.
+
+        Raises:
+            RestApiError: if the response has an error status
+            RestApiUnavailable: if the REST API could not be reached
+        """
+        url = '{}/{}'.format(self._base_url, path)
+
+        headers = {}
+        if auth_user is not None:
+            headers['Authorization'] = _basic_auth(auth_user, auth_password)
+
+        if content_type is not None:
+            headers['Content-Type'] = content_type
+
+        try:
+            if data is not None:
+                response = self._session.post(
+                    url, headers=headers, data=data, timeout=self._timeout)
+            else:
+                response = self._session.get(
+                    url, headers=headers, timeout=self._timeout)
+        except requests.RequestException as err:
+            raise exceptions.RestApiUnavailable(
+                'Failed to connect to {}: {}'.format(url, err)) from err
+
+        if not response.ok:
+            raise exceptions.RestApiError(
+                response.status_code, response.reason)
+
+        return response
+
+    def get_json(self, path, auth_user=None, auth_password=None):
+        """Send a GET request and return its decoded JSON body."""
+        return json.loads(self.request(
+            path, auth_user=auth_user, auth_password=auth_password).text)
+
+
+class AsyncRestClient:
+    """The asyncio counterpart of RestClient.
+
+    Requests run on a pool of threads sharing the RestClient's session,
+    so that coroutines can have several requests in flight at a time.
+    """
+
+    def __init__(self, base_url, max_workers=DEFAULT_POOL_SIZE, **kwargs):
+        """
+        Args:
+            base_url (str): the REST API URL
+            max_workers (int): the number of requests in flight at most
+            kwargs: passed on to RestClient
+        """
+        kwargs.setdefault('pool_size', max_workers)
+        self._client = RestClient(base_url, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+    async def request(self, path, data=None, content_type=None,
+                      auth_user=None, auth_password=None):
+        return await self._run(
+            self._client.request, path, data=data,
+            content_type=content_type, auth_user=auth_user,
+            auth_password=auth_password)
+
+    async def get_json(self, path, auth_user=None, auth_password=None):
+        return await self._run(
+            self._client.get_json, path, auth_user=auth_user,
+            auth_password=auth_password)
+
+    def _run(self, function, *args, **kwargs):
+        return asyncio.get_event_loop().run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs))
+
+
+@functools.lru_cache(maxsize=16)
+def _basic_auth(auth_user, auth_password):
+    auth_string = '{}:{}'.format(auth_user, auth_password)
+    return 'Basic {}'.format(b64encode(auth_string.encode()).decode())
@@ -0,0 +1,253 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+from sawtooth_sdk.client import exceptions
+from sawtooth_sdk.protobuf import client_batch_submit_pb2
+from sawtooth_sdk.protobuf import client_list_control_pb2
+from sawtooth_sdk.protobuf import client_state_pb2
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+# Seconds to wait for the validator to answer a request
+DEFAULT_TIMEOUT = 300
+
+
+class ClientFuture:
+    """The pending answer to a request sent by a ZmqClient.
+
+    The request is in flight as soon as the future exists, so several
+    requests can be sent before the first answer is waited for. result()
+    waits for the answer and returns it decoded.
+    """
+
+    def __init__(self, future, response_type, decode, timeout):
+        self._future = future
+        self._response_type = response_type
+        self._decode = decode
+        self._timeout = timeout
+
+    def done(self):
+        return self._future.done()
+
+    def result(self, timeout=None):
+        """Wait for the answer, for `timeout` seconds or else the client's
+        timeout, and return it decoded.
+
+        Raises:
+            FutureTimeoutError: if no answer came in time
+            ReceiveError: if the validator could not serve the request
+        """
+        if timeout is None:
+            timeout = self._timeout
+
+        response = self._response_type()
+        response.ParseFromString(self._future.result(timeout).content)
+        return self._decode(response)
+
+
+class ZmqClient:
+    """Submits batches and reads state through the validator's client
+    endpoint, over a Stream.
+
+    Each request method sends its request at once and returns a
+    ClientFuture; any number of requests may be in flight at a time.
+    """
+
+    def __init__(self, stream, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            stream (Stream): a stream connected to the validator's client
+                endpoint
+            timeout (int): the default number of seconds to wait for each
+                answer
+        """
+        self._stream = stream
+        self._timeout = timeout
+
+    def close(self):
+        self._stream.close()
+
+    def submit_batches(self, batches):
+        """Submit batches to be committed.
+
+        The result is None once the validator has queued the batches.
+
+        Raises:
+            InvalidBatch: if a batch failed validation
+            QueueFull: if the validator's queue is full; the batches may
+                be submitted again
+        """
+        return self._send(
+            client_batch_submit_pb2.ClientBatchSubmitRequest(
+                batches=batches),
+            Message.CLIENT_BATCH_SUBMIT_REQUEST,
+            client_batch_submit_pb2.ClientBatchSubmitResponse,
+            _decode_submit)
+
+    def get_batch_statuses(self, batch_ids, wait=None):
+        """Get the statuses of batches, as a dict of status names by batch
+        id.
+
+        Args:
+            batch_ids (list of str): the ids of the batches
+            wait (int): if given, the validator answers once every batch
+                is committed, or after this many seconds
+        """
+        request = client_batch_submit_pb2.ClientBatchStatusRequest(
+            batch_ids=batch_ids)
+        if wait:
+            request.wait = True
+            request.timeout = wait
+
+        return self._send(
+            request,
+            Message.CLIENT_BATCH_STATUS_REQUEST,
+            client_batch_submit_pb2.ClientBatchStatusResponse,
+            _decode_batch_statuses)
+
+    def get_state(self, address, state_root=None):
+        """Get the data at an address, or None if it is not set.
+
+        Args:
+            address (str): the address to read
+            state_root (str): the state root to read at; the current chain
+                head's if not given
+        """
+        return self._send(
+            client_state_pb2.ClientStateGetRequest(
+                address=address, state_root=state_root or ''),
+            Message.CLIENT_STATE_GET_REQUEST,
+            client_state_pb2.ClientStateGetResponse,
+            _decode_state_get)
+
+    def list_state(self, address='', state_root=None, start=None,
+                   limit=None):
+        """Get a page of the entries under an address prefix.
+
+        The result is a list of (address, data) tuples, and the paging
+        start of the next page, or None if this is the last page.
+
+        Args:
+            address (str): the address prefix to list
+            state_root (str): the state root to read at; the current chain
+                head's if not given
+            start (str): the paging start given with the previous page
+            limit (int): the largest number of entries in the page
+        """
+        return self._list_state(
+            address, state_root, start, limit, _decode_state_list)
+
+    def iter_state(self, address='', state_root=None, limit=None):
+        """Yield the (address, data) entries under an address prefix,
+        fetching them a page at a time.
+
+        Every page is read at the same state root: the given one, or else
+        the one the first page was read at, so the listing does not mix
+        blocks as the chain head moves. The next page is requested before
+        the entries of the current one are yielded.
+        """
+        entries, start, first_root = self._list_state(
+            address, state_root, None, limit,
+            _decode_state_list_with_root).result()
+        state_root = state_root or first_root
+        while True:
+            page = None
+            if start is not None:
+                page = self.list_state(
+                    address, state_root=state_root, start=start,
+                    limit=limit)
+
+            yield from entries
+
+            if page is None:
+                return
+            entries, start = page.result()
+
+    def _list_state(self, address, state_root, start, limit, decode):
+        return self._send(
+            client_state_pb2.ClientStateListRequest(
+                address=address,
+                state_root=state_root or '',
+                paging=client_list_control_pb2.ClientPagingControls(
+                    start=start or '', limit=limit or 0)),
+            Message.CLIENT_STATE_LIST_REQUEST,
+            client_state_pb2.ClientStateListResponse,
+            decode)
+
+    def _send(self, request, message_type, response_type, decode):
+        future = self._stream.send(
+            message_type=message_type,
+            content=request.SerializeToString())
+
+        return ClientFuture(future, response_type, decode, self._timeout)
+
+
+def _decode_submit(response):
+    response_type = client_batch_submit_pb2.ClientBatchSubmitResponse
+
+    if response.status == response_type.INVALID_BATCH:
+        raise exceptions.InvalidBatch()
+
+    if response.status == response_type.QUEUE_FULL:
+        raise exceptions.QueueFull()
+
+    _check_status(response, response_type)
+
+
+def _decode_batch_statuses(response):
+    _check_status(
+        response, client_batch_submit_pb2.ClientBatchStatusResponse)
+
+    return {
+        batch_status.batch_id:
+            client_batch_submit_pb2.ClientBatchStatus.Status.Name(
+                batch_status.status)
+        for batch_status in response.batch_statuses
+    }
+
+
+def _decode_state_get(response):
+    response_type = client_state_pb2.ClientStateGetResponse
+
+    if response.status == response_type.NO_RESOURCE:
+        return None
+
+    _check_status(response, response_type)
+
+    return response.value
+
+
+def _decode_state_list(response):
+    response_type = client_state_pb2.ClientStateListResponse
+
+    if response.status == response_type.NO_RESOURCE:
+        return [], None
+
+    _check_status(response, response_type)
+
+    entries = [(entry.address, entry.data) for entry in response.entries]
+    return entries, response.paging.next or None
+
+
+def _decode_state_list_with_root(response):
+    entries, start = _decode_state_list(response)
+    return entries, start, response.state_root or None
+
+
+def _check_status(response, response_type):
+    if response.status != response_type.OK:
+        raise exceptions.ReceiveError(
+            'Failed with status {}'.format(
+                response_type.Status.Name(response.status)))
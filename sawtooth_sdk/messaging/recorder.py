@@ -0,0 +1,136 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""Recording of the traffic between a transaction processor and the
+validator, for replaying it offline.
+
+A traffic log holds a header followed by length-delimited records:
+
+    header:  b'STTR' | version (u8)
+    record:  time (f64) | direction (u8) | length (u32) | Message bytes
+
+All integers are big-endian.
+"""
+
+from collections import namedtuple
+import struct
+import threading
+import time
+
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+MAGIC = b'STTR'
+VERSION = 1
+
+# Directions, as seen from the transaction processor
+INBOUND = 0
+OUTBOUND = 1
+
+# Transaction processing and the state, event and receipt exchanges it
+# triggers. Registration, pings and so on are not recorded.
+RECORDED_TYPES = frozenset([
+    Message.TP_PROCESS_REQUEST,
+    Message.TP_PROCESS_RESPONSE,
+    Message.TP_STATE_GET_REQUEST,
+    Message.TP_STATE_GET_RESPONSE,
+    Message.TP_STATE_SET_REQUEST,
+    Message.TP_STATE_SET_RESPONSE,
+    Message.TP_STATE_DELETE_REQUEST,
+    Message.TP_STATE_DELETE_RESPONSE,
+    Message.TP_EVENT_ADD_REQUEST,
+    Message.TP_EVENT_ADD_RESPONSE,
+    Message.TP_RECEIPT_ADD_DATA_REQUEST,
+    Message.TP_RECEIPT_ADD_DATA_RESPONSE,
+])
+
+_HEADER = struct.Struct('>4sB')
+_RECORD = struct.Struct('>dBI')
+
+RecordedMessage = namedtuple(
+    'RecordedMessage', ['timestamp', 'direction', 'message'])
+
+
+class TrafficLogError(Exception):
+    pass
+
+
+class TrafficRecorder:
+    """Appends messages to a traffic log. Safe to use from several threads.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'wb')  # pylint: disable=consider-using-with
+        self._file.write(_HEADER.pack(MAGIC, VERSION))
+        self._lock = threading.Lock()
+
+    def record(self, direction, message):
+        """Record the message if it is part of transaction processing.
+
+        Args:
+            direction (int): INBOUND or OUTBOUND
+            message (validator_pb2.Message): the message
+        """
+        if message.message_type not in RECORDED_TYPES:
+            return
+
+        data = message.SerializeToString()
+        record = _RECORD.pack(time.time(), direction, len(data)) + data
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(record)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_traffic(path):
+    """Read a traffic log.
+
+    Yields:
+        RecordedMessage: the recorded messages, in the order recorded
+
+    Raises:
+        TrafficLogError: if the file is not a traffic log or is truncated
+    """
+    with open(path, 'rb') as fd:
+        header = fd.read(_HEADER.size)
+        if len(header) != _HEADER.size \
+                or _HEADER.unpack(header) != (MAGIC, VERSION):
+            raise TrafficLogError(
+                'Unsupported traffic log format in {}'.format(path))
+
+        while True:
+            prefix = fd.read(_RECORD.size)
+            if not prefix:
+                return
+            if len(prefix) != _RECORD.size:
+                raise TrafficLogError('Truncated traffic log {}'.format(path))
+
+            timestamp, direction, length = _RECORD.unpack(prefix)
+            data = fd.read(length)
+            if len(data) != length:
+                raise TrafficLogError('Truncated traffic log {}'.format(path))
+
+            message = Message()
+            message.ParseFromString(data)
+            yield RecordedMessage(timestamp, direction, message)
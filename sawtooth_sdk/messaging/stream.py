@@ -32,6 +32,8 @@ from sawtooth_sdk.messaging.future import FutureCollection
 from sawtooth_sdk.messaging.future import FutureCollectionKeyError
 from sawtooth_sdk.messaging.future import FutureResult
 from sawtooth_sdk.messaging.future import FutureError
+from sawtooth_sdk.messaging.recorder import INBOUND
+from sawtooth_sdk.messaging.recorder import OUTBOUND
 
 LOGGER = logging.getLogger(__file__)
 
@@ -52,7 +54,7 @@ class _SendReceiveThread(Thread):
     Internal thread to Stream class that runs the asyncio event loop.
     """
 
-    def __init__(self, url, futures, ready_event, error_queue):
+    def __init__(self, url, futures, ready_event, error_queue, recorder=None):
         """constructor for background thread
 
         :param url (str): the address to connect to the validator on
@@ -61,9 +63,12 @@ class _SendReceiveThread(Thread):
         :param ready_event (threading.Event): used to notify waiting/asking
                classes that the background thread of Stream is ready after
                a disconnect event.
+        :param recorder (TrafficRecorder): if given, records the messages
+               sent and received
         """
         super().__init__()
         self._futures = futures
+        self._recorder = recorder
         self._url = url
         self._shutdown = False
         self._event_loop = None
@@ -90,6 +95,8 @@ class _SendReceiveThread(Thread):
             msg_bytes = yield from self._sock.recv()
             message = validator_pb2.Message()
             message.ParseFromString(msg_bytes)
+            if self._recorder is not None:
+                self._recorder.record(INBOUND, message)
             try:
                 self._futures.set_result(
                     message.correlation_id,
@@ -111,6 +118,8 @@ class _SendReceiveThread(Thread):
             if not self._ready_event.is_set():
                 break
             msg = yield from self._send_queue.get()
+            if self._recorder is not None:
+                self._recorder.record(OUTBOUND, msg)
             yield from self._sock.send_multipart([msg.SerializeToString()])
 
     @asyncio.coroutine
@@ -256,7 +265,13 @@ class _SendReceiveThread(Thread):
 
 
 class Stream:
-    def __init__(self, url):
+    def __init__(self, url, recorder=None):
+        """
+        Args:
+            url (str): the address to connect to the validator on
+            recorder (TrafficRecorder): if given, records the transaction
+                processing traffic through the stream
+        """
         self._url = url
         self._futures = FutureCollection()
         self._event = Event()
@@ -266,7 +281,8 @@ class Stream:
             url,
             futures=self._futures,
             ready_event=self._event,
-            error_queue=error_queue)
+            error_queue=error_queue,
+            recorder=recorder)
         self._send_recieve_thread.start()
         err = error_queue.get()
         if err is not _NO_ERROR:
@@ -23,9 +23,12 @@ number of handlers can be added.
 
 3. A Context class used to abstract getting and setting addresses in
 global validator state.
+
+4. A Namespace class deriving a transaction family's addresses.
 '''
 
 __all__ = [
+    'address',
     'core',
     'context',
     'exceptions'
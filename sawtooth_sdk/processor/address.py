@@ -0,0 +1,88 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import functools
+import hashlib
+
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Addresses are 70 hex characters: the namespace prefix, then the rest
+PREFIX_LENGTH = 6
+ADDRESS_LENGTH = 70
+
+
+class Namespace:
+    """The addresses of a transaction family, derived from names.
+
+    The namespace prefix is the first six hex characters of the SHA-512
+    digest of the family name. The rest of an address is an optional
+    leaf, followed by as much of the SHA-512 hex digest of the name as
+    fits: its start, or its end if `from_end` is set.
+
+    The digests of recently used names are kept in a bounded LRU cache,
+    so the addresses of a name cost a single hash however often they are
+    derived. Derivation is thread-safe.
+    """
+
+    def __init__(self, family_name, from_end=False,
+                 max_size=DEFAULT_CACHE_SIZE):
+        self._family_name = family_name
+        self._prefix = _sha512(family_name)[:PREFIX_LENGTH]
+        self._from_end = from_end
+        self._digest = functools.lru_cache(maxsize=max_size)(_sha512)
+
+    @property
+    def family_name(self):
+        return self._family_name
+
+    @property
+    def prefix(self):
+        """Return the namespace prefix, as registered by the family's
+        transaction handler.
+        """
+        return self._prefix
+
+    def make_address(self, name, leaf=''):
+        """Return the address of `name`, under the given leaf.
+
+        Args:
+            name (str): the name to derive the address from
+            leaf (str): hex characters placed between the prefix and the
+                digest of the name
+        """
+        length = ADDRESS_LENGTH - PREFIX_LENGTH - len(leaf)
+        digest = self._digest(name)
+        if self._from_end:
+            return self._prefix + leaf + digest[-length:]
+        return self._prefix + leaf + digest[:length]
+
+    def make_addresses(self, names, leaf=''):
+        """Return the addresses of each of `names`, under the given leaf.
+        """
+        return [self.make_address(name, leaf) for name in names]
+
+    def cache_info(self):
+        """Return the hit and miss counts and the size of the cache of
+        name digests.
+        """
+        return self._digest.cache_info()
+
+    def cache_clear(self):
+        self._digest.cache_clear()
+
+
+def _sha512(name):
+    return hashlib.sha512(name.encode('utf-8')).hexdigest()
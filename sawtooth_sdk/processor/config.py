@@ -128,6 +128,15 @@ def get_log_dir():
         default_dir='/var/log/sawtooth')
 
 
+def get_data_dir():
+    """Returns the configured data directory."""
+    return _get_dir(
+        toml_config_setting='data_dir',
+        sawtooth_home_dir='data',
+        windows_dir='data',
+        default_dir='/var/lib/sawtooth')
+
+
 def get_log_config(filename=None):
     """Returns the log config dictinary if it exists."""
     return _get_log_config(filename)
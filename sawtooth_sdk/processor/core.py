@@ -61,12 +61,15 @@ class TransactionProcessor:
         FEATURE_CUSTOM_HEADER_STYLE = 1
         SDK_PROTOCOL_VERSION = 1
 
-    def __init__(self, url):
+    def __init__(self, url, recorder=None):
         """
         Args:
             url (string): The URL of the validator
+            recorder (TrafficRecorder): if given, records every
+                TP_PROCESS_REQUEST and the exchanges it triggers, for
+                replay with sawtooth_processor_test.replay
         """
-        self._stream = Stream(url)
+        self._stream = Stream(url, recorder=recorder)
         self._url = url
         self._handlers = []
         self._highest_sdk_feature_requested = \
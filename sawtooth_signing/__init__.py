@@ -16,7 +16,15 @@ from sawtooth_signing.core import NoSuchAlgorithmError
 from sawtooth_signing.core import ParseError
 from sawtooth_signing.core import SigningError
 
-from sawtooth_signing.secp256k1 import Secp256k1Context
+from sawtooth_signing import backends
+from sawtooth_signing.verify_cache import VerifyCachingContext
+
+# Kept for the callers that use the secp256k1 library's context directly;
+# it is only defined when that library is installed
+try:
+    Secp256k1Context = backends.load_backend('secp256k1')
+except NoSuchAlgorithmError:
+    pass
 
 
 class Signer:
@@ -44,6 +52,22 @@ class Signer:
         """
         return self._context.sign(message, self._private_key)
 
+    def sign_many(self, messages, workers=None):
+        """Signs each of the given messages, in parallel where the context
+        supports it
+
+        Args:
+            messages (list of bytes): the message bytes
+            workers (int): the maximum number of worker processes to use
+
+        Returns:
+            The signatures as hex-encoded strings, in message order
+
+        Raises:
+            SigningError: if any error occurs during the signing process
+        """
+        return self._context.sign_many(messages, self._private_key, workers)
+
     def get_public_key(self):
         """Return the public key for this Signer instance.
         """
@@ -78,19 +102,30 @@ class CryptoFactory:
         return Signer(self._context, private_key)
 
 
-def create_context(algorithm_name):
+def create_context(algorithm_name, backend=None, verify_cache_size=None):
     """Returns an algorithm instance by name.
 
     Args:
         algorithm_name (str): the algorithm name
+        backend (str): the library implementing the algorithm, e.g.
+            'secp256k1', 'coincurve' or 'cryptography', or 'fastest' for
+            the fastest installed one; the backend named by the
+            SAWTOOTH_SIGNING_BACKEND environment variable, or else the
+            first installed of those three, is used if omitted
+        verify_cache_size (int): if given, remember up to this many
+            verification results (see :obj:`VerifyCachingContext`)
 
     Returns:
         (:obj:`Context`): a context instance for the given algorithm
 
     Raises:
-        NoSuchAlgorithmError if the algorithm is unknown
+        NoSuchAlgorithmError if the algorithm is unknown or the requested
+        backend is not available
     """
     if algorithm_name == 'secp256k1':
-        return Secp256k1Context()
+        context = backends.select_backend(backend)()
+        if verify_cache_size:
+            context = VerifyCachingContext(context, verify_cache_size)
+        return context
 
     raise NoSuchAlgorithmError("no such algorithm: {}".format(algorithm_name))
@@ -0,0 +1,171 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""Registry of the libraries that can implement the secp256k1 context.
+
+Every backend produces the same compact, low-s, RFC 6979 signatures and
+accepts keys created by the others, so they are interchangeable. The
+first installed backend, in the order of registration, is used unless
+another is asked for.
+"""
+
+from collections import OrderedDict
+import importlib
+import os
+import time
+
+from sawtooth_signing.core import NoSuchAlgorithmError
+
+
+# Setting this environment variable forces a backend by name
+BACKEND_ENV = 'SAWTOOTH_SIGNING_BACKEND'
+
+# The backend name that asks for the fastest installed backend
+FASTEST = 'fastest'
+
+_BACKENDS = OrderedDict([
+    ('secp256k1', 'sawtooth_signing.secp256k1:Secp256k1Context'),
+    ('coincurve', 'sawtooth_signing.secp256k1_coincurve:CoincurveContext'),
+    ('cryptography',
+     'sawtooth_signing.secp256k1_cryptography:CryptographyContext'),
+])
+
+_fastest = None
+
+
+def register_backend(name, context_path):
+    """Register a secp256k1 backend.
+
+    Args:
+        name (str): the backend name
+        context_path (str): the context class as 'module.path:ClassName'
+    """
+    global _fastest  # pylint: disable=global-statement
+    _BACKENDS[name] = context_path
+    _fastest = None
+
+
+def backend_names():
+    """Return the names of all registered backends, installed or not."""
+    return list(_BACKENDS)
+
+
+def load_backend(name):
+    """Return the context class of the named backend.
+
+    Raises:
+        NoSuchAlgorithmError: if the backend is unknown or its library is
+            not installed
+    """
+    try:
+        module_name, class_name = _BACKENDS[name].split(':')
+    except KeyError:
+        raise NoSuchAlgorithmError(
+            "no such secp256k1 backend: {}".format(name)) from None
+
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as err:
+        raise NoSuchAlgorithmError(
+            "secp256k1 backend {} is not available: {}".format(
+                name, err)) from err
+
+    return getattr(module, class_name)
+
+
+def available_backends():
+    """Return the names of the backends whose library is installed."""
+    available = []
+    for name in _BACKENDS:
+        try:
+            load_backend(name)
+        except NoSuchAlgorithmError:
+            continue
+        available.append(name)
+    return available
+
+
+def benchmark_backend(name, rounds=100):
+    """Time the named backend.
+
+    Returns:
+        tuple: the mean (sign, verify) time in seconds
+    """
+    context = load_backend(name)()
+    private_key = context.new_random_private_key()
+    public_key = context.get_public_key(private_key)
+    message = b'benchmark' * 16
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        signature = context.sign(message, private_key)
+    sign_time = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        context.verify(signature, message, public_key)
+    verify_time = (time.perf_counter() - start) / rounds
+
+    return sign_time, verify_time
+
+
+def fastest_backend():
+    """Return the name of the fastest installed backend.
+
+    The backends are benchmarked on first use and the result is kept for
+    the life of the process.
+
+    Raises:
+        NoSuchAlgorithmError: if no backend is installed
+    """
+    global _fastest  # pylint: disable=global-statement
+    if _fastest is None:
+        timings = {
+            name: sum(benchmark_backend(name, rounds=20))
+            for name in available_backends()
+        }
+        if not timings:
+            raise NoSuchAlgorithmError("no secp256k1 backend is installed")
+        _fastest = min(timings, key=timings.get)
+    return _fastest
+
+
+def default_backend():
+    """Return the name of the first installed backend, in the order of
+    registration: secp256k1, coincurve, then cryptography.
+
+    Raises:
+        NoSuchAlgorithmError: if no backend is installed
+    """
+    available = available_backends()
+    if not available:
+        raise NoSuchAlgorithmError("no secp256k1 backend is installed")
+    return available[0]
+
+
+def select_backend(name=None):
+    """Return the context class to use for secp256k1.
+
+    Args:
+        name (str): the backend to force, or FASTEST to benchmark the
+            installed backends and use the fastest; defaults to the value
+            of the SAWTOOTH_SIGNING_BACKEND environment variable, or the
+            default backend
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_ENV) or default_backend()
+    if name == FASTEST:
+        name = fastest_backend()
+    return load_backend(name)
@@ -120,6 +120,45 @@ class Context(metaclass=ABCMeta):
             for that method, False otherwise
         """
 
+    def sign_many(self, messages, private_key, workers=None):
+        """Sign each of the given messages with the same private key.
+
+        The default implementation signs the messages one at a time;
+        contexts may override it to spread the work over several cores.
+
+        Args:
+            messages (list of bytes): the messages to sign
+            private_key (:obj:`PrivateKey`): the private key
+            workers (int): the maximum number of worker processes to use;
+                ignored by contexts which sign sequentially
+
+        Returns:
+            list of str: the hex-encoded signatures, in message order
+
+        Raises:
+            SigningError: if any error occurs during the signing process
+        """
+        # pylint: disable=unused-argument
+        return [self.sign(message, private_key) for message in messages]
+
+    def verify_many(self, triples, workers=None):
+        """Verify several signatures.
+
+        Args:
+            triples (list of tuple): (signature, message, public_key) tuples,
+                with the same meaning as the arguments of verify()
+            workers (int): the maximum number of worker processes to use;
+                ignored by contexts which verify sequentially
+
+        Returns:
+            list of bool: the result of verify() for each triple, in order
+        """
+        # pylint: disable=unused-argument
+        return [
+            self.verify(signature, message, public_key)
+            for signature, message, public_key in triples
+        ]
+
     @abstractmethod
     def new_random_private_key(self):
         """Generates a new random PrivateKey using this context.
@@ -0,0 +1,226 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""A pool of pre-generated signing keys for workload tools.
+
+Keystore files hold a header followed by fixed-size records, so that a
+memory-mapped keystore gives constant-time access to any key:
+
+    header:  b'STKP' | version (u8) | key count (u32, big-endian)
+    record:  private key (32 bytes) | compressed public key (33 bytes)
+
+A keystore is created once with KeyPool.generate(context, count).save(path)
+and reopened by each run with KeyPool.load(context, path).
+"""
+
+import mmap
+import os
+import random
+import struct
+import threading
+
+from sawtooth_signing import Signer
+from sawtooth_signing.core import ParseError
+from sawtooth_signing import parallel
+from sawtooth_signing.verify_cache import VerifyCachingContext
+
+
+MAGIC = b'STKP'
+VERSION = 1
+
+_HEADER = struct.Struct('>4sBI')
+_PRIVATE_KEY_SIZE = 32
+_PUBLIC_KEY_SIZE = 33
+_RECORD_SIZE = _PRIVATE_KEY_SIZE + _PUBLIC_KEY_SIZE
+
+
+def generate_keys(context, count, workers=None):
+    """Generate `count` key pairs, spread over a process pool for large
+    counts.
+
+    Returns:
+        list of tuple: (private key bytes, public key bytes) pairs
+    """
+    # The workers build their own context from the class of the backend
+    # context, since wrappers such as VerifyCachingContext take arguments
+    context_class = type(_backend_context(context))
+    workers = parallel.worker_count(workers, count)
+    if workers == 1:
+        return _generate_chunk(context_class, count)
+
+    counts = [len(chunk) for chunk in parallel.split(range(count), workers)]
+    return parallel.map_chunks(
+        _generate_chunk,
+        [context_class] * len(counts),
+        counts,
+        workers=workers)
+
+
+def write_keystore(path, keys):
+    """Write (private key bytes, public key bytes) pairs to a keystore,
+    readable and writable by its owner only.
+    """
+    # The private keys are written raw, so the file never takes the
+    # permissions of the umask, nor keeps those of a file it replaces
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, 'wb') as keystore:
+        keystore.write(_HEADER.pack(MAGIC, VERSION, len(keys)))
+        for private_key_bytes, public_key_bytes in keys:
+            keystore.write(private_key_bytes)
+            keystore.write(public_key_bytes)
+
+
+class KeyPool:
+    """Hands out signers backed by a fixed set of keys.
+
+    Signers are created on first use and kept, so drawing the same key
+    again costs nothing. Draws are thread-safe.
+    """
+
+    def __init__(self, context, buffer, count, offset=0):
+        """
+        Args:
+            context (:obj:`Context`): the context used by the signers
+            buffer: keystore records, from `offset` onwards
+            count (int): the number of records in the buffer
+        """
+        # Signers need keys of the context's own backend
+        self._private_key_class = context.private_key_class
+        self._context = context
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+        self._signers = [None] * count
+        self._next = 0
+        self._lock = threading.Lock()
+        self._mmap = None
+
+    @classmethod
+    def generate(cls, context, count, workers=None):
+        """Create a pool of `count` new keys held in memory."""
+        keys = generate_keys(context, count, workers)
+        return cls(context, b''.join(priv + pub for priv, pub in keys), count)
+
+    @classmethod
+    def load(cls, context, path):
+        """Memory-map a keystore written by save() or write_keystore().
+
+        Raises:
+            ParseError: if the file is not a valid keystore
+        """
+        # The mapping stays valid once the file is closed
+        with open(path, 'rb') as fd:
+            try:
+                buffer = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as err:
+                raise ParseError('Unable to map keystore {}: {}'.format(
+                    path, err)) from err
+
+        if len(buffer) < _HEADER.size:
+            buffer.close()
+            raise ParseError('Truncated keystore {}'.format(path))
+
+        magic, version, count = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            buffer.close()
+            raise ParseError('Unsupported keystore format in {}'.format(path))
+        if count == 0:
+            buffer.close()
+            raise ParseError('Empty keystore {}'.format(path))
+        if len(buffer) != _HEADER.size + count * _RECORD_SIZE:
+            buffer.close()
+            raise ParseError('Truncated keystore {}'.format(path))
+
+        pool = cls(context, buffer, count, offset=_HEADER.size)
+        pool._mmap = buffer  # pylint: disable=protected-access
+        return pool
+
+    def save(self, path):
+        write_keystore(path, [self.key_bytes(i) for i in range(self._count)])
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def key_bytes(self, index):
+        """Return the (private key bytes, public key bytes) at `index`."""
+        self._check_index(index)
+        start = self._offset + index * _RECORD_SIZE
+        record = bytes(self._buffer[start:start + _RECORD_SIZE])
+        return record[:_PRIVATE_KEY_SIZE], record[_PRIVATE_KEY_SIZE:]
+
+    def public_key_hex(self, index):
+        """Return the public key at `index` without deriving it."""
+        return self.key_bytes(index)[1].hex()
+
+    def signer(self, index):
+        """Return the signer for the key at `index`."""
+        self._check_index(index)
+        signer = self._signers[index]
+        if signer is None:
+            private_key_bytes, _ = self.key_bytes(index)
+            signer = Signer(
+                self._context,
+                self._private_key_class.from_bytes(private_key_bytes))
+            self._signers[index] = signer
+        return signer
+
+    def next_signer(self):
+        """Draw signers round-robin."""
+        self._check_index(0)
+        with self._lock:
+            index = self._next
+            self._next = (index + 1) % self._count
+        return self.signer(index)
+
+    def random_signer(self, rng=random):
+        """Draw a signer uniformly at random."""
+        self._check_index(0)
+        return self.signer(rng.randrange(self._count))
+
+    def _check_index(self, index):
+        # Negative indices would read the header, or past the records
+        if not 0 <= index < self._count:
+            raise IndexError(
+                'Key index {} out of range for a pool of {} keys'.format(
+                    index, self._count))
+
+
+def _backend_context(context):
+    while isinstance(context, VerifyCachingContext):
+        context = context.context
+    return context
+
+
+def _generate_chunk(context_class, count):
+    context = context_class()
+    keys = []
+    for _ in range(count):
+        private_key = context.new_random_private_key()
+        keys.append((
+            private_key.as_bytes(),
+            context.get_public_key(private_key).as_bytes()))
+    return keys
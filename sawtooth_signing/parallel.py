@@ -0,0 +1,113 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""Process pool implementations of Context.sign_many and verify_many.
+
+Native key objects cannot be pickled, so keys are sent to the workers as
+bytes and rebuilt there with the given key class.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+# Below this many items, starting worker processes costs more than it saves
+PARALLEL_THRESHOLD = 256
+
+
+def sign_many(context, private_key_class, messages, private_key,
+              workers=None):
+    messages = list(messages)
+    workers = worker_count(workers, len(messages))
+    if workers == 1:
+        return [context.sign(message, private_key) for message in messages]
+
+    chunks = split(messages, workers)
+    return map_chunks(
+        _sign_chunk,
+        [type(context)] * len(chunks),
+        [private_key_class] * len(chunks),
+        [private_key.as_bytes()] * len(chunks),
+        chunks,
+        workers=workers)
+
+
+def verify_many(context, public_key_class, triples, workers=None):
+    triples = list(triples)
+    workers = worker_count(workers, len(triples))
+    if workers == 1:
+        return [
+            context.verify(signature, message, public_key)
+            for signature, message, public_key in triples
+        ]
+
+    encoded = []
+    for signature, message, public_key in triples:
+        try:
+            public_key_bytes = public_key.as_bytes()
+        # pylint: disable=broad-except
+        except Exception:
+            public_key_bytes = None
+        encoded.append((signature, message, public_key_bytes))
+
+    chunks = split(encoded, workers)
+    return map_chunks(
+        _verify_chunk,
+        [type(context)] * len(chunks),
+        [public_key_class] * len(chunks),
+        chunks,
+        workers=workers)
+
+
+def worker_count(workers, items):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if items < PARALLEL_THRESHOLD:
+        return 1
+    return max(1, min(workers, items))
+
+
+def split(items, parts):
+    size = -(-len(items) // parts)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def map_chunks(function, *chunks, workers):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [
+            result
+            for results in executor.map(function, *chunks)
+            for result in results
+        ]
+
+
+def _sign_chunk(context_class, private_key_class, private_key_bytes,
+                messages):
+    context = context_class()
+    private_key = private_key_class.from_bytes(private_key_bytes)
+    return [context.sign(message, private_key) for message in messages]
+
+
+def _verify_chunk(context_class, public_key_class, triples):
+    context = context_class()
+    results = []
+    for signature, message, public_key_bytes in triples:
+        try:
+            public_key = public_key_class.from_bytes(public_key_bytes)
+        # pylint: disable=broad-except
+        except Exception:
+            results.append(False)
+            continue
+        results.append(context.verify(signature, message, public_key))
+    return results
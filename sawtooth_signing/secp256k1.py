@@ -14,6 +14,7 @@
 # ------------------------------------------------------------------------------
 
 import binascii
+import functools
 import warnings
 
 import secp256k1
@@ -24,6 +25,16 @@ from sawtooth_signing.core import ParseError
 from sawtooth_signing.core import PrivateKey
 from sawtooth_signing.core import PublicKey
 from sawtooth_signing.core import Context
+from sawtooth_signing import parallel
+
+try:
+    # Creating a libsecp256k1 context is expensive, so older bindings that
+    # create one per key are handed a single shared, precomputed context.
+    # Newer bindings already share a global context.
+    _CTX_BASE = secp256k1.Base(ctx=None, flags=secp256k1.ALL_FLAGS)
+    _CTX_KWARGS = {'ctx': _CTX_BASE.ctx}
+except AttributeError:
+    _CTX_KWARGS = {}
 
 
 class Secp256k1PrivateKey(PrivateKey):
@@ -45,7 +56,8 @@ class Secp256k1PrivateKey(PrivateKey):
 
     @staticmethod
     def from_bytes(byte_str):
-        return Secp256k1PrivateKey(secp256k1.PrivateKey(byte_str))
+        return Secp256k1PrivateKey(
+            secp256k1.PrivateKey(byte_str, **_CTX_KWARGS))
 
     @staticmethod
     def from_hex(hex_str):
@@ -57,12 +69,15 @@ class Secp256k1PrivateKey(PrivateKey):
 
     @staticmethod
     def new_random():
-        return Secp256k1PrivateKey(secp256k1.PrivateKey())
+        return Secp256k1PrivateKey(secp256k1.PrivateKey(**_CTX_KWARGS))
 
 
 class Secp256k1PublicKey(PublicKey):
     def __init__(self, secp256k1_public_key):
         self._public_key = secp256k1_public_key
+        # Public keys are immutable, so their encodings are computed once
+        self._bytes = None
+        self._hex = None
 
     @property
     def secp256k1_public_key(self):
@@ -72,16 +87,21 @@ class Secp256k1PublicKey(PublicKey):
         return "secp256k1"
 
     def as_hex(self):
-        return binascii.hexlify(self.as_bytes()).decode()
+        if self._hex is None:
+            self._hex = binascii.hexlify(self.as_bytes()).decode()
+        return self._hex
 
     def as_bytes(self):
-        with warnings.catch_warnings():  # squelch secp256k1 warning
-            warnings.simplefilter('ignore')
-            return self._public_key.serialize()
+        if self._bytes is None:
+            with warnings.catch_warnings():  # squelch secp256k1 warning
+                warnings.simplefilter('ignore')
+                self._bytes = self._public_key.serialize()
+        return self._bytes
 
     @staticmethod
     def from_bytes(byte_str):
-        public_key = secp256k1.PublicKey(byte_str, raw=True)
+        public_key = secp256k1.PublicKey(
+            byte_str, raw=True, **_CTX_KWARGS)
         return Secp256k1PublicKey(public_key)
 
     @staticmethod
@@ -94,14 +114,17 @@ class Secp256k1PublicKey(PublicKey):
 
 
 class Secp256k1Context(Context):
+    # The class of the keys the context creates
+    private_key_class = Secp256k1PrivateKey
+
     def get_algorithm_name(self):
         return "secp256k1"
 
     def sign(self, message, private_key):
         try:
-            signature = private_key.secp256k1_private_key.ecdsa_sign(message)
-            signature = private_key.secp256k1_private_key \
-                .ecdsa_serialize_compact(signature)
+            native_key = _native_private_key(private_key)
+            signature = native_key.ecdsa_sign(message)
+            signature = native_key.ecdsa_serialize_compact(signature)
 
             return signature.hex()
         except Exception as e:
@@ -113,15 +136,43 @@ class Secp256k1Context(Context):
             if isinstance(signature, str):
                 signature = bytes.fromhex(signature)
 
-            sig = public_key.secp256k1_public_key.ecdsa_deserialize_compact(
-                signature)
-            return public_key.secp256k1_public_key.ecdsa_verify(message, sig)
+            native_key = _native_public_key(public_key)
+            sig = native_key.ecdsa_deserialize_compact(signature)
+            return native_key.ecdsa_verify(message, sig)
         # pylint: disable=broad-except
         except Exception:
             return False
 
+    def sign_many(self, messages, private_key, workers=None):
+        return parallel.sign_many(
+            self, Secp256k1PrivateKey, messages, private_key, workers)
+
+    def verify_many(self, triples, workers=None):
+        return parallel.verify_many(
+            self, Secp256k1PublicKey, triples, workers)
+
     def new_random_private_key(self):
         return Secp256k1PrivateKey.new_random()
 
     def get_public_key(self, private_key):
-        return Secp256k1PublicKey(private_key.secp256k1_private_key.pubkey)
+        return Secp256k1PublicKey(_native_private_key(private_key).pubkey)
+
+
+def _native_private_key(private_key):
+    # Keys created by another secp256k1 backend are converted through bytes
+    if isinstance(private_key, Secp256k1PrivateKey):
+        return private_key.secp256k1_private_key
+    return Secp256k1PrivateKey.from_bytes(
+        private_key.as_bytes()).secp256k1_private_key
+
+
+def _native_public_key(public_key):
+    if isinstance(public_key, Secp256k1PublicKey):
+        return public_key.secp256k1_public_key
+    return _public_key_from_bytes(public_key.as_bytes())
+
+
+@functools.lru_cache(maxsize=256)
+def _public_key_from_bytes(key_bytes):
+    return Secp256k1PublicKey.from_bytes(
+        key_bytes).secp256k1_public_key
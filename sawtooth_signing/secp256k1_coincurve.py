@@ -0,0 +1,160 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""secp256k1 implementation backed by the coincurve binding."""
+
+import binascii
+import functools
+
+import coincurve
+from coincurve import ecdsa
+
+from sawtooth_signing.core import SigningError
+from sawtooth_signing.core import ParseError
+
+from sawtooth_signing.core import PrivateKey
+from sawtooth_signing.core import PublicKey
+from sawtooth_signing.core import Context
+from sawtooth_signing import parallel
+
+
+class CoincurvePrivateKey(PrivateKey):
+    def __init__(self, coincurve_private_key):
+        self._private_key = coincurve_private_key
+
+    def get_algorithm_name(self):
+        return "secp256k1"
+
+    def as_hex(self):
+        return binascii.hexlify(self.as_bytes()).decode()
+
+    def as_bytes(self):
+        return self._private_key.secret
+
+    @property
+    def coincurve_private_key(self):
+        return self._private_key
+
+    @staticmethod
+    def from_bytes(byte_str):
+        return CoincurvePrivateKey(coincurve.PrivateKey(byte_str))
+
+    @staticmethod
+    def from_hex(hex_str):
+        try:
+            return CoincurvePrivateKey.from_bytes(binascii.unhexlify(hex_str))
+        except Exception as e:
+            raise ParseError('Unable to parse hex private key: {}'.format(
+                e)) from e
+
+    @staticmethod
+    def new_random():
+        return CoincurvePrivateKey(coincurve.PrivateKey())
+
+
+class CoincurvePublicKey(PublicKey):
+    def __init__(self, coincurve_public_key):
+        self._public_key = coincurve_public_key
+        self._bytes = None
+        self._hex = None
+
+    @property
+    def coincurve_public_key(self):
+        return self._public_key
+
+    def get_algorithm_name(self):
+        return "secp256k1"
+
+    def as_hex(self):
+        if self._hex is None:
+            self._hex = binascii.hexlify(self.as_bytes()).decode()
+        return self._hex
+
+    def as_bytes(self):
+        if self._bytes is None:
+            self._bytes = self._public_key.format(compressed=True)
+        return self._bytes
+
+    @staticmethod
+    def from_bytes(byte_str):
+        return CoincurvePublicKey(coincurve.PublicKey(byte_str))
+
+    @staticmethod
+    def from_hex(hex_str):
+        try:
+            return CoincurvePublicKey.from_bytes(binascii.unhexlify(hex_str))
+        except Exception as e:
+            raise ParseError('Unable to parse hex public key: {}'.format(
+                e)) from e
+
+
+class CoincurveContext(Context):
+    # The class of the keys the context creates
+    private_key_class = CoincurvePrivateKey
+
+    def get_algorithm_name(self):
+        return "secp256k1"
+
+    def sign(self, message, private_key):
+        try:
+            # sign() returns DER; the compact form is r || s
+            der = _native_private_key(private_key).sign(message)
+            return ecdsa.serialize_compact(ecdsa.der_to_cdata(der)).hex()
+        except Exception as e:
+            raise SigningError('Unable to sign message: {}'.format(
+                str(e))) from e
+
+    def verify(self, signature, message, public_key):
+        try:
+            if isinstance(signature, str):
+                signature = bytes.fromhex(signature)
+
+            der = ecdsa.cdata_to_der(ecdsa.deserialize_compact(signature))
+            return _native_public_key(public_key).verify(der, message)
+        # pylint: disable=broad-except
+        except Exception:
+            return False
+
+    def sign_many(self, messages, private_key, workers=None):
+        return parallel.sign_many(
+            self, CoincurvePrivateKey, messages, private_key, workers)
+
+    def verify_many(self, triples, workers=None):
+        return parallel.verify_many(
+            self, CoincurvePublicKey, triples, workers)
+
+    def new_random_private_key(self):
+        return CoincurvePrivateKey.new_random()
+
+    def get_public_key(self, private_key):
+        return CoincurvePublicKey(_native_private_key(private_key).public_key)
+
+
+def _native_private_key(private_key):
+    # Keys created by another secp256k1 backend are converted through bytes
+    if isinstance(private_key, CoincurvePrivateKey):
+        return private_key.coincurve_private_key
+    return coincurve.PrivateKey(private_key.as_bytes())
+
+
+def _native_public_key(public_key):
+    if isinstance(public_key, CoincurvePublicKey):
+        return public_key.coincurve_public_key
+    return _public_key_from_bytes(public_key.as_bytes())
+
+
+@functools.lru_cache(maxsize=256)
+def _public_key_from_bytes(key_bytes):
+    return coincurve.PublicKey(key_bytes)
@@ -0,0 +1,211 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""secp256k1 implementation backed by the cryptography package (OpenSSL).
+
+Signatures are only interchangeable with the libsecp256k1 backends if the
+nonce is derived as in RFC 6979 and s is normalized to the lower half of
+the curve order, so this module refuses to load when OpenSSL cannot sign
+deterministically.
+"""
+
+import binascii
+import functools
+
+from cryptography.exceptions import UnsupportedAlgorithm
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric import utils
+
+from sawtooth_signing.core import SigningError
+from sawtooth_signing.core import ParseError
+
+from sawtooth_signing.core import PrivateKey
+from sawtooth_signing.core import PublicKey
+from sawtooth_signing.core import Context
+from sawtooth_signing import parallel
+
+
+_CURVE = ec.SECP256K1()
+_ORDER = int(
+    'FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141', 16)
+
+try:
+    _SIGNATURE_ALGORITHM = ec.ECDSA(
+        hashes.SHA256(), deterministic_signing=True)
+    ec.generate_private_key(_CURVE).sign(b'', _SIGNATURE_ALGORITHM)
+except (TypeError, UnsupportedAlgorithm) as err:
+    raise ImportError(
+        'cryptography cannot produce deterministic ECDSA signatures: '
+        '{}'.format(err)) from err
+
+
+class CryptographyPrivateKey(PrivateKey):
+    def __init__(self, cryptography_private_key):
+        self._private_key = cryptography_private_key
+
+    def get_algorithm_name(self):
+        return "secp256k1"
+
+    def as_hex(self):
+        return binascii.hexlify(self.as_bytes()).decode()
+
+    def as_bytes(self):
+        return self._private_key.private_numbers().private_value.to_bytes(
+            32, 'big')
+
+    @property
+    def cryptography_private_key(self):
+        return self._private_key
+
+    @staticmethod
+    def from_bytes(byte_str):
+        if len(byte_str) != 32:
+            raise ValueError('Private key must be 32 bytes')
+        return CryptographyPrivateKey(ec.derive_private_key(
+            int.from_bytes(byte_str, 'big'), _CURVE))
+
+    @staticmethod
+    def from_hex(hex_str):
+        try:
+            return CryptographyPrivateKey.from_bytes(
+                binascii.unhexlify(hex_str))
+        except Exception as e:
+            raise ParseError('Unable to parse hex private key: {}'.format(
+                e)) from e
+
+    @staticmethod
+    def new_random():
+        return CryptographyPrivateKey(ec.generate_private_key(_CURVE))
+
+
+class CryptographyPublicKey(PublicKey):
+    def __init__(self, cryptography_public_key):
+        self._public_key = cryptography_public_key
+        self._bytes = None
+        self._hex = None
+
+    @property
+    def cryptography_public_key(self):
+        return self._public_key
+
+    def get_algorithm_name(self):
+        return "secp256k1"
+
+    def as_hex(self):
+        if self._hex is None:
+            self._hex = binascii.hexlify(self.as_bytes()).decode()
+        return self._hex
+
+    def as_bytes(self):
+        if self._bytes is None:
+            self._bytes = self._public_key.public_bytes(
+                serialization.Encoding.X962,
+                serialization.PublicFormat.CompressedPoint)
+        return self._bytes
+
+    @staticmethod
+    def from_bytes(byte_str):
+        return CryptographyPublicKey(
+            ec.EllipticCurvePublicKey.from_encoded_point(_CURVE, byte_str))
+
+    @staticmethod
+    def from_hex(hex_str):
+        try:
+            return CryptographyPublicKey.from_bytes(
+                binascii.unhexlify(hex_str))
+        except Exception as e:
+            raise ParseError('Unable to parse hex public key: {}'.format(
+                e)) from e
+
+
+class CryptographyContext(Context):
+    # The class of the keys the context creates
+    private_key_class = CryptographyPrivateKey
+
+    def get_algorithm_name(self):
+        return "secp256k1"
+
+    def sign(self, message, private_key):
+        try:
+            der = _native_private_key(private_key).sign(
+                message, _SIGNATURE_ALGORITHM)
+            r, s = utils.decode_dss_signature(der)
+            # libsecp256k1 only produces (and accepts) low-s signatures
+            if s > _ORDER // 2:
+                s = _ORDER - s
+
+            return (r.to_bytes(32, 'big') + s.to_bytes(32, 'big')).hex()
+        except Exception as e:
+            raise SigningError('Unable to sign message: {}'.format(
+                str(e))) from e
+
+    def verify(self, signature, message, public_key):
+        try:
+            if isinstance(signature, str):
+                signature = bytes.fromhex(signature)
+
+            if len(signature) != 64:
+                return False
+
+            r = int.from_bytes(signature[:32], 'big')
+            s = int.from_bytes(signature[32:], 'big')
+            if s > _ORDER // 2:
+                return False
+
+            _native_public_key(public_key).verify(
+                utils.encode_dss_signature(r, s),
+                message,
+                _SIGNATURE_ALGORITHM)
+            return True
+        # pylint: disable=broad-except
+        except Exception:
+            return False
+
+    def sign_many(self, messages, private_key, workers=None):
+        return parallel.sign_many(
+            self, CryptographyPrivateKey, messages, private_key, workers)
+
+    def verify_many(self, triples, workers=None):
+        return parallel.verify_many(
+            self, CryptographyPublicKey, triples, workers)
+
+    def new_random_private_key(self):
+        return CryptographyPrivateKey.new_random()
+
+    def get_public_key(self, private_key):
+        return CryptographyPublicKey(
+            _native_private_key(private_key).public_key())
+
+
+def _native_private_key(private_key):
+    # Keys created by another secp256k1 backend are converted through bytes
+    if isinstance(private_key, CryptographyPrivateKey):
+        return private_key.cryptography_private_key
+    return CryptographyPrivateKey.from_bytes(
+        private_key.as_bytes()).cryptography_private_key
+
+
+def _native_public_key(public_key):
+    if isinstance(public_key, CryptographyPublicKey):
+        return public_key.cryptography_public_key
+    return _public_key_from_bytes(public_key.as_bytes())
+
+
+@functools.lru_cache(maxsize=256)
+def _public_key_from_bytes(key_bytes):
+    return CryptographyPublicKey.from_bytes(
+        key_bytes).cryptography_public_key
@@ -0,0 +1,132 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+from collections import namedtuple
+from collections import OrderedDict
+import hashlib
+import threading
+
+from sawtooth_signing.core import Context
+
+
+DEFAULT_CACHE_SIZE = 4096
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class VerifyCachingContext(Context):
+    """Wraps a context and remembers the results of verify().
+
+    Results are kept in a bounded LRU cache keyed on the public key bytes,
+    the SHA-256 digest of the message and the signature bytes. Inputs that
+    cannot be encoded into such a key, e.g. a signature that is not 64
+    bytes of hex or a public key that cannot be serialized, are verified
+    every time and their result is never cached.
+    """
+
+    def __init__(self, context, max_size=DEFAULT_CACHE_SIZE):
+        self._context = context
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def context(self):
+        """Return the wrapped context.
+        """
+        return self._context
+
+    @property
+    def private_key_class(self):
+        return self._context.private_key_class
+
+    def get_algorithm_name(self):
+        return self._context.get_algorithm_name()
+
+    def sign(self, message, private_key):
+        return self._context.sign(message, private_key)
+
+    def sign_many(self, messages, private_key, workers=None):
+        return self._context.sign_many(messages, private_key, workers)
+
+    def verify(self, signature, message, public_key):
+        key = _cache_key(signature, message, public_key)
+        if key is None:
+            return self._context.verify(signature, message, public_key)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return self._cache[key]
+            self._misses += 1
+
+        result = self._context.verify(signature, message, public_key)
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def new_random_private_key(self):
+        return self._context.new_random_private_key()
+
+    def get_public_key(self, private_key):
+        return self._context.get_public_key(private_key)
+
+    def cache_info(self):
+        """Return the hit and miss counts and the size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._max_size, len(self._cache))
+
+    @property
+    def hit_rate(self):
+        """Return the fraction of cacheable verifications that were hits.
+        """
+        hits, misses, _, _ = self.cache_info()
+        if hits + misses == 0:
+            return 0.0
+        return hits / (hits + misses)
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+def _cache_key(signature, message, public_key):
+    try:
+        if isinstance(signature, str):
+            signature = bytes.fromhex(signature)
+        if not isinstance(signature, bytes) or len(signature) != 64:
+            return None
+        if not isinstance(message, bytes):
+            return None
+        public_key_bytes = public_key.as_bytes()
+    # pylint: disable=broad-except
+    except Exception:
+        return None
+
+    return (
+        public_key_bytes,
+        hashlib.sha256(message).digest(),
+        signature)
@@ -0,0 +1,63 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import hashlib
+import unittest
+
+from sawtooth_sdk.processor.address import Namespace
+
+
+def _sha512(data):
+    return hashlib.sha512(data.encode('utf-8')).hexdigest()
+
+
+class TestNamespace(unittest.TestCase):
+    def test_addresses(self):
+        namespace = Namespace('xo')
+        prefix = _sha512('xo')[:6]
+
+        self.assertEqual(namespace.prefix, prefix)
+        self.assertEqual(
+            namespace.make_address('game'), prefix + _sha512('game')[:64])
+        self.assertEqual(
+            namespace.make_address('game', '01'),
+            prefix + '01' + _sha512('game')[:62])
+        self.assertEqual(
+            Namespace('intkey', from_end=True).make_address('key'),
+            _sha512('intkey')[:6] + _sha512('key')[-64:])
+
+    def test_make_addresses(self):
+        namespace = Namespace('xo')
+        names = ['a', 'b', 'a']
+
+        addresses = namespace.make_addresses(names, '00')
+
+        self.assertEqual(
+            addresses,
+            [namespace.make_address(name, '00') for name in names])
+        self.assertTrue(all(len(address) == 70 for address in addresses))
+
+    def test_cache(self):
+        namespace = Namespace('xo', max_size=2)
+
+        for name in ('a', 'b', 'a', 'c', 'b'):
+            namespace.make_address(name)
+        namespace.make_address('c', '01')
+
+        hits, misses, max_size, size = namespace.cache_info()
+        self.assertEqual((hits, misses, max_size, size), (2, 4, 2, 2))
+
+        namespace.cache_clear()
+        self.assertEqual(namespace.cache_info().currsize, 0)
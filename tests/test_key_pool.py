@@ -0,0 +1,119 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import os
+import random
+import shutil
+import stat
+import tempfile
+import unittest
+
+from sawtooth_signing import create_context
+from sawtooth_signing import ParseError
+from sawtooth_signing.key_pool import KeyPool
+from sawtooth_signing.key_pool import generate_keys
+
+
+class KeyPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.context = create_context('secp256k1')
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'keys.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_generate_keys(self):
+        keys = generate_keys(self.context, 300, workers=2)
+
+        self.assertEqual(len(keys), 300)
+        self.assertEqual(len(set(keys)), 300)
+        for private_key_bytes, public_key_bytes in keys[:5]:
+            self.assertEqual(len(private_key_bytes), 32)
+            self.assertEqual(len(public_key_bytes), 33)
+
+    def test_save_and_load(self):
+        pool = KeyPool.generate(self.context, 10)
+        pool.save(self.path)
+
+        self.assertEqual(os.path.getsize(self.path), 9 + 10 * 65)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+        with KeyPool.load(self.context, self.path) as loaded:
+            self.assertEqual(len(loaded), 10)
+            for i in range(10):
+                self.assertEqual(loaded.key_bytes(i), pool.key_bytes(i))
+
+                signer = loaded.signer(i)
+                self.assertEqual(
+                    signer.get_public_key().as_hex(),
+                    loaded.public_key_hex(i))
+
+                signature = signer.sign(b'message')
+                self.assertTrue(self.context.verify(
+                    signature, b'message', signer.get_public_key()))
+
+    def test_caching_context(self):
+        context = create_context('secp256k1', verify_cache_size=10)
+
+        keys = generate_keys(context, 300, workers=2)
+        self.assertEqual(len(set(keys)), 300)
+
+        pool = KeyPool.generate(context, 2)
+        signer = pool.signer(0)
+        self.assertTrue(context.verify(
+            signer.sign(b'message'), b'message', signer.get_public_key()))
+
+    def test_draws(self):
+        pool = KeyPool.generate(self.context, 3)
+
+        drawn = [pool.next_signer() for _ in range(6)]
+        self.assertEqual(drawn[:3], [pool.signer(i) for i in range(3)])
+        self.assertEqual(drawn[3:], drawn[:3])
+
+        rng = random.Random(1)
+        signers = {id(pool.random_signer(rng)) for _ in range(50)}
+        self.assertEqual(
+            signers, {id(pool.signer(i)) for i in range(3)})
+
+    def test_index_out_of_range(self):
+        pool = KeyPool.generate(self.context, 2)
+        for index in (-1, 2):
+            with self.assertRaises(IndexError):
+                pool.signer(index)
+            with self.assertRaises(IndexError):
+                pool.key_bytes(index)
+
+        empty = KeyPool.generate(self.context, 0)
+        with self.assertRaises(IndexError):
+            empty.next_signer()
+        with self.assertRaises(IndexError):
+            empty.random_signer()
+
+    def test_invalid_keystore(self):
+        with open(self.path, 'wb') as fd:
+            fd.write(b'not a keystore')
+        with self.assertRaises(ParseError):
+            KeyPool.load(self.context, self.path)
+
+        KeyPool.generate(self.context, 2).save(self.path)
+        with open(self.path, 'r+b') as fd:
+            fd.truncate(9 + 65)
+        with self.assertRaises(ParseError):
+            KeyPool.load(self.context, self.path)
+
+        KeyPool.generate(self.context, 0).save(self.path)
+        with self.assertRaises(ParseError):
+            KeyPool.load(self.context, self.path)
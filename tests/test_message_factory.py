@@ -0,0 +1,118 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import time
+import unittest
+
+from sawtooth_signing import create_context
+from sawtooth_signing import CryptoFactory
+from sawtooth_signing.secp256k1 import Secp256k1PublicKey
+from sawtooth_processor_test.message_factory import MessageFactory
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+
+LOGGER = logging.getLogger(__name__)
+
+NAMESPACE = 'abcdef'
+
+
+def _address(i):
+    return NAMESPACE + '{:064x}'.format(i)
+
+
+class TestMessageFactory(unittest.TestCase):
+    def setUp(self):
+        self.context = create_context('secp256k1')
+        self.signer = CryptoFactory(self.context).new_signer(
+            self.context.new_random_private_key())
+        self.factory = MessageFactory(
+            family_name='test',
+            family_version='1.0',
+            namespace=NAMESPACE,
+            signer=self.signer)
+
+    def _fixture(self, count):
+        payloads = ['payload{}'.format(i).encode() for i in range(count)]
+        addresses = [[_address(i)] for i in range(count)]
+        return payloads, addresses
+
+    def test_create_transactions(self):
+        payloads, addresses = self._fixture(10)
+        batcher = '02' + '11' * 32
+
+        txns = self.factory.create_transactions(
+            payloads, addresses, addresses, batcher=batcher)
+
+        self.assertEqual(len(txns), 10)
+        public_key = Secp256k1PublicKey.from_hex(
+            self.factory.get_public_key())
+        nonces = set()
+        for i, txn in enumerate(txns):
+            header = TransactionHeader()
+            header.ParseFromString(txn.header)
+
+            self.assertEqual(txn.header, header.SerializeToString())
+            self.assertEqual(txn.payload, payloads[i])
+            self.assertEqual(header.signer_public_key, public_key.as_hex())
+            self.assertEqual(header.batcher_public_key, batcher)
+            self.assertEqual(header.family_name, 'test')
+            self.assertEqual(header.family_version, '1.0')
+            self.assertEqual(list(header.inputs), addresses[i])
+            self.assertEqual(list(header.outputs), addresses[i])
+            self.assertEqual(list(header.dependencies), [])
+            self.assertEqual(
+                header.payload_sha512, MessageFactory.sha512(payloads[i]))
+            self.assertTrue(self.context.verify(
+                txn.header_signature, txn.header, public_key))
+            nonces.add(header.nonce)
+
+        self.assertEqual(len(nonces), 10)
+
+    def test_create_tp_process_requests(self):
+        payloads, addresses = self._fixture(10)
+        deps = [['dep{}'.format(i)] for i in range(10)]
+
+        requests = self.factory.create_tp_process_requests(
+            payloads, addresses, addresses, deps, set_nonce=False)
+
+        for i, request in enumerate(requests):
+            single = self.factory.create_tp_process_request(
+                payloads[i], addresses[i], addresses[i], deps[i],
+                set_nonce=False)
+
+            self.assertEqual(request.header, single.header)
+            self.assertEqual(request.payload, single.payload)
+            self.assertEqual(request.signature, single.signature)
+
+    def test_bulk_benchmark(self):
+        """Compares building transactions one at a time and in bulk.
+        Timings are logged, not asserted.
+        """
+        payloads, addresses = self._fixture(2000)
+
+        start = time.perf_counter()
+        for payload, txn_addresses in zip(payloads, addresses):
+            self.factory.create_transaction(
+                payload, txn_addresses, txn_addresses, [])
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.factory.create_transactions(payloads, addresses, addresses)
+        bulk_time = time.perf_counter() - start
+
+        LOGGER.warning(
+            '%d transactions: %.2fs one at a time, %.2fs in bulk',
+            len(payloads), single_time, bulk_time)
@@ -0,0 +1,135 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import logging
+import threading
+import unittest
+import queue
+
+from sawtooth_sdk.consensus.engine import Engine
+from sawtooth_sdk.consensus.zmq_driver import ZmqDriver
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+from sawtooth_processor_test.mock_consensus_validator import \
+    MockConsensusValidator
+from sawtooth_processor_test.mock_consensus_validator import \
+    benchmark_engine
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CommittingEngine(Engine):
+    """Checks every new block and commits every valid one."""
+
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def __init__(self):
+        self.updates = []
+        self.startup_state = None
+        self.exit = False
+
+    def start(self, updates, service, startup_state):
+        self.startup_state = startup_state
+        while not self.exit:
+            try:
+                type_tag, data = updates.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            self.updates.append(type_tag)
+            if type_tag == Message.CONSENSUS_NOTIFY_BLOCK_NEW:
+                service.check_blocks([data.block_id])
+            elif type_tag == Message.CONSENSUS_NOTIFY_BLOCK_VALID:
+                service.commit_block(data)
+            elif type_tag == Message.CONSENSUS_NOTIFY_BLOCK_COMMIT:
+                service.get_chain_head()
+
+    def stop(self):
+        self.exit = True
+
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def name(self):
+        return 'committing'
+
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def version(self):
+        return '0.1'
+
+    def additional_protocols(self):
+        return []
+
+
+class TestMockConsensusValidator(unittest.TestCase):
+    def setUp(self):
+        self.validator = MockConsensusValidator()
+        self.url = self.validator.listen()
+        self.engine = CommittingEngine()
+        self.driver = ZmqDriver(self.engine)
+        self.driver_thread = threading.Thread(
+            target=self.driver.start,
+            args=(self.url,))
+        self.driver_thread.start()
+
+    def tearDown(self):
+        self.driver.stop()
+        self.driver_thread.join()
+        self.validator.close()
+
+    def test_stream_chain(self):
+        request = self.validator.register()
+        self.assertEqual(request.name, 'committing')
+
+        self.validator.activate()
+        genesis = self.validator.chain_head
+
+        chain = self.validator.create_chain(5)
+        result = self.validator.stream_blocks(chain, wait_for_commit=True)
+        self.validator.process_requests()
+
+        self.assertEqual(
+            self.engine.startup_state.chain_head.block_id,
+            genesis.block_id)
+        self.assertEqual(result.blocks, 5)
+        self.assertEqual(len(result.commit_latencies), 5)
+        self.assertEqual(self.validator.chain_head, chain[-1])
+        self.assertEqual(
+            self.validator.service_requests.count(
+                Message.CONSENSUS_COMMIT_BLOCK_REQUEST),
+            5)
+        self.assertEqual(
+            self.engine.updates,
+            [
+                Message.CONSENSUS_NOTIFY_BLOCK_NEW,
+                Message.CONSENSUS_NOTIFY_BLOCK_VALID,
+                Message.CONSENSUS_NOTIFY_BLOCK_COMMIT,
+            ] * 5)
+
+        count, _, _ = result.latency_summary(
+            Message.CONSENSUS_NOTIFY_BLOCK_NEW)
+        self.assertEqual(count, 5)
+
+
+class TestEngineBenchmark(unittest.TestCase):
+    def test_benchmark_engine(self):
+        engine = CommittingEngine()
+        result = benchmark_engine(engine, 50, wait_for_commit=True)
+
+        LOGGER.warning('Consensus benchmark: %s', result)
+
+        self.assertEqual(result.blocks, 50)
+        self.assertGreater(result.blocks_per_second, 0)
+        self.assertTrue(engine.exit)
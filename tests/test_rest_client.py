@@ -0,0 +1,151 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import asyncio
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+import json
+from socketserver import ThreadingMixIn
+import threading
+import unittest
+
+from sawtooth_sdk.client.exceptions import RestApiError
+from sawtooth_sdk.client.exceptions import RestApiUnavailable
+from sawtooth_sdk.client.rest_client import AsyncRestClient
+from sawtooth_sdk.client.rest_client import RestClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers with the given responses in turn, and records each request
+    with the client port it came from.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._answer(None)
+
+    def do_POST(self):
+        self._answer(self.rfile.read(int(self.headers['Content-Length'])))
+
+    def _answer(self, body):
+        with self.server.lock:
+            self.server.requests.append(
+                (self.command, self.path, dict(self.headers), body,
+                 self.client_address[1]))
+
+            status, content = self.server.responses.pop(0) \
+                if self.server.responses else (200, {'data': 'ok'})
+        content = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class TestRestClient(unittest.TestCase):
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.responses = []
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = '127.0.0.1:{}'.format(self.server.server_port)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_keep_alive(self):
+        """Requests reuse one connection, and the auth header is sent with
+        each request.
+        """
+        with RestClient(self.url) as client:
+            for _ in range(3):
+                self.assertEqual(
+                    client.get_json(
+                        'state/abc', auth_user='user', auth_password='pass'),
+                    {'data': 'ok'})
+
+        self.assertEqual(
+            [path for _, path, _, _, _ in self.server.requests],
+            ['/state/abc'] * 3)
+        self.assertEqual(
+            len({port for _, _, _, _, port in self.server.requests}), 1)
+        self.assertEqual(
+            {headers['Authorization']
+             for _, _, headers, _, _ in self.server.requests},
+            {'Basic dXNlcjpwYXNz'})
+
+    def test_post(self):
+        with RestClient('http://' + self.url) as client:
+            client.request(
+                'batches', data=b'batch',
+                content_type='application/octet-stream')
+
+        method, path, headers, body, _ = self.server.requests[0]
+        self.assertEqual((method, path, body), ('POST', '/batches', b'batch'))
+        self.assertEqual(headers['Content-Type'], 'application/octet-stream')
+
+    def test_retry(self):
+        """Gateway errors are retried, other errors are raised.
+        """
+        self.server.responses = [(503, {}), (503, {})]
+        with RestClient(self.url, backoff_factor=0) as client:
+            self.assertEqual(client.get_json('state'), {'data': 'ok'})
+        self.assertEqual(len(self.server.requests), 3)
+
+        self.server.responses = [(404, {})]
+        with RestClient(self.url) as client:
+            with self.assertRaises(RestApiError) as context:
+                client.get_json('state/abc')
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_unavailable(self):
+        closed = HTTPServer(('127.0.0.1', 0), _Handler)
+        closed.server_close()
+
+        with RestClient('127.0.0.1:{}'.format(closed.server_port),
+                        retries=0) as client:
+            with self.assertRaises(RestApiUnavailable):
+                client.get_json('state')
+
+    def test_async(self):
+        client = AsyncRestClient(self.url, max_workers=4)
+
+        async def get_all():
+            return await asyncio.gather(*[
+                client.get_json('state/{}'.format(i)) for i in range(8)
+            ])
+
+        try:
+            results = asyncio.new_event_loop().run_until_complete(get_all())
+        finally:
+            client.close()
+
+        self.assertEqual(results, [{'data': 'ok'}] * 8)
+        self.assertEqual(
+            sorted(path for _, path, _, _, _ in self.server.requests),
+            sorted('/state/{}'.format(i) for i in range(8)))
@@ -0,0 +1,137 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import os
+import unittest
+from unittest import mock
+
+from sawtooth_signing import create_context
+from sawtooth_signing import NoSuchAlgorithmError
+from sawtooth_signing import Secp256k1Context
+from sawtooth_signing import backends
+from sawtooth_signing.secp256k1 import Secp256k1PrivateKey
+
+
+KEY1_PRIV_HEX = \
+    "2f1e7b7a130d7ba9da0068b3bb0ba1d79e7e77110302c9f746c3c2a63fe40088"
+KEY1_PUB_HEX = \
+    "026a2c795a9776f75464aa3bda3534c3154a6e91b357b1181d3f515110f84b67c5"
+
+MSG1 = b"test"
+MSG1_KEY1_SIG = ("5195115d9be2547b720ee74c23dd841842875db6eae1f5da8605b050a49e"
+                 "702b4aa83be72ab7e3cb20f17c657011b49f4c8632be2745ba4de79e6aa0"
+                 "5da57b35")
+
+# The same signature with s replaced by n - s; libsecp256k1 rejects it
+MSG1_KEY1_HIGH_S_SIG = (
+    "5195115d9be2547b720ee74c23dd841842875db6eae1f5da8605b050a49e702b"
+    "{:064x}".format(
+        0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+        - int(MSG1_KEY1_SIG[64:], 16)))
+
+
+class Secp256k1BackendsTest(unittest.TestCase):
+    def setUp(self):
+        self.contexts = {
+            name: create_context('secp256k1', backend=name)
+            for name in backends.available_backends()
+        }
+
+    def test_default_backend_is_available(self):
+        self.assertIn('secp256k1', self.contexts)
+
+    def test_signatures_match(self):
+        messages = [MSG1] + [
+            'message {}'.format(i).encode() for i in range(50)]
+
+        reference = self.contexts['secp256k1']
+        reference_key = reference.new_random_private_key()
+        expected = [reference.sign(m, reference_key) for m in messages]
+
+        for name, context in self.contexts.items():
+            with self.subTest(backend=name):
+                private_key = Secp256k1PrivateKey.from_hex(KEY1_PRIV_HEX)
+                self.assertEqual(context.sign(MSG1, private_key),
+                                 MSG1_KEY1_SIG)
+                self.assertEqual(
+                    context.get_public_key(private_key).as_hex(),
+                    KEY1_PUB_HEX)
+
+                self.assertEqual(
+                    [context.sign(m, reference_key) for m in messages],
+                    expected)
+
+    def test_cross_backend_verification(self):
+        signers = {
+            name: context.new_random_private_key()
+            for name, context in self.contexts.items()
+        }
+
+        for signer_name, private_key in signers.items():
+            signer_context = self.contexts[signer_name]
+            signature = signer_context.sign(MSG1, private_key)
+            public_key = signer_context.get_public_key(private_key)
+
+            for name, context in self.contexts.items():
+                with self.subTest(signer=signer_name, verifier=name):
+                    self.assertTrue(
+                        context.verify(signature, MSG1, public_key))
+                    self.assertFalse(
+                        context.verify(signature, b'other', public_key))
+
+    def test_invalid_signatures(self):
+        public_key = self.contexts['secp256k1'].get_public_key(
+            Secp256k1PrivateKey.from_hex(KEY1_PRIV_HEX))
+
+        for name, context in self.contexts.items():
+            with self.subTest(backend=name):
+                self.assertTrue(
+                    context.verify(MSG1_KEY1_SIG, MSG1, public_key))
+                self.assertFalse(
+                    context.verify(MSG1_KEY1_HIGH_S_SIG, MSG1, public_key))
+                self.assertFalse(
+                    context.verify('not hex', MSG1, public_key))
+                self.assertFalse(
+                    context.verify(MSG1_KEY1_SIG[:-2], MSG1, public_key))
+
+    def test_forced_backend(self):
+        for name, context in self.contexts.items():
+            self.assertIs(type(context), backends.load_backend(name))
+
+        with mock.patch.dict(os.environ,
+                             {backends.BACKEND_ENV: 'secp256k1'}):
+            self.assertIs(
+                type(create_context('secp256k1')),
+                backends.load_backend('secp256k1'))
+
+        with self.assertRaises(NoSuchAlgorithmError):
+            create_context('secp256k1', backend='no-such-backend')
+
+    def test_package_export(self):
+        self.assertIs(Secp256k1Context, backends.load_backend('secp256k1'))
+
+    def test_default_backend(self):
+        """The default backend does not depend on timings."""
+        default = backends.available_backends()[0]
+        with mock.patch.dict(os.environ, {backends.BACKEND_ENV: ''}):
+            for _ in range(3):
+                self.assertIs(type(create_context('secp256k1')),
+                              backends.load_backend(default))
+
+    def test_fastest_backend(self):
+        self.assertIn(backends.fastest_backend(), self.contexts)
+        self.assertIn(
+            type(create_context('secp256k1', backend=backends.FASTEST)),
+            [type(context) for context in self.contexts.values()])
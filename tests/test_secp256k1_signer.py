@@ -142,3 +142,35 @@ class Secp256k1SigningTest(unittest.TestCase):
         # This signature doesn't match for MSG1/KEY1
         result = context.verify(MSG2_KEY2_SIG, MSG1.encode(), pub_key1)
         self.assertEqual(result, False)
+
+    def test_sign_many(self):
+        context = create_context("secp256k1")
+        priv_key1 = Secp256k1PrivateKey.from_hex(KEY1_PRIV_HEX)
+
+        messages = [MSG1.encode()] + [
+            'message {}'.format(i).encode() for i in range(299)]
+
+        sequential = context.sign_many(messages, priv_key1, workers=1)
+        parallel = context.sign_many(messages, priv_key1, workers=2)
+
+        self.assertEqual(sequential[0], MSG1_KEY1_SIG)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(
+            parallel,
+            [context.sign(message, priv_key1) for message in messages])
+
+    def test_verify_many(self):
+        context = create_context("secp256k1")
+        pub_key1 = Secp256k1PublicKey.from_hex(KEY1_PUB_HEX)
+        pub_key2 = Secp256k1PublicKey.from_hex(KEY2_PUB_HEX)
+
+        triples = [
+            (MSG1_KEY1_SIG, MSG1.encode(), pub_key1),
+            (MSG2_KEY2_SIG, MSG2.encode(), pub_key2),
+            (MSG2_KEY2_SIG, MSG1.encode(), pub_key1),
+            ('not a signature', MSG1.encode(), pub_key1),
+        ] * 100
+        expected = [True, True, False, False] * 100
+
+        self.assertEqual(context.verify_many(triples, workers=1), expected)
+        self.assertEqual(context.verify_many(triples, workers=2), expected)
@@ -0,0 +1,81 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import timeit
+import unittest
+
+from sawtooth_signing import create_context
+from sawtooth_signing import CryptoFactory
+from sawtooth_signing import backends
+from sawtooth_signing.secp256k1 import Secp256k1PublicKey
+
+
+LOGGER = logging.getLogger(__name__)
+
+ROUNDS = 2000
+
+
+def _per_call(function, rounds=ROUNDS):
+    return timeit.timeit(function, number=rounds) / rounds
+
+
+class SigningBenchmark(unittest.TestCase):
+    """Reports the cost of the signing operations performed for every
+    transaction a client builds. Timings are logged, not asserted.
+    """
+
+    def setUp(self):
+        self.context = create_context('secp256k1')
+        self.signer = CryptoFactory(self.context).new_signer(
+            self.context.new_random_private_key())
+        self.header = b'h' * 256
+
+    def test_transaction_signing(self):
+        native_key = self.signer.get_public_key().secp256k1_public_key
+
+        def uncached():
+            # Transaction header and batcher key, then the batch header
+            for _ in range(3):
+                Secp256k1PublicKey(native_key).as_hex()
+            self.signer.sign(self.header)
+
+        def cached():
+            for _ in range(3):
+                self.signer.get_public_key().as_hex()
+            self.signer.sign(self.header)
+
+        self.assertEqual(
+            Secp256k1PublicKey(native_key).as_hex(),
+            self.signer.get_public_key().as_hex())
+
+        uncached_time = _per_call(uncached)
+        cached_time = _per_call(cached)
+
+        LOGGER.warning(
+            'Per transaction: %.1fus with key encoding, %.1fus cached '
+            '(%.1fus saved)',
+            uncached_time * 1e6,
+            cached_time * 1e6,
+            (uncached_time - cached_time) * 1e6)
+
+    def test_backends(self):
+        for name in backends.available_backends():
+            sign_time, verify_time = backends.benchmark_backend(name)
+            LOGGER.warning(
+                'Backend %s: sign %.1fus, verify %.1fus',
+                name,
+                sign_time * 1e6,
+                verify_time * 1e6)
@@ -0,0 +1,145 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from sawtooth_sdk.messaging.recorder import INBOUND
+from sawtooth_sdk.messaging.recorder import OUTBOUND
+from sawtooth_sdk.messaging.recorder import TrafficLogError
+from sawtooth_sdk.messaging.recorder import TrafficRecorder
+from sawtooth_sdk.messaging.recorder import read_traffic
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
+from sawtooth_sdk.protobuf.network_pb2 import PingResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateEntry
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateGetResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateSetRequest
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+from sawtooth_processor_test.message_factory import MessageFactory
+from sawtooth_processor_test.mock_validator import ProcessOutcome
+from sawtooth_processor_test.mock_validator import ProcessingResult
+from sawtooth_processor_test.replay import Recording
+
+
+ADDRESS_A = 'abcdef' + 'a' * 64
+ADDRESS_B = 'abcdef' + 'b' * 64
+
+
+def _message(message_type, correlation_id, content):
+    return Message(
+        message_type=message_type,
+        correlation_id=correlation_id,
+        content=content.SerializeToString())
+
+
+class TestTrafficRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'traffic.log')
+        self.factory = MessageFactory('test', '1.0', 'abcdef')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _record_transaction(self, recorder, correlation_id, status):
+        """Record a transaction that reads A and B and writes B."""
+        recorder.record(INBOUND, _message(
+            Message.TP_PROCESS_REQUEST,
+            correlation_id,
+            self.factory.create_tp_process_request(
+                b'payload', [ADDRESS_A, ADDRESS_B], [ADDRESS_B], [])))
+        recorder.record(INBOUND, _message(
+            Message.TP_STATE_GET_RESPONSE,
+            correlation_id + '-get',
+            TpStateGetResponse(
+                status=TpStateGetResponse.OK,
+                entries=[
+                    TpStateEntry(address=ADDRESS_A, data=b'a'),
+                    TpStateEntry(address=ADDRESS_B, data=b''),
+                ])))
+        recorder.record(OUTBOUND, _message(
+            Message.TP_STATE_SET_REQUEST,
+            correlation_id + '-set',
+            TpStateSetRequest(
+                entries=[TpStateEntry(address=ADDRESS_B, data=b'b')])))
+        recorder.record(OUTBOUND, _message(
+            Message.TP_PROCESS_RESPONSE,
+            correlation_id,
+            TpProcessResponse(status=status)))
+
+    def test_round_trip(self):
+        with TrafficRecorder(self.path) as recorder:
+            recorder.record(OUTBOUND, _message(
+                Message.PING_RESPONSE, 'ping', PingResponse()))
+            self._record_transaction(recorder, 'one', TpProcessResponse.OK)
+
+        records = list(read_traffic(self.path))
+
+        self.assertEqual(
+            [record.message.message_type for record in records],
+            [
+                Message.TP_PROCESS_REQUEST,
+                Message.TP_STATE_GET_RESPONSE,
+                Message.TP_STATE_SET_REQUEST,
+                Message.TP_PROCESS_RESPONSE,
+            ])
+        self.assertEqual(
+            [record.direction for record in records],
+            [INBOUND, INBOUND, OUTBOUND, OUTBOUND])
+        self.assertEqual(
+            sorted(records, key=lambda record: record.timestamp), records)
+
+    def test_invalid_log(self):
+        with open(self.path, 'wb') as fd:
+            fd.write(b'not a traffic log')
+        with self.assertRaises(TrafficLogError):
+            list(read_traffic(self.path))
+
+        with TrafficRecorder(self.path) as recorder:
+            self._record_transaction(recorder, 'one', TpProcessResponse.OK)
+        with open(self.path, 'r+b') as fd:
+            fd.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(TrafficLogError):
+            list(read_traffic(self.path))
+
+    def test_recording(self):
+        with TrafficRecorder(self.path) as recorder:
+            self._record_transaction(recorder, 'one', TpProcessResponse.OK)
+            self._record_transaction(
+                recorder, 'two', TpProcessResponse.INVALID_TRANSACTION)
+
+        recording = Recording.load(self.path)
+
+        self.assertEqual(len(recording), 2)
+        self.assertEqual(recording.send_times[0], 0)
+        self.assertGreaterEqual(recording.send_times[1], 0)
+        self.assertEqual(
+            recording.statuses,
+            [TpProcessResponse.OK, TpProcessResponse.INVALID_TRANSACTION])
+        # B was empty when first read, and A was never written
+        self.assertEqual(recording.state, {ADDRESS_A: b'a'})
+
+        def outcome(status):
+            return ProcessOutcome('', status, '', b'', 0.0, None)
+
+        result = ProcessingResult(
+            [outcome(TpProcessResponse.OK), outcome(TpProcessResponse.OK)],
+            1.0)
+        self.assertEqual(
+            recording.compare(result),
+            [(1, TpProcessResponse.INVALID_TRANSACTION,
+              TpProcessResponse.OK)])
@@ -0,0 +1,95 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import unittest
+
+from sawtooth_signing import create_context
+from sawtooth_signing.secp256k1 import Secp256k1PrivateKey
+from sawtooth_signing.secp256k1 import Secp256k1PublicKey
+from sawtooth_signing.verify_cache import VerifyCachingContext
+
+
+KEY1_PRIV_HEX = \
+    "2f1e7b7a130d7ba9da0068b3bb0ba1d79e7e77110302c9f746c3c2a63fe40088"
+KEY1_PUB_HEX = \
+    "026a2c795a9776f75464aa3bda3534c3154a6e91b357b1181d3f515110f84b67c5"
+
+MSG1 = b"test"
+MSG1_KEY1_SIG = ("5195115d9be2547b720ee74c23dd841842875db6eae1f5da8605b050a49e"
+                 "702b4aa83be72ab7e3cb20f17c657011b49f4c8632be2745ba4de79e6aa0"
+                 "5da57b35")
+
+
+class VerifyCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.context = create_context(
+            'secp256k1', backend='secp256k1', verify_cache_size=2)
+        self.public_key = Secp256k1PublicKey.from_hex(KEY1_PUB_HEX)
+
+    def test_create_context(self):
+        self.assertIsInstance(self.context, VerifyCachingContext)
+        self.assertNotIsInstance(
+            create_context('secp256k1'), VerifyCachingContext)
+
+    def test_hits(self):
+        for _ in range(3):
+            self.assertTrue(
+                self.context.verify(MSG1_KEY1_SIG, MSG1, self.public_key))
+
+        # Hex and raw signatures share an entry
+        self.assertTrue(self.context.verify(
+            bytes.fromhex(MSG1_KEY1_SIG), MSG1, self.public_key))
+
+        info = self.context.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (3, 1, 1))
+        self.assertEqual(self.context.hit_rate, 0.75)
+
+    def test_well_formed_negative_results_are_cached(self):
+        for _ in range(2):
+            self.assertFalse(
+                self.context.verify(MSG1_KEY1_SIG, b'other', self.public_key))
+
+        self.assertEqual(self.context.cache_info().hits, 1)
+
+    def test_malformed_inputs_are_not_cached(self):
+        malformed = [
+            ('not hex', MSG1, self.public_key),
+            (MSG1_KEY1_SIG[:-2], MSG1, self.public_key),
+            (MSG1_KEY1_SIG, 'not bytes', self.public_key),
+            (MSG1_KEY1_SIG, MSG1, None),
+        ]
+        for signature, message, public_key in malformed * 2:
+            self.assertFalse(
+                self.context.verify(signature, message, public_key))
+
+        self.assertEqual(self.context.cache_info(), (0, 0, 2, 0))
+
+    def test_eviction(self):
+        private_key = Secp256k1PrivateKey.from_hex(KEY1_PRIV_HEX)
+        messages = [b'a', b'b', b'c']
+        signatures = [self.context.sign(m, private_key) for m in messages]
+
+        for signature, message in zip(signatures, messages):
+            self.context.verify(signature, message, self.public_key)
+
+        # b'a' was the least recently used entry and has been evicted
+        self.context.verify(signatures[0], messages[0], self.public_key)
+        self.context.verify(signatures[2], messages[2], self.public_key)
+
+        info = self.context.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 4, 2))
+
+        self.context.cache_clear()
+        self.assertEqual(self.context.cache_info(), (0, 0, 2, 0))
@@ -0,0 +1,168 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+from unittest import mock
+
+from sawtooth_sdk.client import exceptions
+from sawtooth_sdk.client.zmq_client import ZmqClient
+from sawtooth_sdk.messaging.future import Future
+from sawtooth_sdk.messaging.future import FutureResult
+from sawtooth_sdk.protobuf import client_batch_submit_pb2
+from sawtooth_sdk.protobuf import client_list_control_pb2
+from sawtooth_sdk.protobuf import client_state_pb2
+from sawtooth_sdk.protobuf.batch_pb2 import Batch
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+class TestZmqClient(unittest.TestCase):
+    def setUp(self):
+        self.mock_stream = mock.Mock()
+        self.client = ZmqClient(stream=self.mock_stream, timeout=10)
+
+    def _make_future(self, message_type, content):
+        fut = Future('test')
+        fut.set_result(FutureResult(
+            message_type=message_type,
+            content=content.SerializeToString()))
+        return fut
+
+    def test_submit_batches(self):
+        self.mock_stream.send.return_value = self._make_future(
+            message_type=Message.CLIENT_BATCH_SUBMIT_RESPONSE,
+            content=client_batch_submit_pb2.ClientBatchSubmitResponse(
+                status=client_batch_submit_pb2.ClientBatchSubmitResponse.OK))
+
+        batch = Batch(header_signature='batch')
+        self.assertIsNone(self.client.submit_batches([batch]).result())
+
+        self.mock_stream.send.assert_called_with(
+            message_type=Message.CLIENT_BATCH_SUBMIT_REQUEST,
+            content=client_batch_submit_pb2.ClientBatchSubmitRequest(
+                batches=[batch]).SerializeToString())
+
+    def test_submit_batches_rejected(self):
+        response_type = client_batch_submit_pb2.ClientBatchSubmitResponse
+        for status, error in ((response_type.INVALID_BATCH,
+                               exceptions.InvalidBatch),
+                              (response_type.QUEUE_FULL,
+                               exceptions.QueueFull),
+                              (response_type.INTERNAL_ERROR,
+                               exceptions.ReceiveError)):
+            self.mock_stream.send.return_value = self._make_future(
+                message_type=Message.CLIENT_BATCH_SUBMIT_RESPONSE,
+                content=response_type(status=status))
+
+            with self.assertRaises(error):
+                self.client.submit_batches([]).result()
+
+    def test_get_batch_statuses(self):
+        status_type = client_batch_submit_pb2.ClientBatchStatus
+        self.mock_stream.send.return_value = self._make_future(
+            message_type=Message.CLIENT_BATCH_STATUS_RESPONSE,
+            content=client_batch_submit_pb2.ClientBatchStatusResponse(
+                status=client_batch_submit_pb2.ClientBatchStatusResponse.OK,
+                batch_statuses=[
+                    status_type(batch_id='a', status=status_type.COMMITTED),
+                    status_type(batch_id='b', status=status_type.PENDING),
+                ]))
+
+        self.assertEqual(
+            self.client.get_batch_statuses(['a', 'b'], wait=5).result(),
+            {'a': 'COMMITTED', 'b': 'PENDING'})
+
+        self.mock_stream.send.assert_called_with(
+            message_type=Message.CLIENT_BATCH_STATUS_REQUEST,
+            content=client_batch_submit_pb2.ClientBatchStatusRequest(
+                batch_ids=['a', 'b'],
+                wait=True,
+                timeout=5).SerializeToString())
+
+    def test_get_state(self):
+        response_type = client_state_pb2.ClientStateGetResponse
+        self.mock_stream.send.return_value = self._make_future(
+            message_type=Message.CLIENT_STATE_GET_RESPONSE,
+            content=response_type(status=response_type.OK, value=b'data'))
+
+        self.assertEqual(self.client.get_state('abc').result(), b'data')
+
+        self.mock_stream.send.assert_called_with(
+            message_type=Message.CLIENT_STATE_GET_REQUEST,
+            content=client_state_pb2.ClientStateGetRequest(
+                address='abc').SerializeToString())
+
+    def test_get_state_unset(self):
+        response_type = client_state_pb2.ClientStateGetResponse
+        self.mock_stream.send.return_value = self._make_future(
+            message_type=Message.CLIENT_STATE_GET_RESPONSE,
+            content=response_type(status=response_type.NO_RESOURCE))
+
+        self.assertIsNone(self.client.get_state('abc').result())
+
+    def test_pipelined_requests(self):
+        """Requests are all sent before any answer is waited for.
+        """
+        response_type = client_state_pb2.ClientStateGetResponse
+        pending = [Future(str(i)) for i in range(3)]
+        self.mock_stream.send.side_effect = pending
+
+        futures = [
+            self.client.get_state(address) for address in ('a', 'b', 'c')
+        ]
+        self.assertEqual(self.mock_stream.send.call_count, 3)
+        self.assertFalse(any(future.done() for future in futures))
+
+        for i, future in reversed(list(enumerate(pending))):
+            future.set_result(FutureResult(
+                message_type=Message.CLIENT_STATE_GET_RESPONSE,
+                content=response_type(
+                    status=response_type.OK,
+                    value=str(i).encode()).SerializeToString()))
+
+        self.assertEqual(
+            [future.result() for future in futures], [b'0', b'1', b'2'])
+
+    def test_iter_state(self):
+        response_type = client_state_pb2.ClientStateListResponse
+        entry = response_type.Entry
+
+        self.mock_stream.send.side_effect = [
+            self._make_future(
+                message_type=Message.CLIENT_STATE_LIST_RESPONSE,
+                content=response_type(
+                    status=response_type.OK,
+                    entries=[entry(address='ab1', data=b'1'),
+                             entry(address='ab2', data=b'2')],
+                    paging=client_list_control_pb2.ClientPagingResponse(
+                        next='ab3'),
+                    state_root='root')),
+            self._make_future(
+                message_type=Message.CLIENT_STATE_LIST_RESPONSE,
+                content=response_type(
+                    status=response_type.OK,
+                    entries=[entry(address='ab3', data=b'3')])),
+        ]
+
+        self.assertEqual(
+            list(self.client.iter_state('ab', limit=2)),
+            [('ab1', b'1'), ('ab2', b'2'), ('ab3', b'3')])
+
+        self.mock_stream.send.assert_called_with(
+            message_type=Message.CLIENT_STATE_LIST_REQUEST,
+            content=client_state_pb2.ClientStateListRequest(
+                address='ab',
+                state_root='root',
+                paging=client_list_control_pb2.ClientPagingControls(
+                    start='ab3', limit=2)).SerializeToString())